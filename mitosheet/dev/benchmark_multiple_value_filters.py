@@ -0,0 +1,91 @@
+"""
+Compares the filter code we generate for filters with multiple values of the
+same condition to the code we used to generate, which checked each cell with
+.apply. Checks that both select the same rows, and prints how long each takes.
+
+To run this file, run python dev/benchmark_multiple_value_filters.py from the
+mitosheet folder, optionally passing the number of rows (default 10,000,000).
+"""
+
+import sys
+from time import perf_counter
+from typing import Any, List, Tuple, cast
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.code_chunks.step_performers.filter_code_chunk import get_multiple_filter_string
+from mitosheet.types import (
+    FC_DATETIME_GREATER, FC_DATETIME_NOT_EXACTLY, FC_NUMBER_EXACTLY,
+    FC_NUMBER_GREATER, FC_NUMBER_LESS_THAN_OR_EQUAL, FC_NUMBER_NOT_EXACTLY,
+    FC_STRING_CONTAINS, FC_STRING_CONTAINS_CASE_INSENSITIVE, FC_STRING_EXACTLY,
+    FC_STRING_STARTS_WITH, ColumnHeader, Filter, OperatorType)
+
+NUMBER_VALUES = [10, 500]
+STRING_VALUES = ['ab', 'cd']
+DATETIME_VALUES = ['2020-03-01', '2021-06-01']
+
+# The condition, operator, column, values, and the code we used to generate
+BENCHMARKS: List[Tuple[str, OperatorType, ColumnHeader, List[Any], str]] = [
+    (FC_NUMBER_EXACTLY, 'And', 'number', NUMBER_VALUES, "df['number'].apply(lambda val: all(val == n for n in [10, 500]))"),
+    (FC_NUMBER_NOT_EXACTLY, 'Or', 'number', NUMBER_VALUES, "df['number'].apply(lambda val: any(val != n for n in [10, 500]))"),
+    (FC_NUMBER_GREATER, 'Or', 'number', NUMBER_VALUES, "df['number'].apply(lambda val: any(val > n for n in [10, 500]))"),
+    (FC_NUMBER_LESS_THAN_OR_EQUAL, 'And', 'number', NUMBER_VALUES, "df['number'].apply(lambda val: all(val <= n for n in [10, 500]))"),
+    (FC_STRING_CONTAINS, 'Or', 'string', STRING_VALUES, "df['string'].apply(lambda val: any(s in str(val) for s in ['ab', 'cd']))"),
+    (FC_STRING_CONTAINS, 'And', 'string', STRING_VALUES, "df['string'].apply(lambda val: all(s in str(val) for s in ['ab', 'cd']))"),
+    (FC_STRING_EXACTLY, 'Or', 'string', STRING_VALUES, "df['string'].apply(lambda val: any(val == s for s in ['ab', 'cd']))"),
+    (FC_STRING_STARTS_WITH, 'Or', 'string', STRING_VALUES, "df['string'].apply(lambda val: any(str(val).startswith(s) for s in ['ab', 'cd']))"),
+    (FC_STRING_CONTAINS_CASE_INSENSITIVE, 'Or', 'string', STRING_VALUES, "df['string'].apply(lambda val: any(s.upper() in str(val).upper() for s in ['ab', 'cd']))"),
+    (FC_DATETIME_GREATER, 'And', 'datetime', DATETIME_VALUES, "df['datetime'].apply(lambda val: all(val > d for d in pd.to_datetime(['2020-03-01', '2021-06-01'])))"),
+    (FC_DATETIME_NOT_EXACTLY, 'Or', 'datetime', DATETIME_VALUES, "df['datetime'].apply(lambda val: any(val != d for d in pd.to_datetime(['2020-03-01', '2021-06-01'])))"),
+]
+
+
+def get_benchmark_df(num_rows: int) -> pd.DataFrame:
+    random = np.random.default_rng(0)
+    number = random.integers(0, 1000, num_rows).astype(float)
+    number[random.random(num_rows) < .05] = np.nan
+
+    letters = np.array(list('abcdefgh'))
+    string = pd.Series(
+        letters[random.integers(0, len(letters), num_rows)].astype(object) +
+        letters[random.integers(0, len(letters), num_rows)].astype(object) +
+        letters[random.integers(0, len(letters), num_rows)].astype(object)
+    )
+    string[random.random(num_rows) < .05] = np.nan
+
+    datetime = pd.Series(pd.Timestamp('2020-01-01') + pd.to_timedelta(random.integers(0, 1000, num_rows), unit='D'))
+    datetime[random.random(num_rows) < .05] = pd.NaT
+
+    return pd.DataFrame({'number': number, 'string': string, 'datetime': datetime})
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    df = get_benchmark_df(num_rows)
+    print(f'Benchmarking multiple value filters on {num_rows:,} rows\n')
+
+    for condition, operator, column_header, values, apply_code in BENCHMARKS:
+        vectorized_code = get_multiple_filter_string(
+            'df', column_header, operator, condition, str(df[column_header].dtype),
+            [cast(Filter, {'condition': condition, 'value': value}) for value in values]
+        )
+
+        start_time = perf_counter()
+        apply_result = eval(apply_code, {'df': df, 'pd': pd})
+        apply_time = perf_counter() - start_time
+
+        start_time = perf_counter()
+        vectorized_result = eval(vectorized_code, {'df': df, 'pd': pd})
+        vectorized_time = perf_counter() - start_time
+
+        assert (apply_result.astype(bool) == vectorized_result.astype(bool)).all(), f'{condition} {operator} selects different rows'
+
+        print(f'{condition} ({operator})')
+        print(f'    apply:      {apply_time:8.3f}s  {apply_code}')
+        print(f'    vectorized: {vectorized_time:8.3f}s  {vectorized_code}')
+        print(f'    speedup:    {apply_time / vectorized_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
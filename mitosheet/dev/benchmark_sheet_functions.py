@@ -0,0 +1,83 @@
+"""
+Benchmarks the GETPREVIOUSVALUE, GETNEXTVALUE, TYPE, and VLOOKUP sheet functions
+against the closest raw pandas operation, and checks that each takes at most
+MAX_SLOWDOWN times as long as pandas does.
+
+To run this file, run python dev/benchmark_sheet_functions.py from the mitosheet
+folder, optionally passing the number of rows (default 5,000,000).
+"""
+
+import sys
+from time import perf_counter
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.public.v3.sheet_functions.misc_functions import (
+    GETNEXTVALUE, GETPREVIOUSVALUE, TYPE, VLOOKUP)
+
+MAX_SLOWDOWN = 10
+
+
+def get_benchmark_df(num_rows: int) -> pd.DataFrame:
+    random = np.random.default_rng(0)
+    number = random.integers(0, 1000, num_rows).astype(float)
+    number[random.random(num_rows) < .05] = np.nan
+
+    letters = np.array(list('abcdefgh'))
+    string = pd.Series(
+        letters[random.integers(0, len(letters), num_rows)].astype(object) +
+        letters[random.integers(0, len(letters), num_rows)].astype(object)
+    )
+    mixed = string.where(random.random(num_rows) < .5, pd.Series(number, dtype=object))
+
+    return pd.DataFrame({'number': number, 'string': string, 'mixed': mixed})
+
+
+def get_lookup_df() -> pd.DataFrame:
+    letters = list('abcdefgh')
+    keys = [first + second for first in letters for second in letters]
+    return pd.DataFrame({'key': keys, 'value': np.arange(len(keys)), 'label': [key.upper() for key in keys]})
+
+
+def main() -> None:
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    df = get_benchmark_df(num_rows)
+    lookup_df = get_lookup_df()
+    condition = df['number'] > 500
+    print(f'Benchmarking sheet functions on {num_rows:,} rows\n')
+
+    # The name of the function, the function, and the raw pandas operation it is closest to
+    benchmarks: List[Tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        ('GETPREVIOUSVALUE', lambda: GETPREVIOUSVALUE(df['number'], condition), lambda: df['number'].where(condition).ffill()),
+        ('GETNEXTVALUE', lambda: GETNEXTVALUE(df['number'], condition), lambda: df['number'].where(condition).bfill()),
+        ('TYPE (number)', lambda: TYPE(df['number']), lambda: pd.Series(np.where(df['number'].isna(), 'NaN', 'number'), index=df.index)),
+        ('TYPE (mixed)', lambda: TYPE(df['mixed']), lambda: df['mixed'].map(type)),
+        ('VLOOKUP', lambda: VLOOKUP(df['string'], lookup_df, 2), lambda: pd.merge(df[['string']], lookup_df.drop_duplicates('key'), left_on='string', right_on='key', how='left')['value']),
+        ('VLOOKUP (index series)', lambda: VLOOKUP(df['string'], lookup_df, pd.Series(np.where(condition, 2, 3))), lambda: pd.merge(df[['string']], lookup_df.drop_duplicates('key'), left_on='string', right_on='key', how='left')['value']),
+    ]
+
+    slow_functions = []
+    for function_name, function, pandas_function in benchmarks:
+        start_time = perf_counter()
+        function()
+        function_time = perf_counter() - start_time
+
+        start_time = perf_counter()
+        pandas_function()
+        pandas_time = perf_counter() - start_time
+
+        print(f'{function_name}')
+        print(f'    function: {function_time:8.3f}s')
+        print(f'    pandas:   {pandas_time:8.3f}s')
+        print(f'    slowdown: {function_time / pandas_time:8.1f}x')
+
+        if function_time > pandas_time * MAX_SLOWDOWN:
+            slow_functions.append(function_name)
+
+    assert len(slow_functions) == 0, f'{", ".join(slow_functions)} took more than {MAX_SLOWDOWN}x as long as pandas'
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,6 @@ from copy import copy
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 import numpy as np
 import pandas as pd
-from pandas.testing import assert_frame_equal
 from mitosheet.ai.ai_utils import fix_up_missing_imports, get_code_string_from_last_expression, replace_last_instance_in_string
 
 from io import StringIO
@@ -16,14 +15,57 @@ from mitosheet.step_performers.dataframe_steps.dataframe_delete import \
     delete_dataframe_from_state
 from mitosheet.types import (AITransformFrontendResult, ColumnHeader, ColumnID,
                              DataframeReconData, ModifiedDataframeReconData)
+from mitosheet.utils import get_values_fingerprint, is_copy_on_write_enabled
+
+def is_series_changed(old: pd.Series, new: pd.Series) -> bool:
+    """
+    Returns True if the values or index of the series are different. 
+
+    As dataframes in a state are never changed in place, and we only run code
+    on copies of them, values stored in the same memory are the same - and so 
+    we only compare values that are stored in different memory.
+    """
+    # Index.equals ignores the dtype of the index, so we check it ourselves
+    if len(old) != len(new) or old.dtype != new.dtype or old.index.dtype != new.index.dtype:
+        return True
+    
+    if get_values_fingerprint(old.values) == get_values_fingerprint(new.values) and old.index.equals(new.index):
+        return False
+    
+    return not old.equals(new)
+
+
+def get_modified_column_headers(old_df: pd.DataFrame, new_df: pd.DataFrame, column_headers: Iterable[ColumnHeader]) -> List[ColumnHeader]:
+    """
+    Returns the column headers, which must be in both dataframes, of the columns 
+    that are different between the old and the new dataframe.
+    """
+    return [column_header for column_header in column_headers if is_series_changed(old_df[column_header], new_df[column_header])]
+
 
 def is_df_changed(old: pd.DataFrame, new: pd.DataFrame) -> bool:
-    try:
-        assert_frame_equal(old, new, check_names=False)
+    if old is new:
         return False
-    except AssertionError:
+
+    if old.shape != new.shape or not old.columns.equals(new.columns) or not old.index.equals(new.index):
         return True
 
+    # Index.equals ignores the dtype of the index, so we check it ourselves
+    if old.columns.dtype != new.columns.dtype or old.index.dtype != new.index.dtype:
+        return True
+
+    return any(is_series_changed(old.iloc[:, column_index], new.iloc[:, column_index]) for column_index in range(len(old.columns)))
+
+
+def get_recon_snapshot(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns a copy of the dataframe for code to run on, so that the dataframe is
+    not changed. With copy on write, this is a shallow copy that pandas copies
+    lazily if it is changed; otherwise, we have to copy it upfront.
+    """
+    return df.copy(deep=not is_copy_on_write_enabled())
+
+
 def exec_for_recon(code: str, original_df_map: Dict[str, pd.DataFrame]) -> DataframeReconData:
     """
     Given some Python code, and a list of previously defined dataframes, this function:
@@ -53,7 +95,6 @@ def exec_for_recon(code: str, original_df_map: Dict[str, pd.DataFrame]) -> Dataf
             'prints': ''
         }
 
-    df_map = {df_name: df.copy(deep=True) for df_name, df in original_df_map.items()}
     locals_before = copy(locals())
     try:
         ast_before = ast.parse(code)
@@ -78,6 +119,8 @@ def exec_for_recon(code: str, original_df_map: Dict[str, pd.DataFrame]) -> Dataf
         df_name in code
     ]
 
+    # We only copy the dataframes the code might modify, so we can compare them to the originals
+    df_map = {df_name: get_recon_snapshot(original_df_map[df_name]) for df_name in potentially_modified_df_names}
     for df_name in potentially_modified_df_names:
         locals()[df_name] = df_map[df_name]
 
@@ -109,7 +152,7 @@ def exec_for_recon(code: str, original_df_map: Dict[str, pd.DataFrame]) -> Dataf
     }
 
     deleted_dataframes = [
-        name for name in df_map if name not in new_locals and name in potentially_modified_df_names
+        name for name in potentially_modified_df_names if name not in new_locals
     ]
 
     modified_dataframes = {
@@ -237,7 +280,7 @@ def get_modified_dataframe_recon_data(old_df: pd.DataFrame, new_df: pd.DataFrame
     shared_columns = get_shared_column_headers(old_columns, new_columns)
 
     if not rows_added_or_removed:
-        modified_columns = [ch for ch in shared_columns if not old_df[ch].equals(new_df[ch])]
+        modified_columns = get_modified_column_headers(old_df, new_df, shared_columns)
     else:
         # If rows were added or removed, then we don't want to detect every column as having changed
         # and instead we'd just like to report the row changes. As such, we only compare the rows not added or removed
@@ -251,9 +294,9 @@ def get_modified_dataframe_recon_data(old_df: pd.DataFrame, new_df: pd.DataFrame
                 df1 = old_df.loc[new_df.index]
                 df2 = new_df
 
-            modified_columns = [ch for ch in shared_columns if not df1[ch].equals(df2[ch])]
+            modified_columns = get_modified_column_headers(df1, df2, shared_columns)
         except IndexError:
-            modified_columns = [ch for ch in shared_columns if not old_df[ch].equals(new_df[ch])]
+            modified_columns = get_modified_column_headers(old_df, new_df, shared_columns)
 
     return {
         'column_recon': {
@@ -333,9 +376,9 @@ def exec_and_get_new_state_and_result(state: State, code: str) -> Tuple[State, O
     # Fix up the code, so we can ensure that we execute it properly
     code = fix_up_missing_imports(code)
 
-    # Make deep copies of all dataframes here, so we can manipulate them without fear
-    # TODO: in the future, we could just do the modified ones
-    new_state = state.copy(deep_sheet_indexes=list(range(len(state.dfs))))
+    # We don't copy any dataframes here, as exec_for_recon only runs the code on copies 
+    # of the dataframes it might modify, and we replace the modified dataframes below
+    new_state = state.copy()
 
     df_map = {df_name: df for df_name, df in zip(new_state.df_names, new_state.dfs)}
     recon_data = exec_for_recon(code, df_map)
@@ -6,10 +6,12 @@
 """
 Contains handlers for the Mito API
 """
-from queue import Queue
-from threading import Thread
+from threading import Condition, Event, Lock, Thread
 from time import perf_counter
-from typing import Any, Callable, Dict, NoReturn, Optional
+from typing import Any, Callable, Dict, List, NoReturn, Optional
+
+from mitosheet.api.cancellation import (APICallCancelledException,
+                                        set_current_api_call_cancelled_event)
 
 from mitosheet.api.get_saved_analysis_code import get_saved_analysis_code
 from mitosheet.api.get_all_params_for_step_type import get_all_params_for_step_type
@@ -22,8 +24,10 @@ from mitosheet.api.get_column_summary_graph import get_column_summary_graph
 from mitosheet.api.get_csv_files_metadata import get_csv_files_metadata
 from mitosheet.api.get_dataframe_as_csv import get_dataframe_as_csv
 from mitosheet.api.get_dataframe_as_excel import get_dataframe_as_excel
+from mitosheet.api.get_dataframe_viewport import get_dataframe_viewport
 from mitosheet.api.get_defined_df_names import get_defined_df_names
 from mitosheet.api.get_excel_file_metadata import get_excel_file_metadata
+from mitosheet.api.get_graph_artifact import get_graph_artifact
 from mitosheet.api.get_imported_files_and_dataframes_from_analysis_name import \
     get_imported_files_and_dataframes_from_analysis_name
 from mitosheet.api.get_imported_files_and_dataframes_from_current_steps import \
@@ -51,6 +55,35 @@ from mitosheet.user.location import is_dash, is_jupyterlite, is_streamlit
 # As the column summary statistics tab does three calls, we defaulted to this max
 MAX_QUEUED_API_CALLS = 3
 
+# We handle API calls in a pool of threads, so that a slow API call on a large 
+# sheet does not stop us from responding to other API calls
+NUM_API_THREADS = 3
+
+# API calls with a lower priority number are handled first. Calls the user is
+# waiting on to view the sheet are handled first, and calls that can be slow
+# on large sheets are handled last
+HIGH_PRIORITY = 0
+DEFAULT_PRIORITY = 1
+LOW_PRIORITY = 2
+
+API_CALL_PRIORITIES: Dict[str, int] = {
+    'get_dataframe_viewport': HIGH_PRIORITY,
+    'get_search_matches': HIGH_PRIORITY,
+    'get_render_count': HIGH_PRIORITY,
+    'get_defined_df_names': HIGH_PRIORITY,
+    'get_unique_value_counts': LOW_PRIORITY,
+    'get_column_describe': LOW_PRIORITY,
+    'get_column_summary_graph': LOW_PRIORITY,
+    'get_dataframe_as_csv': LOW_PRIORITY,
+    'get_dataframe_as_excel': LOW_PRIORITY,
+    'get_ai_completion': LOW_PRIORITY,
+}
+
+# We handle at most this many low priority API calls at once, so that there
+# is always a thread free to handle other API calls
+MAX_RUNNING_LOW_PRIORITY_API_CALLS = NUM_API_THREADS - 1
+
+
 # NOTE: BE CAREFUL WITH THIS. When in development mode, you can set it to False
 # so the API calls are handled in the main thread, to make printing easy.
 # In newer versions of JupyterLab, to see these print statements:
@@ -78,13 +111,149 @@ def get_api_should_be_threaded() -> bool:
 
 
 
+class APICall:
+    """
+    An API call that is queued or being handled by an API thread.
+    """
+
+    def __init__(self, event: Dict[str, Any], order: int):
+        self.event = event
+        self.priority = API_CALL_PRIORITIES.get(event['type'], DEFAULT_PRIORITY)
+        self.order = order
+        self.queued_time = perf_counter()
+        self.cancelled_event = Event()
+
+    def supersedes(self, api_call: 'APICall') -> bool:
+        return self.event['type'] == api_call.event['type'] and self.event['params'] == api_call.event['params']
+
+
+class APICallQueue:
+    """
+    A queue of API calls, that API threads get API calls from in order of their
+    priority, and then in the order they were put in the queue.
+
+    When an API call is put in the queue, any queued API calls it supersedes are removed 
+    from the queue, and any running API calls it supersedes are cancelled.
+    """
+
+    def __init__(self, max_queued_api_calls: int, max_running_low_priority_api_calls: int):
+        self.max_queued_api_calls = max_queued_api_calls
+        self.max_running_low_priority_api_calls = max_running_low_priority_api_calls
+
+        self.condition = Condition()
+        self.queued_api_calls: List[APICall] = []
+        self.running_api_calls: List[APICall] = []
+        self.num_api_calls = 0
+
+    def put(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Puts the event in the queue, and returns the events that were removed from the
+        queue, either because they were superseded or because the queue was full.
+        """
+        with self.condition:
+            api_call = APICall(event, self.num_api_calls)
+            self.num_api_calls += 1
+
+            removed_api_calls = [queued_api_call for queued_api_call in self.queued_api_calls if api_call.supersedes(queued_api_call)]
+            self.queued_api_calls = [queued_api_call for queued_api_call in self.queued_api_calls if not api_call.supersedes(queued_api_call)]
+
+            for running_api_call in self.running_api_calls:
+                if api_call.supersedes(running_api_call):
+                    running_api_call.cancelled_event.set()
+
+            # If the queue is full, we drop the oldest of the lowest priority events
+            if len(self.queued_api_calls) >= self.max_queued_api_calls:
+                lost_api_call = max(self.queued_api_calls, key=lambda queued_api_call: (queued_api_call.priority, -queued_api_call.order))
+                self.queued_api_calls.remove(lost_api_call)
+                removed_api_calls.append(lost_api_call)
+
+            self.queued_api_calls.append(api_call)
+            self.condition.notify_all()
+
+        return [removed_api_call.event for removed_api_call in removed_api_calls]
+
+    def get_next_api_call(self) -> Optional[APICall]:
+        num_running_low_priority_api_calls = len([api_call for api_call in self.running_api_calls if api_call.priority == LOW_PRIORITY])
+
+        next_api_call = None
+        for api_call in self.queued_api_calls:
+            if api_call.priority == LOW_PRIORITY and num_running_low_priority_api_calls >= self.max_running_low_priority_api_calls:
+                continue
+            if next_api_call is None or (api_call.priority, api_call.order) < (next_api_call.priority, next_api_call.order):
+                next_api_call = api_call
+
+        return next_api_call
+
+    def get(self) -> APICall:
+        """
+        Blocks until there is an API call that can be handled, and then returns it.
+        Call done when the API call has been handled.
+        """
+        with self.condition:
+            while True:
+                api_call = self.get_next_api_call()
+                if api_call is not None:
+                    self.queued_api_calls.remove(api_call)
+                    self.running_api_calls.append(api_call)
+                    return api_call
+                self.condition.wait()
+
+    def done(self, api_call: APICall) -> None:
+        with self.condition:
+            self.running_api_calls.remove(api_call)
+            self.condition.notify_all()
+
+
+class APICallMetrics:
+    """
+    Keeps track of how long each type of API call spends queued and being handled, 
+    so we can see which API calls are slow.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    def record(self, event_type: str, queued_time: float, processing_time: float) -> None:
+        with self.lock:
+            metrics = self.metrics.setdefault(event_type, {
+                'count': 0,
+                'total_queued_time': 0,
+                'total_processing_time': 0,
+                'max_latency': 0,
+            })
+            metrics['count'] += 1
+            metrics['total_queued_time'] += queued_time
+            metrics['total_processing_time'] += processing_time
+            metrics['max_latency'] = max(metrics['max_latency'], queued_time + processing_time)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the count, average queued time, average processing time, and max latency
+        (queued time plus processing time) of each type of API call, in seconds.
+        """
+        with self.lock:
+            return {
+                event_type: {
+                    'count': metrics['count'],
+                    'average_queued_time': metrics['total_queued_time'] / metrics['count'],
+                    'average_processing_time': metrics['total_processing_time'] / metrics['count'],
+                    'max_latency': metrics['max_latency'],
+                } for event_type, metrics in self.metrics.items()
+            }
+
+
 class API:
     """
-    The API provides a wrapper around a thread that responds to API calls.
+    The API provides a wrapper around a pool of threads that respond to API calls.
 
     Some notes:
     -   We allow at most MAX_QUEUED_API_CALLS API calls to be in the queue, which practically
         Stops a backlog of calls from building up.
+    -   API calls are handled in order of their priority, see API_CALL_PRIORITIES. 
+    -   A new API call with the same type and params as an older API call supersedes it. 
+        If the older call is still queued, it is dropped, and if it is being handled, it 
+        is cancelled. In both cases, we respond to the older call with None.
     -   All API calls should only be reads. This stops us from having to worry
         about most concurrency issues
     -   Note that printing inside of a thread does not work properly! Use sys.stdout.flush() after the print statement.
@@ -92,31 +261,35 @@ class API:
     """
 
     def __init__(self, steps_manager: StepsManager, mito_backend: MitoWidgetType):
-        self.api_queue: Queue = Queue(MAX_QUEUED_API_CALLS)
+        self.api_queue = APICallQueue(MAX_QUEUED_API_CALLS, MAX_RUNNING_LOW_PRIORITY_API_CALLS)
+        self.api_call_metrics = APICallMetrics()
 
         # Save some variables for ease
         self.steps_manager = steps_manager
         self.mito_backend = mito_backend
 
-        self.thread: Optional[Thread] = None
+        self.threads: List[Thread] = []
         self.had_first_api_call = False
 
-    def start_api_thread(self) -> None:
-        # Note that we make the thread a daemon thread, which practically means that when
-        # The process that starts this thread terminate, our API will terminate as well.
-        self.thread = Thread(
-            target=handle_api_event_thread,
-            args=(self.api_queue, self.steps_manager, self.mito_backend),
-            daemon=True,
-        )
-
-        self.thread.start()
-
+    def start_api_threads(self) -> None:
+        # Note that we make the threads daemon threads, which practically means that when
+        # The process that starts these threads terminate, our API will terminate as well.
+        for _ in range(NUM_API_THREADS):
+            thread = Thread(
+                target=handle_api_event_thread,
+                args=(self.api_queue, self.api_call_metrics, self.steps_manager, self.mito_backend),
+                daemon=True,
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def get_api_call_metrics(self) -> Dict[str, Dict[str, float]]:
+        return self.api_call_metrics.get_metrics()
 
     def process_new_api_call(self, event: Dict[str, Any]) -> None:
         """
         We privilege new API calls over old calls, and evict the old ones
-        if the API queue is full.
+        if the API queue is full, or if the new call supersedes them.
 
         Because we are using a queue, only events that have not been started
         being processed will get removed.
@@ -125,12 +298,12 @@ class API:
         thread, as we don't want to drop the event. For example, lazy loading
         data has priority!
         """
-        # On the first API call , we check if the API should be threaded, and if the it is not already created -- and create it in this case
+        # On the first API call , we check if the API should be threaded, and if the threads are not already created -- and create them in this case
         global THREADED
 
         if not self.had_first_api_call:
-            if self.thread is None and get_api_should_be_threaded():
-                self.start_api_thread()
+            if len(self.threads) == 0 and get_api_should_be_threaded():
+                self.start_api_threads()
                 THREADED = True
             else:
                 THREADED = False
@@ -138,20 +311,19 @@ class API:
             self.had_first_api_call = True
 
         if THREADED and "priority" not in event:
+            lost_events = self.api_queue.put(event)
 
-            if self.api_queue.full():
-                # If the queue is full, we drop the first event, and just return a None
-                lost_event = self.api_queue.get()
-
+            # We just return a None for the events we drop
+            for lost_event in lost_events:
                 self.mito_backend.mito_send({"event": "api_response", "id": lost_event["id"], "data": None})
-
-            self.api_queue.put(event)
         else:
+            start_time = perf_counter()
             handle_api_event(self.mito_backend.mito_send, event, self.steps_manager)
+            self.api_call_metrics.record(event['type'], 0, perf_counter() - start_time)
 
 
 def handle_api_event_thread(
-    queue: Queue, steps_manager: StepsManager, mito_backend: MitoWidgetType
+    api_queue: APICallQueue, api_call_metrics: APICallMetrics, steps_manager: StepsManager, mito_backend: MitoWidgetType
 ) -> NoReturn:
     """
     This is the worker thread function, that actually is
@@ -164,15 +336,28 @@ def handle_api_event_thread(
         # Note that this blocks when there is nothing in the queue,
         # and waits till there is something there - so no infinite
         # loop as it is waiting!
-        event = queue.get()
+        api_call = api_queue.get()
+        start_time = perf_counter()
+
+        def send(response: Dict[str, Any]) -> None:
+            # If the API call was cancelled, the frontend no longer needs the result
+            if api_call.cancelled_event.is_set():
+                response = {**response, "data": None}
+            mito_backend.mito_send(response)
+
+        set_current_api_call_cancelled_event(api_call.cancelled_event)
         # We place the API handling inside of a try catch,
         # because otherwise if an error is thrown, then the entire thread crashes,
         # and then the API never works again
         try:
-            handle_api_event(mito_backend.mito_send, event, steps_manager)
+            handle_api_event(send, api_call.event, steps_manager)
         except:
             # Log in error if it occurs
-            log_event_processed(event, steps_manager, failed=True)
+            log_event_processed(api_call.event, steps_manager, failed=True)
+        finally:
+            set_current_api_call_cancelled_event(None)
+            api_queue.done(api_call)
+            api_call_metrics.record(api_call.event['type'], start_time - api_call.queued_time, perf_counter() - start_time)
 
 
 def handle_api_event(
@@ -197,6 +382,8 @@ def handle_api_event(
             result = get_dataframe_as_csv(params, steps_manager)
         elif event["type"] == "get_column_summary_graph":
             result = get_column_summary_graph(params, steps_manager)
+        elif event["type"] == "get_graph_artifact":
+            result = get_graph_artifact(params, steps_manager)
         elif event["type"] == "get_column_describe":
             result = get_column_describe(params, steps_manager)
         elif event["type"] == "get_params":
@@ -239,10 +426,15 @@ def handle_api_event(
             result = get_pr_url_of_new_pr(params, steps_manager)
         elif event["type"] == "get_saved_analysis_code":
             result = get_saved_analysis_code(params, steps_manager)
+        elif event["type"] == "get_dataframe_viewport":
+            result = get_dataframe_viewport(params, steps_manager)
         # AUTOGENERATED LINE: API.PY CALL (DO NOT DELETE)
         else:
             raise Exception(f"Event: {event} is not a valid API call")
 
+    except APICallCancelledException:
+        # If the API call was cancelled, we don't log it as a failure
+        result = None
     except:
         failed = True
     
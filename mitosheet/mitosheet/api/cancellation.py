@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+API calls are cancelled when they are superseded by a new API call with the
+same type and params, as the frontend no longer needs their result.
+
+Cancellation is cooperative: API calls that take a long time can check if they
+have been cancelled with raise_if_api_call_cancelled, and stop early.
+"""
+from threading import Event, local
+from typing import Optional
+
+# Each API thread handles one API call at a time, so we store the cancelled
+# event of the API call the thread is currently handling
+current_api_call = local()
+
+
+class APICallCancelledException(Exception):
+    pass
+
+
+def set_current_api_call_cancelled_event(cancelled_event: Optional[Event]) -> None:
+    current_api_call.cancelled_event = cancelled_event
+
+
+def is_api_call_cancelled() -> bool:
+    cancelled_event: Optional[Event] = getattr(current_api_call, 'cancelled_event', None)
+    return cancelled_event is not None and cancelled_event.is_set()
+
+
+def raise_if_api_call_cancelled() -> None:
+    if is_api_call_cancelled():
+        raise APICallCancelledException()
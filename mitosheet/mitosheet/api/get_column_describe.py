@@ -7,6 +7,7 @@ import json
 from typing import Any, Dict
 
 import pandas as pd
+from mitosheet.api.cancellation import raise_if_api_call_cancelled
 from mitosheet.is_type_utils import is_number_dtype
 from mitosheet.types import StepsManagerType
 
@@ -24,6 +25,7 @@ def get_column_describe(params: Dict[str, Any], steps_manager: StepsManagerType)
     series: pd.Series = steps_manager.dfs[sheet_index][column_header]
     column_dtype = str(series.dtype)
     describe = series.describe()
+    raise_if_api_call_cancelled()
 
     describe_obj = {}
 
@@ -9,6 +9,7 @@ import pandas as pd
 from typing import Any, Dict, List, Optional
 import plotly.express as px
 import plotly.graph_objects as go
+from mitosheet.api.cancellation import raise_if_api_call_cancelled
 from mitosheet.step_performers.graph_steps.graph_utils import (
     get_html_and_script_from_figure,
 )
@@ -41,6 +42,9 @@ def get_column_summary_graph(params: Dict[str, Any], steps_manager: StepsManager
 
     column_header = steps_manager.curr_step.final_defined_state.column_ids.get_column_header_by_id(sheet_index, column_id)
     fig = _get_column_summary_graph(df, column_header)
+
+    # Turning the graph into html is slow, so we stop if the frontend no longer needs it
+    raise_if_api_call_cancelled()
         
     # Get rid of some of the default white space
     fig.update_layout(
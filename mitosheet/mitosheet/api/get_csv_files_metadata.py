@@ -3,48 +3,45 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
-import json
-import os
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Tuple
 
-import pandas as pd
 from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import DEFAULT_DECIMAL, DEFAULT_DELIMITER, DEFAULT_ENCODING, DEFAULT_SKIPROWS
-from mitosheet.step_performers.import_steps.simple_import import read_csv_get_delimiter_and_encoding
+from mitosheet.step_performers.import_steps.simple_import import sniff_csv_metadata
 from mitosheet.types import StepsManagerType
 
+# The most files we read at once when guessing their metadata
+MAX_CSV_METADATA_THREADS = 8
+
+
+def get_csv_file_metadata(file_name: str) -> Tuple[str, str, str, int]:
+    try:
+        return sniff_csv_metadata(file_name)
+    except:
+        # The default values displayed in the UI
+        return DEFAULT_DELIMITER, DEFAULT_ENCODING, DEFAULT_DECIMAL, DEFAULT_SKIPROWS
+
 
 def get_csv_files_metadata(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
     """
     Given a list of 'file_names' that should be CSV files,
-    this returns our guesses for delimeters and encodings
-    for these files, as well as other default parameters that we 
-    don't try to guess
+    this returns our guesses for delimeters, encodings, decimals
+    and skiprows for these files.
+
+    We only read the start of each file, and read the files in 
+    parallel, so this is fast even for many large files.
     """
     file_names = params['file_names']
 
-    delimeters = []
-    encodings = []
-    decimals = []
-    skiprows = []
-    for file_name in file_names:
-        try:
-            _, delimiter, encoding = read_csv_get_delimiter_and_encoding(file_name)
-            delimeters.append(delimiter)
-            encodings.append(encoding)
-        except:
-            # The default values displayed in the UI
-            delimeters.append(DEFAULT_DELIMITER)
-            encodings.append(DEFAULT_ENCODING)
-
-        # We don't have a good way to guess these params, so we always use the defaults
-        decimals.append(DEFAULT_DECIMAL)
-        skiprows.append(DEFAULT_SKIPROWS)
+    if len(file_names) <= 1:
+        files_metadata = [get_csv_file_metadata(file_name) for file_name in file_names]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(file_names), MAX_CSV_METADATA_THREADS)) as executor:
+            files_metadata = list(executor.map(get_csv_file_metadata, file_names))
 
     return {
-        'delimeters': delimeters,
-        'encodings': encodings,
-        'decimals': decimals,
-        'skiprows': skiprows 
+        'delimeters': [delimiter for delimiter, _, _, _ in files_metadata],
+        'encodings': [encoding for _, encoding, _, _ in files_metadata],
+        'decimals': [decimal for _, _, decimal, _ in files_metadata],
+        'skiprows': [skiprows for _, _, _, skiprows in files_metadata]
     }
-
-
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+from typing import Any, Dict
+
+from mitosheet.types import StepsManagerType
+
+
+def get_dataframe_viewport(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Returns the rows and columns of the dataframe at sheet_index that are in
+    the viewport, so the frontend can display any part of the dataframe without
+    us sending all of it.
+
+    If start_column and num_columns are not passed, all columns are returned.
+    """
+    sheet_index = params['sheet_index']
+    start_row = params['start_row']
+    num_rows = params['num_rows']
+    start_column = params.get('start_column', 0)
+
+    df = steps_manager.dfs[sheet_index]
+    num_columns = params.get('num_columns', len(df.columns))
+
+    return steps_manager.dataframe_viewport_cache.get_viewport(
+        sheet_index,
+        df,
+        steps_manager.curr_step.column_ids.column_header_to_column_id[sheet_index],
+        start_row,
+        num_rows,
+        start_column,
+        num_columns
+    )
@@ -3,31 +3,92 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
-import json
 import os
-from typing import Any, Dict
+import posixpath
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
 
 import pandas as pd
 from mitosheet.types import StepsManagerType
 
+SPREADSHEETML_NAMESPACE = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIPS_NAMESPACE = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_RELATIONSHIPS_NAMESPACE = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+WORKSHEET_RELATIONSHIP_TYPE_SUFFIX = '/worksheet'
+
 
 def get_excel_file_metadata(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
     """
-    Given a 'file_name' that should be an XLSX file, 
-    will get the metadata for that XLSX file. 
+    Given a 'file_name' that should be an XLSX file,
+    will get the metadata for that XLSX file.
 
-    For now, this is just the sheets this file contains, 
-    but in the future we may be able to request more about 
-    the workbook
+    For now, this is just the sheets this file contains,
+    and the range of cells that each sheet uses, if the
+    file records it.
     """
     file_path = params['file_path']
 
-    file = pd.ExcelFile(file_path, engine='openpyxl')
-    sheet_names = file.sheet_names
+    try:
+        sheet_names, sheet_dimensions = get_sheet_names_and_dimensions(file_path)
+    except Exception:
+        # If we can't read the workbook XML ourselves, then we let openpyxl load the workbook
+        file = pd.ExcelFile(file_path, engine='openpyxl')
+        sheet_names = file.sheet_names
+        sheet_dimensions = [None for _ in sheet_names]
 
     return {
         'sheet_names': sheet_names,
+        'sheet_dimensions': sheet_dimensions,
         'size': os.path.getsize(file_path)
     }
 
 
+def get_sheet_names_and_dimensions(file_path: str) -> Tuple[List[str], List[Optional[str]]]:
+    """
+    Returns the names of the worksheets in the XLSX file, in the same order as
+    pd.ExcelFile(file_path, engine='openpyxl').sheet_names, as well as the
+    dimension of each sheet (e.g. A1:C10), or None if the sheet does not have one.
+
+    Rather than loading the workbook, this only reads the workbook XML and
+    the start of each sheet's XML, and so is fast for even very large files.
+    """
+    with zipfile.ZipFile(file_path) as excel_zip_file:
+        workbook = ElementTree.fromstring(excel_zip_file.read('xl/workbook.xml'))
+        relationships = ElementTree.fromstring(excel_zip_file.read('xl/_rels/workbook.xml.rels'))
+
+        relationship_id_to_target = {
+            relationship.get('Id'): relationship.get('Target')
+            for relationship in relationships.iter(f'{PACKAGE_RELATIONSHIPS_NAMESPACE}Relationship')
+            # Chartsheets are also sheets in the workbook, but pandas does not read them
+            if (relationship.get('Type') or '').endswith(WORKSHEET_RELATIONSHIP_TYPE_SUFFIX)
+        }
+
+        sheet_names: List[str] = []
+        sheet_dimensions: List[Optional[str]] = []
+        for sheet in workbook.iter(f'{SPREADSHEETML_NAMESPACE}sheet'):
+            target = relationship_id_to_target.get(sheet.get(f'{RELATIONSHIPS_NAMESPACE}id'))
+            if target is None:
+                continue
+
+            # Targets are relative to the xl folder, unless they are absolute
+            sheet_path = target[1:] if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+
+            sheet_names.append(sheet.get('name', ''))
+            sheet_dimensions.append(get_sheet_dimension(excel_zip_file, sheet_path))
+
+    return sheet_names, sheet_dimensions
+
+
+def get_sheet_dimension(excel_zip_file: zipfile.ZipFile, sheet_path: str) -> Optional[str]:
+    """
+    Returns the dimension that the sheet records, which comes before
+    the cells of the sheet, and so we stop reading once we get to them.
+    """
+    with excel_zip_file.open(sheet_path) as sheet_file:
+        for _, element in ElementTree.iterparse(sheet_file, events=('start',)):
+            if element.tag == f'{SPREADSHEETML_NAMESPACE}dimension':
+                return element.get('ref')
+            if element.tag == f'{SPREADSHEETML_NAMESPACE}sheetData':
+                return None
+    return None
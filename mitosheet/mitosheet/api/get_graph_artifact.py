@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+from typing import Any, Dict, Optional
+
+from mitosheet.step_performers.graph_steps.graph_artifacts import get_graph_artifact_html_and_script
+from mitosheet.types import StepsManagerType
+
+
+def get_graph_artifact(params: Dict[str, Any], steps_manager: StepsManagerType) -> Optional[Dict[str, str]]:
+    """
+    Returns the HTML and script of the graph with the given graph_artifact_id,
+    which is in the graph_output of the graph in the graph_data_array. 
+
+    Returns None if the graph artifact no longer exists.
+    """
+    graph_artifact_id = params['graph_artifact_id']
+
+    html_and_script = get_graph_artifact_html_and_script(graph_artifact_id)
+    if html_and_script is None:
+        return None
+
+    return {
+        'graphHTML': html_and_script['html'],
+        'graphScript': html_and_script['script'],
+    }
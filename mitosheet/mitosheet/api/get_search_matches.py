@@ -3,48 +3,30 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
-import re
-import pandas as pd
 from typing import Any, Dict
 from mitosheet.types import StepsManagerType
+from mitosheet.utils import MAX_ROWS
 
 
 def get_search_matches(params: Dict[str, Any], steps_manager: StepsManagerType) -> Any:
     """
     Finds the number of matches to a given search value in the dataframe.
+
+    The matching cells are returned a page of rows at a time. By default, this
+    is the first MAX_ROWS rows, as the editor shows these rows. To get the next
+    page, pass the returned next_start_row as the start_row.
     """
     sheet_index = params['sheet_index']
     search_value = params['search_value']
+    start_row = params.get('start_row', 0)
+    num_rows = params.get('num_rows', MAX_ROWS)
     df = steps_manager.dfs[sheet_index]
 
-    # First, generate a count for each value in the dataframe:
-    unique_value_counts = df.stack().value_counts()
-
-    escaped_search_value = re.escape(search_value)
-
-    # Use the same regex for all searching
-    search_regex = re.compile(escaped_search_value, re.IGNORECASE)
-
-    # Then, filter for the search value:
-    matches = unique_value_counts.filter(regex=search_regex, axis=0)
-
-    # Then, sum the matches:
-    total_number_matches = int(matches.sum())
-
-    # Then, add the column names to the matches:
-    total_number_matches += len([col for col in df.columns if re.search(search_regex,str(col)) is not None])
-
-    # Get the number of rows and columns so that we don't have to calculate the length in each iteration
-    num_rows = len(df.index)
-    num_cols = len(df.columns)
-
-    # Find the indices of cells containing the search value
-    # Only search the first 1500 rows because the editor only shows the first 1500 rows. 
-    cell_matches = [{'rowIndex': i, 'colIndex': j} for i in range(min(1500, num_rows)) for j in range(num_cols) if (re.search(search_regex,str(df.iat[i, j])) is not None)]
+    total_number_matches, column_matches, cell_matches = steps_manager.search_index_cache.get_search_matches(
+        sheet_index, df, search_value, start_row, num_rows
+    )
 
-    # Find the indices of columns containing the search value
-    column_matches = [{'rowIndex': -1, 'colIndex': j} for j, column in enumerate(df.columns) if (re.search(search_regex,str(column)) is not None)]
-    
     # We want the columns to come first
     all_matches = column_matches + cell_matches
-    return {'total_number_matches': total_number_matches, 'matches': all_matches }
\ No newline at end of file
+    next_start_row = start_row + num_rows if start_row + num_rows < len(df.index) else None
+    return {'total_number_matches': total_number_matches, 'matches': all_matches, 'next_start_row': next_start_row}
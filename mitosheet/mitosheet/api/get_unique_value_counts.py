@@ -7,6 +7,7 @@ import json
 from typing import Any, Dict
 
 import pandas as pd
+from mitosheet.api.cancellation import raise_if_api_call_cancelled
 from mitosheet.types import StepsManagerType
 from mitosheet.utils import get_row_data_array
 
@@ -38,7 +39,9 @@ def get_unique_value_counts(params: Dict[str, Any], steps_manager: StepsManagerT
     series: pd.Series = steps_manager.dfs[sheet_index][column_header]
 
     unique_value_counts_percents_series = series.value_counts(normalize=True, dropna=False)
+    raise_if_api_call_cancelled()
     unique_value_counts_series = series.value_counts(dropna=False)
+    raise_if_api_call_cancelled()
     
     unique_value_counts_df = pd.DataFrame({
         'values': unique_value_counts_percents_series.index,
@@ -6,7 +6,7 @@
 
 
 from copy import copy
-from typing import TYPE_CHECKING, List, Optional, Any, Type
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Set, Tuple, Type
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.column_steps.delete_column_code_chunk import DeleteColumnsCodeChunk
 from mitosheet.code_chunks.step_performers.filter_code_chunk import FilterCodeChunk
@@ -19,14 +19,20 @@ else:
     Step = Any
     
 
-def get_code_chunks(all_steps: List[Step], optimize: bool=True) -> List[CodeChunk]:
+def get_code_chunks(all_steps: List[Step], optimize: bool=True, code_chunks_cache: Optional['CodeChunksCache']=None) -> List[CodeChunk]:
     """
     A utility for taking all the steps in the steps manager, and returning a list
     of CodeChunks that correspond to these steps. 
 
     optimize is by default True, which results in these CodeChunks being optimized
     down to the smallest possible list of CodeChunks that implements the same ops.
+
+    If a code_chunks_cache is passed, then the code chunks of steps that have
+    not changed since the last call are reused, rather than transpiled again.
     """
+    if code_chunks_cache is not None:
+        return code_chunks_cache.get_code_chunks(all_steps, optimize)
+
     from mitosheet.steps_manager import get_step_indexes_to_skip
     step_indexes_to_skip = get_step_indexes_to_skip(all_steps)
 
@@ -99,3 +105,118 @@ def get_right_combine_with_column_delete_code_chunk(
         )
     
     return None
+
+
+def is_prefix(prefix: List[Any], items: List[Any]) -> bool:
+    """
+    Returns True if the items start with the exact same objects as the prefix.
+    """
+    return len(prefix) <= len(items) and all(prefix_item is item for prefix_item, item in zip(prefix, items))
+
+
+class CodeChunksCache():
+    """
+    Transpiling all the steps, and then optimizing the code chunks of all the steps, 
+    is slow for long analyses. As we generate the code after every edit, and most 
+    edits just add a step to the end of the analysis, this cache makes generating 
+    the code incremental:
+    1.  The code chunks of each step are memoized by the step id, params, execution 
+        data and the state they are transpiled from, so only new steps are transpiled.
+    2.  If the code chunks start with the same code chunks as the last time, then the 
+        already optimized code chunks are optimized with the new code chunks, rather 
+        than optimizing all the code chunks from scratch. 
+    3.  The code each optimized code chunk generates is memoized, see get_comment_code_and_optional_code.
+    """
+
+    def __init__(self) -> None:
+        self.step_code_chunks: Dict[str, Tuple[Step, List[CodeChunk]]] = {}
+
+        # The steps and the steps we skipped the last time we got code chunks
+        self.steps: List[Step] = []
+        self.step_indexes_to_skip: Set[int] = set()
+
+        # The code chunks we got and optimized the last time we got code chunks
+        self.code_chunks: List[CodeChunk] = []
+        self.optimized_code_chunks: List[CodeChunk] = []
+
+        self.code_chunk_code_and_comments: Dict[int, Tuple[CodeChunk, str, Tuple[List[str], List[str]], Tuple[List[str], List[str]]]] = {}
+
+    def get_step_indexes_to_skip(self, all_steps: List[Step]) -> Set[int]:
+        from mitosheet.steps_manager import get_step_indexes_to_skip_from_previous_steps
+        self.step_indexes_to_skip = get_step_indexes_to_skip_from_previous_steps(all_steps, self.steps, self.step_indexes_to_skip)
+        self.steps = copy(all_steps)
+        return self.step_indexes_to_skip
+
+    def get_step_code_chunks(self, step: Step) -> List[CodeChunk]:
+        if step.step_id in self.step_code_chunks:
+            cached_step, code_chunks = self.step_code_chunks[step.step_id]
+            try:
+                if cached_step is step or (
+                    cached_step.prev_state is step.prev_state and 
+                    cached_step.params == step.params and 
+                    cached_step.execution_data == step.execution_data
+                ):
+                    return code_chunks
+            except ValueError:
+                # If the params can't be compared (e.g. they contain dataframes), we transpile again
+                pass
+        
+        code_chunks = step.step_performer.transpile(
+            step.prev_state, # type: ignore
+            step.params,
+            step.execution_data,
+        )
+        self.step_code_chunks[step.step_id] = (step, code_chunks)
+        return code_chunks
+
+    def get_code_chunks(self, all_steps: List[Step], optimize: bool) -> List[CodeChunk]:
+        step_indexes_to_skip = self.get_step_indexes_to_skip(all_steps)
+
+        all_code_chunks: List[CodeChunk] = []
+        for step_index, step in enumerate(all_steps):
+            # Skip the initalize step, or any step we should skip
+            if step.step_type == 'initialize' or step_index in step_indexes_to_skip:
+                continue
+
+            all_code_chunks.extend(self.get_step_code_chunks(step))
+
+        # Forget the code chunks of steps that no longer exist
+        step_ids = set(step.step_id for step in all_steps)
+        self.step_code_chunks = {step_id: value for step_id, value in self.step_code_chunks.items() if step_id in step_ids}
+
+        if not optimize:
+            return all_code_chunks
+
+        if is_prefix(self.code_chunks, all_code_chunks):
+            optimized_code_chunks = optimize_code_chunks(self.optimized_code_chunks + all_code_chunks[len(self.code_chunks):])
+        else:
+            optimized_code_chunks = optimize_code_chunks(all_code_chunks)
+
+        self.code_chunks = all_code_chunks
+        self.optimized_code_chunks = optimized_code_chunks
+        return copy(optimized_code_chunks)
+
+    def get_comment_code_and_optional_code(self, code_chunk: CodeChunk) -> Tuple[str, Tuple[List[str], List[str]], Tuple[List[str], List[str]]]:
+        """
+        Returns the description comment, code and optional code of the code chunk, 
+        memoized for the code chunks that we last optimized.
+        """
+        if id(code_chunk) not in self.code_chunk_code_and_comments or self.code_chunk_code_and_comments[id(code_chunk)][0] is not code_chunk:
+            self.code_chunk_code_and_comments[id(code_chunk)] = (
+                code_chunk,
+                code_chunk.get_description_comment(),
+                code_chunk.get_code(),
+                code_chunk.get_optional_code_that_successfully_executed()
+            )
+
+            # Forget the code of code chunks that we no longer use
+            if len(self.code_chunk_code_and_comments) > 2 * len(self.optimized_code_chunks) + 100:
+                optimized_code_chunk_ids = set(id(optimized_code_chunk) for optimized_code_chunk in self.optimized_code_chunks)
+                self.code_chunk_code_and_comments = {
+                    code_chunk_id: value for code_chunk_id, value in self.code_chunk_code_and_comments.items() 
+                    if code_chunk_id in optimized_code_chunk_ids or value[0] is code_chunk
+                }
+
+        _, comment, (code, imports), (optional_code, optional_imports) = self.code_chunk_code_and_comments[id(code_chunk)]
+        # Return copies, so the callers can edit the code
+        return comment, (copy(code), copy(imports)), (copy(optional_code), copy(optional_imports))
@@ -10,6 +10,7 @@ from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.state import State
 from mitosheet.transpiler.transpile_utils import get_column_header_list_as_transpiled_code, get_column_header_map_as_code_string, get_column_header_as_transpiled_code
 from mitosheet.types import ColumnID
+from mitosheet.utils import get_dataframe_index
 
 
 class FillNaCodeChunk(CodeChunk):
@@ -19,7 +20,7 @@ class FillNaCodeChunk(CodeChunk):
         self.sheet_index = sheet_index
         self.column_ids = column_ids
         self.fill_method = fill_method
-        self.full_dataframe = len(self.prev_state.dfs[self.sheet_index]) == len(self.column_ids)
+        self.full_dataframe = len(get_dataframe_index(self.prev_state.dfs[self.sheet_index])) == len(self.column_ids)
 
         self.df_name = self.prev_state.df_names[self.sheet_index]
         self.column_headers = self.prev_state.column_ids.get_column_headers_by_ids(self.sheet_index, self.column_ids)
@@ -7,6 +7,7 @@
 
 from copy import copy
 from datetime import date
+import re
 from typing import List, Optional, Tuple, Union
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
@@ -66,6 +67,8 @@ FILTER_FORMAT_STRING_DICT = {
 
 # Dict used when there a specific filter condition has multiple
 # filters that use it. Helps us write cleaner filter code!
+# NOTE: these conditions are vectorized, but match the NaN handling of checking
+# each value in Python, e.g. string conditions compare against str(val), so NaN is 'nan'
 FILTER_FORMAT_STRING_MULTIPLE_VALUES_DICT = {
     FC_EMPTY: {
         "Or": "{df_name}[{transpiled_column_header}].isna()",
@@ -93,27 +96,25 @@ FILTER_FORMAT_STRING_MULTIPLE_VALUES_DICT = {
     },
     FC_NUMBER_EXACTLY: {
         "Or": "{df_name}[{transpiled_column_header}].isin({values})",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val == n for n in {values}))",
     },
     FC_NUMBER_NOT_EXACTLY: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val != n for n in {values}))",
         "And": "~{df_name}[{transpiled_column_header}].isin({values})",
     },
     FC_NUMBER_GREATER: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val > n for n in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val > n for n in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}] > min({values})",
+        "And": "{df_name}[{transpiled_column_header}] > max({values})",
     },
     FC_NUMBER_GREATER_THAN_OR_EQUAL: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val >= n for n in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val >= n for n in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}] >= min({values})",
+        "And": "{df_name}[{transpiled_column_header}] >= max({values})",
     },
     FC_NUMBER_LESS: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val < n for n in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val < n for n in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}] < max({values})",
+        "And": "{df_name}[{transpiled_column_header}] < min({values})",
     },
     FC_NUMBER_LESS_THAN_OR_EQUAL: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val <= n for n in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val <= n for n in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}] <= max({values})",
+        "And": "{df_name}[{transpiled_column_header}] <= min({values})",
     },
     FC_NUMBER_LOWEST: {
         "Or": '{df_name}[{transpiled_column_header}].isin({df_name}[{transpiled_column_header}].nsmallest(max({values}), keep=\'all\'))',
@@ -124,56 +125,86 @@ FILTER_FORMAT_STRING_MULTIPLE_VALUES_DICT = {
         "And": '{df_name}[{transpiled_column_header}].isin({df_name}[{transpiled_column_header}].nlargest(min({values}), keep=\'all\'))'
     },
     FC_STRING_CONTAINS: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(s in str(val) for s in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(s in str(val) for s in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}].map(str).str.contains({values_regex})",
     },
     FC_STRING_DOES_NOT_CONTAIN: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(s not in str(val) for s in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(s not in str(val) for s in {values}))",
+        "And": "~{df_name}[{transpiled_column_header}].map(str).str.contains({values_regex})",
     },
     FC_STRING_EXACTLY: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val == s for s in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val == s for s in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}].isin({values})",
     },
     FC_STRING_NOT_EXACTLY: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val != s for s in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val != s for s in {values}))",
+        "And": "~{df_name}[{transpiled_column_header}].isin({values})",
     },
     FC_STRING_STARTS_WITH: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(str(val).startswith(s) for s in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(str(val).startswith(s) for s in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}].map(str).str.startswith({values_tuple})",
     },
     FC_STRING_ENDS_WITH: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(str(val).endswith(s) for s in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(str(val).endswith(s) for s in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}].map(str).str.endswith({values_tuple})",
     },
     FC_STRING_CONTAINS_CASE_INSENSITIVE: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(s.upper() in str(val).upper() for s in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(s.upper() in str(val).upper() for s in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}].map(str).str.upper().str.contains({upper_values_regex})",
     },
     FC_DATETIME_EXACTLY: {
         "Or": "{df_name}[{transpiled_column_header}].isin({values})",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val == d for d in {values}))",
     },
     FC_DATETIME_NOT_EXACTLY: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val != d for d in {values}))",
         "And": "~{df_name}[{transpiled_column_header}].isin({values})",
     },
     FC_DATETIME_GREATER: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val > d for d in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val > d for d in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}] > min({values})",
+        "And": "{df_name}[{transpiled_column_header}] > max({values})",
     },
     FC_DATETIME_GREATER_THAN_OR_EQUAL: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val >= d for d in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val >= d for d in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}] >= min({values})",
+        "And": "{df_name}[{transpiled_column_header}] >= max({values})",
     },
     FC_DATETIME_LESS: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val < d for d in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val < d for d in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}] < max({values})",
+        "And": "{df_name}[{transpiled_column_header}] < min({values})",
     },
     FC_DATETIME_LESS_THAN_OR_EQUAL: {
-        "Or": "{df_name}[{transpiled_column_header}].apply(lambda val: any(val <= d for d in {values}))",
-        "And": "{df_name}[{transpiled_column_header}].apply(lambda val: all(val <= d for d in {values}))",
+        "Or": "{df_name}[{transpiled_column_header}] <= max({values})",
+        "And": "{df_name}[{transpiled_column_header}] <= min({values})",
+    },
+}
+
+# Dict used for the multiple value filters that can't be written as a single
+# comparison, e.g. a value that is exactly equal to all of the values. For these,
+# we compare against each value, and combine the comparisons with the operator
+FILTER_FORMAT_STRING_EACH_VALUE_DICT = {
+    FC_NUMBER_EXACTLY: {
+        "And": "{df_name}[{transpiled_column_header}] == {value}",
+    },
+    FC_NUMBER_NOT_EXACTLY: {
+        "Or": "{df_name}[{transpiled_column_header}] != {value}",
+    },
+    FC_STRING_CONTAINS: {
+        "And": "{df_name}[{transpiled_column_header}].map(str).str.contains({value}, regex=False)",
+    },
+    FC_STRING_DOES_NOT_CONTAIN: {
+        "Or": "~{df_name}[{transpiled_column_header}].map(str).str.contains({value}, regex=False)",
+    },
+    FC_STRING_EXACTLY: {
+        "And": "{df_name}[{transpiled_column_header}] == {value}",
+    },
+    FC_STRING_NOT_EXACTLY: {
+        "Or": "{df_name}[{transpiled_column_header}] != {value}",
+    },
+    FC_STRING_STARTS_WITH: {
+        "And": "{df_name}[{transpiled_column_header}].map(str).str.startswith({value})",
+    },
+    FC_STRING_ENDS_WITH: {
+        "And": "{df_name}[{transpiled_column_header}].map(str).str.endswith({value})",
+    },
+    FC_STRING_CONTAINS_CASE_INSENSITIVE: {
+        "And": "{df_name}[{transpiled_column_header}].map(str).str.upper().str.contains({upper_value}, regex=False)",
+    },
+    FC_DATETIME_EXACTLY: {
+        "And": "{df_name}[{transpiled_column_header}] == pd.to_datetime({value})",
+    },
+    FC_DATETIME_NOT_EXACTLY: {
+        "Or": "{df_name}[{transpiled_column_header}] != pd.to_datetime({value})",
     },
 }
 
@@ -218,6 +249,19 @@ def get_multiple_filter_string(
     """
     Transpiles a list of filters with the same filter condition to a filter string.
     """
+    transpiled_column_header = get_column_header_as_transpiled_code(column_header)
+
+    if original_operator in FILTER_FORMAT_STRING_EACH_VALUE_DICT.get(condition, {}):
+        each_value_filter_strings = [
+            FILTER_FORMAT_STRING_EACH_VALUE_DICT[condition][original_operator].format(
+                df_name=df_name,
+                transpiled_column_header=transpiled_column_header,
+                value=get_column_header_as_transpiled_code(filter["value"]),
+                upper_value=get_column_header_as_transpiled_code(str(filter["value"]).upper()),
+            )
+            for filter in filters
+        ]
+        return combine_filter_strings(original_operator, each_value_filter_strings)
 
     # Handle dates specially by wrapping the number in a string and adding the pd.to_datetime call
     values: Union[str, List[Union[str, int, float]]]
@@ -229,7 +273,11 @@ def get_multiple_filter_string(
     else:
         values = [filter["value"] for filter in filters]
 
-    transpiled_column_header = get_column_header_as_transpiled_code(column_header)
+    # String conditions check for any of the values at once with a tuple or a regex of the escaped values
+    string_values = [str(filter["value"]) for filter in filters]
+    values_tuple = get_column_header_as_transpiled_code(tuple(string_values))
+    values_regex = get_column_header_as_transpiled_code('|'.join(re.escape(value) for value in string_values))
+    upper_values_regex = get_column_header_as_transpiled_code('|'.join(re.escape(value.upper()) for value in string_values))
 
     return FILTER_FORMAT_STRING_MULTIPLE_VALUES_DICT[condition][
         original_operator
@@ -237,6 +285,9 @@ def get_multiple_filter_string(
         df_name=df_name,
         transpiled_column_header=transpiled_column_header,
         values=values,
+        values_tuple=values_tuple,
+        values_regex=values_regex,
+        upper_values_regex=upper_values_regex,
     )
 
 
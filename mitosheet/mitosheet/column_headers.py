@@ -111,6 +111,26 @@ class ColumnIDMap():
                 self.column_id_to_column_header[sheet_index][column_id] = column_header
                 self.column_header_to_column_id[sheet_index][column_header] = column_id
 
+    def copy(self, deep_sheet_indexes: Optional[Collection[int]]=None) -> "ColumnIDMap":
+        """
+        Returns a copy of this column id map that shares the mappings for all
+        sheets other than those in deep_sheet_indexes, which are copied so they
+        can be safely modified.
+        """
+        if deep_sheet_indexes is None:
+            deep_sheet_indexes = []
+
+        column_id_map = ColumnIDMap([])
+        column_id_map.column_id_to_column_header = [
+            dict(mapping) if sheet_index in deep_sheet_indexes else mapping
+            for sheet_index, mapping in enumerate(self.column_id_to_column_header)
+        ]
+        column_id_map.column_header_to_column_id = [
+            dict(mapping) if sheet_index in deep_sheet_indexes else mapping
+            for sheet_index, mapping in enumerate(self.column_header_to_column_id)
+        ]
+        return column_id_map
+
     def set_column_header(self, sheet_index: int, column_id: ColumnID, column_header: ColumnHeader) -> None:
         """
         Sets a column id and column header to match to eachother. 
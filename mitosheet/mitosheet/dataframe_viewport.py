@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+A viewport is a window of rows and columns of a dataframe, that the
+frontend requests when it needs to display data that it does not have,
+rather than us sending the entire dataframe after every edit.
+
+As the frontend often requests the same viewports repeatedly (e.g. when
+scrolling back and forth), we cache the most recent viewports of each sheet.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from mitosheet.column_headers import get_column_header_display
+from mitosheet.types import ColumnHeader, ColumnID
+from mitosheet.utils import MAX_COLUMNS, MAX_ROWS, convert_df_to_parsed_json, get_values_fingerprint
+
+# The most recent viewports we keep for each sheet
+MAX_CACHED_VIEWPORTS_PER_SHEET = 10
+
+ViewportKey = Tuple[int, int, int, int]
+
+
+def get_dataframe_viewport_json(
+        df: pd.DataFrame,
+        column_headers_to_column_ids: Dict[ColumnHeader, ColumnID],
+        start_row: int,
+        num_rows: int,
+        start_column: int,
+        num_columns: int
+    ) -> Dict[str, Any]:
+    """
+    Returns the rows and columns of the df in the viewport, in the same format
+    as the data and index in the sheet data json.
+
+    At most MAX_ROWS rows and MAX_COLUMNS columns are returned.
+    """
+    start_row = max(0, start_row)
+    start_column = max(0, start_column)
+    end_row = start_row + max(0, min(num_rows, MAX_ROWS))
+    end_column = start_column + max(0, min(num_columns, MAX_COLUMNS))
+
+    viewport_df = df.iloc[start_row:end_row, start_column:end_column]
+    json_obj = convert_df_to_parsed_json(viewport_df, max_rows=None, max_columns=MAX_COLUMNS)
+
+    data = []
+    for column_index, column_header in enumerate(viewport_df.columns):
+        data.append({
+            'columnID': column_headers_to_column_ids[column_header],
+            'columnHeader': get_column_header_display(column_header),
+            'columnDtype': str(viewport_df.dtypes.iloc[column_index]),
+            'columnData': [row[column_index] for row in json_obj['data']]
+        })
+
+    return {
+        'startRow': start_row,
+        'startColumn': start_column,
+        'numRows': len(df.index),
+        'numColumns': len(df.columns),
+        'data': data,
+        'index': json_obj['index'],
+    }
+
+
+def get_dataframe_fingerprint(df: pd.DataFrame) -> Tuple[Any, ...]:
+    """
+    Returns a fingerprint of the memory that the columns and index of the df
+    are stored in. Shallow copies of a dataframe have the same fingerprint, and
+    as dataframes in a state are never changed in place, dataframes with the 
+    same fingerprint have the same data.
+
+    NOTE: memory can be reused once the dataframe is deleted, so fingerprints 
+    can only be compared while a reference to the dataframe is kept.
+    """
+    column_fingerprints: List[Any] = [get_values_fingerprint(series.values) for _, series in df.items()]
+    if isinstance(df.index, pd.RangeIndex):
+        index_fingerprint = (df.index.start, df.index.stop, df.index.step)
+    else:
+        index_fingerprint = get_values_fingerprint(df.index.values)
+    return (df.shape, tuple(column_fingerprints), index_fingerprint)
+
+
+class DataframeViewportCache():
+    """
+    Caches the most recent viewports of each sheet.
+
+    A sheet's cached viewports are cleared when the dataframe or column ids of
+    that sheet change. As sheets that are not modified by a step are shallow 
+    copies of the previous step's dataframe, edits only clear the sheets they modify.
+
+    NOTE: viewports are read from the API thread, so we lock the cache.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.dfs: Dict[int, pd.DataFrame] = {}
+        self.df_fingerprints: Dict[int, Tuple[Any, ...]] = {}
+        self.column_headers_to_column_ids: Dict[int, Dict[ColumnHeader, ColumnID]] = {}
+        self.viewports: Dict[int, 'OrderedDict[ViewportKey, Dict[str, Any]]'] = {}
+
+    def get_viewport(
+            self,
+            sheet_index: int,
+            df: pd.DataFrame,
+            column_headers_to_column_ids: Dict[ColumnHeader, ColumnID],
+            start_row: int,
+            num_rows: int,
+            start_column: int,
+            num_columns: int
+        ) -> Dict[str, Any]:
+        key = (start_row, num_rows, start_column, num_columns)
+
+        with self.lock:
+            if self.dfs.get(sheet_index) is not df:
+                df_fingerprint = get_dataframe_fingerprint(df)
+                if self.df_fingerprints.get(sheet_index) != df_fingerprint:
+                    self.viewports[sheet_index] = OrderedDict()
+                self.dfs[sheet_index] = df
+                self.df_fingerprints[sheet_index] = df_fingerprint
+
+            if self.column_headers_to_column_ids.get(sheet_index) is not column_headers_to_column_ids:
+                self.column_headers_to_column_ids[sheet_index] = column_headers_to_column_ids
+                self.viewports[sheet_index] = OrderedDict()
+
+            sheet_viewports = self.viewports[sheet_index]
+            if key in sheet_viewports:
+                sheet_viewports.move_to_end(key)
+                return sheet_viewports[key]
+
+        viewport = get_dataframe_viewport_json(
+            df, column_headers_to_column_ids, start_row, num_rows, start_column, num_columns
+        )
+
+        with self.lock:
+            # Only save the viewport if the sheet has not changed while we were reading it
+            if self.dfs.get(sheet_index) is df:
+                sheet_viewports = self.viewports[sheet_index]
+                sheet_viewports[key] = viewport
+                if len(sheet_viewports) > MAX_CACHED_VIEWPORTS_PER_SHEET:
+                    sheet_viewports.popitem(last=False)
+
+        return viewport
@@ -37,6 +37,10 @@ MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH = 'MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PA
 MITO_CONFIG_CUSTOM_IMPORTERS_PATH = 'MITO_CONFIG_CUSTOM_IMPORTERS_PATH'
 MITO_CONFIG_LOG_SERVER_URL = 'MITO_CONFIG_LOG_SERVER_URL'
 MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL = 'MITO_CONFIG_LOG_SERVER_BATCH_INTERVAL'
+MITO_CONFIG_STEP_STATES_MAX_BYTES = 'MITO_CONFIG_STEP_STATES_MAX_BYTES'
+MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL = 'MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL'
+MITO_CONFIG_STEP_STATES_KEEP_LAST = 'MITO_CONFIG_STEP_STATES_KEEP_LAST'
+MITO_CONFIG_IMPORT_CACHE_MAX_BYTES = 'MITO_CONFIG_IMPORT_CACHE_MAX_BYTES'
 
 
 # Note: The below keys can change since they are not set by the user.
@@ -45,6 +49,8 @@ MITO_CONFIG_CODE_SNIPPETS = 'MITO_CONFIG_CODE_SNIPPETS'
 # The default values to use if the mec does not define them
 DEFAULT_MITO_CONFIG_SUPPORT_EMAIL = 'founders@sagacollab.com'
 DEFAULT_MITO_CONFIG_CODE_SNIPPETS_SUPPORT_EMAIL = 'founders@sagacollab.com'
+DEFAULT_MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL = 10
+DEFAULT_MITO_CONFIG_STEP_STATES_KEEP_LAST = 3
 
 # Since Mito needs to look up individual environment variables, we need to 
 # know the names of the variables associated with each mito config version. 
@@ -73,6 +79,10 @@ MEC_VERSION_KEYS = {
         MITO_CONFIG_ENTERPRISE_TEMP_LICENSE,
         MITO_CONFIG_CUSTOM_SHEET_FUNCTIONS_PATH,
         MITO_CONFIG_CUSTOM_IMPORTERS_PATH,
+        MITO_CONFIG_STEP_STATES_MAX_BYTES,
+        MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL,
+        MITO_CONFIG_STEP_STATES_KEEP_LAST,
+        MITO_CONFIG_IMPORT_CACHE_MAX_BYTES,
     ]
 }
 
@@ -397,6 +407,47 @@ class MitoConfig:
             self.mec[MITO_CONFIG_ENTERPRISE_TEMP_LICENSE]
         )
 
+    @property
+    def step_states_max_bytes(self) -> Optional[int]:
+        """
+        The number of bytes of dataframe data that the states of the steps in an 
+        analysis can hold onto before the StepsManager starts releasing them. If
+        this is not set, step states are never released.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_STEP_STATES_MAX_BYTES] is None:
+            return None
+        return int(self.mec[MITO_CONFIG_STEP_STATES_MAX_BYTES])
+
+    @property
+    def step_states_checkpoint_interval(self) -> int:
+        """
+        Every step_states_checkpoint_interval-th step keeps its state, so that 
+        released states can be recomputed by replaying the steps after it.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL] is None:
+            return DEFAULT_MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL
+        return max(int(self.mec[MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL]), 1)
+
+    @property
+    def step_states_keep_last(self) -> int:
+        """
+        The number of most recent steps that always keep their state.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_STEP_STATES_KEEP_LAST] is None:
+            return DEFAULT_MITO_CONFIG_STEP_STATES_KEEP_LAST
+        return int(self.mec[MITO_CONFIG_STEP_STATES_KEEP_LAST])
+
+    @property
+    def import_cache_max_bytes(self) -> Optional[int]:
+        """
+        The number of bytes of imported dataframes that can be saved to disk, so 
+        that replaying an import of unchanged files does not read them again. If 
+        this is not set, imports are not cached.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_IMPORT_CACHE_MAX_BYTES] is None:
+            return None
+        return int(self.mec[MITO_CONFIG_IMPORT_CACHE_MAX_BYTES])
+
     # Add new mito configuration options here ...
 
     @property
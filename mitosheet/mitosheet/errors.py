@@ -591,6 +591,18 @@ def make_dataframe_not_found_error(df_name: str) -> MitoError:
         f'{df_name} is not defined.'
     )
 
+def make_input_dataframe_changed_error() -> MitoError:
+    """
+    Occurs when a dataframe that was passed to the mitosheet without being copied
+    is changed in place after the mitosheet was rendered
+    """
+    
+    return MitoError(
+        'input_dataframe_changed_error', 
+        "Input Dataframe Changed",
+        'A dataframe passed to the mitosheet with copy_dataframes=False was changed after the mitosheet was rendered. Please rerun the cell that renders the mitosheet.'
+    )
+
 ARG_FULL_NAME = {
     'int': 'number',
     'float': 'number',
@@ -61,6 +61,7 @@ class MitoBackend():
             default_editing_mode: Optional[DefaultEditingMode]=None,
             theme: Optional[MitoTheme]=None,
             input_cell_execution_count: Optional[int]=None,
+            copy_dataframes: bool=True,
         ):
         """
         Takes a list of dataframes and strings that are paths to CSV files
@@ -110,7 +111,8 @@ class MitoBackend():
             column_definitions=column_definitions,
             theme=theme,
             default_editing_mode=default_editing_mode,
-            input_cell_execution_count=input_cell_execution_count
+            input_cell_execution_count=input_cell_execution_count,
+            copy_dataframes=copy_dataframes
         )
 
         # And the api
@@ -125,6 +127,16 @@ class MitoBackend():
 
         self.mito_send: Callable = lambda x: None # type: ignore
 
+        # If the frontend can read the sheet data from binary buffers, which it 
+        # tells us when it opens the comm, then we send numeric columns this way
+        self.use_binary_sheet_data = False
+
+        # If the frontend can apply a delta to the sheet data it has, which it also
+        # tells us when it opens the comm, then we only send the sheets that changed.
+        # We store the version of each sheet that the frontend has
+        self.use_sheet_data_delta = False
+        self.sent_sheet_data_versions: List[int] = []
+
         self.theme = theme
 
     @property
@@ -150,6 +162,51 @@ class MitoBackend():
             'user_profile_json': self.get_user_profile_json()
         }
 
+    def send_response_with_shared_state_variables(self, event_id: str) -> None:
+        """
+        Tells the front-end to render the new sheet and new code. If the front-end 
+        supports it, numeric columns in the sheet data are sent as binary buffers 
+        with the message, rather than in the sheet data json, and only the sheets 
+        that changed are sent in a sheet data delta.
+        """
+        if self.use_sheet_data_delta:
+            sheet_data_delta_json, buffers, self.sent_sheet_data_versions = self.steps_manager.get_sheet_data_delta_json_and_buffers(
+                self.sent_sheet_data_versions, self.use_binary_sheet_data
+            )
+            message = {
+                'event': 'response',
+                'id': event_id,
+                'shared_variables': {
+                    'sheet_data_delta_json': sheet_data_delta_json,
+                    'analysis_data_json': self.steps_manager.analysis_data_json,
+                    'user_profile_json': self.get_user_profile_json()
+                }
+            }
+            if self.use_binary_sheet_data:
+                self.mito_send(message, buffers=buffers)
+            else:
+                self.mito_send(message)
+            return
+
+        if not self.use_binary_sheet_data:
+            self.mito_send({
+                'event': 'response',
+                'id': event_id,
+                'shared_variables': self.get_shared_state_variables()
+            })
+            return
+
+        sheet_data_json, buffers = self.steps_manager.get_sheet_data_json_and_buffers()
+        self.mito_send({
+            'event': 'response',
+            'id': event_id,
+            'shared_variables': {
+                'sheet_data_json': sheet_data_json,
+                'analysis_data_json': self.steps_manager.analysis_data_json,
+                'user_profile_json': self.get_user_profile_json()
+            }
+        }, buffers=buffers)
+
     def get_user_profile_json(self) -> str:
         return json.dumps({
             # Dynamic, update each time
@@ -183,17 +240,14 @@ class MitoBackend():
         # First, we send this new edit to the evaluator
         self.steps_manager.handle_edit_event(event)
 
-        # Also, write the analysis to a file!
-        write_save_analysis_file(self.steps_manager)
+        # Also, write the analysis to a file! We do this in the background, so a
+        # slow disk does not slow down the response
+        write_save_analysis_file(self.steps_manager, in_background=True)
 
         # Tell the front-end to render the new sheet and new code with an empty
         # response. NOTE: in the future, we can actually send back some data
         # with the response (like an error), to get this response in-place!        
-        self.mito_send({
-            'event': 'response',
-            'id': event['id'],
-            'shared_variables': self.get_shared_state_variables()
-        })
+        self.send_response_with_shared_state_variables(event['id'])
 
 
     def handle_update_event(self, event: Dict[str, Any]) -> None:
@@ -222,16 +276,13 @@ class MitoBackend():
                     raise e
                 raise make_execution_error(error_modal=False)
             raise
-        # Also, write the analysis to a file!
-        write_save_analysis_file(self.steps_manager)
+        # Also, write the analysis to a file! We do this in the background, so a
+        # slow disk does not slow down the response
+        write_save_analysis_file(self.steps_manager, in_background=True)
 
         # Tell the front-end to render the new sheet and new code with an empty
         # response. 
-        self.mito_send({
-            'event': 'response',
-            'id': event['id'],
-            'shared_variables': self.get_shared_state_variables()
-        })
+        self.send_response_with_shared_state_variables(event['id'])
 
     def receive_message(self, content: Dict[str, Any]) -> bool:
         """
@@ -322,6 +373,7 @@ def get_mito_backend(
         user_defined_editors: Optional[List[Callable]]=None,
         column_definitions: Optional[List[ColumnDefinitions]]=None,
         input_cell_execution_count: Optional[int]=None,
+        copy_dataframes: bool=True,
     ) -> MitoBackend:
 
     # We pass in the dataframes directly to the widget
@@ -332,7 +384,8 @@ def get_mito_backend(
         user_defined_importers=user_defined_importers,
         user_defined_editors=user_defined_editors,
         column_definitions=column_definitions,
-        input_cell_execution_count=input_cell_execution_count
+        input_cell_execution_count=input_cell_execution_count,
+        copy_dataframes=copy_dataframes
     ) 
 
     return mito_backend
@@ -356,6 +409,13 @@ def register_comm_target_on_mito_backend(
         # Save the comm in the mito widget, so we can use this .send function
         mito_backend.mito_send = comm.send
 
+        # The frontend tells us if it can read sheet data from binary buffers when opening the comm
+        open_data = open_msg['content']['data']
+        mito_backend.use_binary_sheet_data = isinstance(open_data, dict) and open_data.get('binary_sheet_data', False) is True
+        # A new comm has none of the sheet data, so we resend all of the sheets
+        mito_backend.use_sheet_data_delta = isinstance(open_data, dict) and open_data.get('sheet_data_delta', False) is True
+        mito_backend.sent_sheet_data_versions = []
+
         # Send data to the frontend on creation, so the frontend knows that we have
         # actually registered the comm on the backend
         comm.send({'echo': open_msg['content']['data']}) # type: ignore
@@ -393,7 +453,8 @@ def sheet(
         sheet_functions: Optional[List[Callable]]=None,
         importers: Optional[List[Callable]]=None,
         editors: Optional[List[Callable]]=None,
-        input_cell_execution_count: Optional[int]=None # If the sheet is a dataframe mime renderer, we pass the cell_id so we know where to generate the code. 
+        input_cell_execution_count: Optional[int]=None, # If the sheet is a dataframe mime renderer, we pass the cell_id so we know where to generate the code. 
+        copy_dataframes: bool=True # If False, the passed dataframes are shared with the sheet rather than copied. They must not be changed while the sheet is in use.
     ) -> None:
     """
     Renders a Mito sheet. If no arguments are passed, renders an empty sheet. Otherwise, renders
@@ -446,7 +507,8 @@ def sheet(
             user_defined_functions=sheet_functions,
             user_defined_importers=importers,
             user_defined_editors=editors,
-            input_cell_execution_count=input_cell_execution_count
+            input_cell_execution_count=input_cell_execution_count,
+            copy_dataframes=copy_dataframes
         )
 
         # Setup the comm target on this
@@ -9,10 +9,12 @@ as well as the original dataframe, and returns the current state
 of the sheet as a dataframe
 """
 import datetime
+from collections import OrderedDict
 from distutils.version import LooseVersion
+import hashlib
 import re
 import warnings
-from typing import Any, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import pandas as pd
 
@@ -28,7 +30,7 @@ from mitosheet.types import (ColumnHeader, FrontendFormula,
                              FormulaAppliedToType, RawParserMatch, ParserMatch,
                              ParserMatchSubstringRange, RowOffset)
 from mitosheet.user.utils import get_pandas_version
-from mitosheet.utils import is_prev_version
+from mitosheet.utils import get_dataframe_index, get_values_fingerprint, is_prev_version
 
 from mitosheet.array_utils import deduplicate_array
 
@@ -470,7 +472,7 @@ def get_raw_parser_matches(
     """
 
     df = dfs[sheet_index]
-    index = df.index
+    index = get_dataframe_index(df)
     column_headers: List[ColumnHeader] = df.columns.to_list()
 
     raw_parser_matches: List[RawParserMatch] = []
@@ -981,6 +983,133 @@ def replace_functions(
     return formula_with_functions, functions
 
 
+# The most recent parsed formulas we keep. Parsing the same formula is common, as 
+# steps are re-executed and set column formula parses each formula multiple times
+MAX_PARSE_FORMULA_CACHE_SIZE = 1000
+
+ParsedFormula = Tuple[str, Set[str], Set[ColumnHeader], Set[IndexLabel]]
+
+parse_formula_cache: 'OrderedDict[Any, ParsedFormula]' = OrderedDict()
+parse_formula_cache_hits = 0
+parse_formula_cache_misses = 0
+
+# The digests of the most recent indexes, keyed on the fingerprint of the memory 
+# their values are stored in, so we don't hash the same index for each formula. 
+# We keep a reference to the values, so their memory is not reused
+MAX_INDEX_DIGEST_CACHE_SIZE = 10
+
+index_digest_cache: 'OrderedDict[Any, Tuple[Any, str]]' = OrderedDict()
+
+
+def get_parse_formula_cache_info() -> Dict[str, int]:
+    """
+    Returns the hits, misses and size of the parse formula cache, for profiling.
+    """
+    return {
+        'hits': parse_formula_cache_hits,
+        'misses': parse_formula_cache_misses,
+        'size': len(parse_formula_cache),
+    }
+
+
+def clear_parse_formula_cache() -> None:
+    global parse_formula_cache_hits, parse_formula_cache_misses
+    parse_formula_cache.clear()
+    index_digest_cache.clear()
+    parse_formula_cache_hits = 0
+    parse_formula_cache_misses = 0
+
+
+def get_parse_formula_cache_value_key(value: Any) -> Any:
+    """
+    Returns a hashable key for a value, that includes the type of the value, so 
+    that values that are equal but transpile differently (e.g. 1, 1.0 and True)
+    have different keys.
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(get_parse_formula_cache_value_key(v) for v in value))
+    return (type(value).__name__, value)
+
+
+def get_index_digest(index: pd.Index) -> str:
+    """
+    Returns a short digest of the labels in the index. Hashing the labels takes
+    time proportional to the length of the index, so we cache the digest for 
+    indexes whose values are stored in the same memory.
+    """
+    values = index.values
+    fingerprint = get_values_fingerprint(values)
+    if fingerprint in index_digest_cache:
+        index_digest_cache.move_to_end(fingerprint)
+        return index_digest_cache[fingerprint][1]
+
+    digest = hashlib.sha1(pd.util.hash_pandas_object(index, index=False).values.tobytes()).hexdigest()
+
+    index_digest_cache[fingerprint] = (values, digest)
+    if len(index_digest_cache) > MAX_INDEX_DIGEST_CACHE_SIZE:
+        index_digest_cache.popitem(last=False)
+
+    return digest
+
+
+def get_parse_formula_cache_index_key(index: pd.Index) -> Any:
+    """
+    Returns a key for the index, as the index labels that a formula can 
+    reference depend on the index.
+    """
+    if isinstance(index, pd.RangeIndex):
+        return ('RangeIndex', index.start, index.stop, index.step)
+    return (
+        type(index).__name__, 
+        str(index.dtype), 
+        len(index), 
+        get_index_digest(index)
+    )
+
+
+def get_parse_formula_cache_key(
+        formula: str, 
+        column_header: ColumnHeader, 
+        formula_label: Union[str, bool, int, float],
+        index_labels_formula_is_applied_to: FormulaAppliedToType,
+        dfs: List[pd.DataFrame],
+        df_names: List[str],
+        sheet_index: int,
+        include_df_set: bool,
+    ) -> Optional[Any]:
+    """
+    Returns the key of a formula in the parse formula cache, which includes 
+    everything the parsed formula depends on: the formula, the column headers
+    and dtypes of all sheets, and the index of the sheet the formula is in.
+
+    Returns None if the formula cannot be cached, e.g. if some part of the 
+    key is unhashable.
+    """
+    try:
+        sheet_schemas = tuple(
+            (
+                get_parse_formula_cache_value_key(df.columns.to_list()), 
+                tuple(df.dtypes)
+            ) for df in dfs
+        )
+        key = (
+            formula,
+            get_parse_formula_cache_value_key(column_header),
+            get_parse_formula_cache_value_key(formula_label),
+            index_labels_formula_is_applied_to['type'],
+            get_parse_formula_cache_value_key(index_labels_formula_is_applied_to.get('index_labels')),
+            sheet_schemas,
+            get_parse_formula_cache_index_key(get_dataframe_index(dfs[sheet_index])),
+            tuple(df_names),
+            sheet_index,
+            include_df_set,
+        )
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
 def parse_formula(
         formula: Optional[str], 
         column_header: ColumnHeader, 
@@ -990,7 +1119,7 @@ def parse_formula(
         df_names: List[str],
         sheet_index: int,
         include_df_set: bool=True,
-    ) -> Tuple[str, Set[str], Set[ColumnHeader], Set[IndexLabel]]:
+    ) -> ParsedFormula:
     """
     Returns a representation of the formula that is easy to handle, specifically
     by returning (python_code, functions, column_header_dependencies), where column_headers
@@ -998,6 +1127,50 @@ def parse_formula(
 
     If include_df_set, then will return {df_name}[{column_header}] = {parsed formula}, and if
     not then will just return {parsed formula}
+
+    Parsed formulas are cached, see get_parse_formula_cache_key for what the cache is keyed on.
+    """
+    global parse_formula_cache_hits, parse_formula_cache_misses
+
+    # If the column doesn't have a formula, then there are no dependencies, duh!
+    if formula is None or formula == '':
+        return '', set(), set(), set()
+
+    key = get_parse_formula_cache_key(
+        formula, column_header, formula_label, index_labels_formula_is_applied_to, dfs, df_names, sheet_index, include_df_set
+    )
+    if key is not None and key in parse_formula_cache:
+        parse_formula_cache_hits += 1
+        parse_formula_cache.move_to_end(key)
+        final_code, functions, column_header_dependencies, index_label_dependencies = parse_formula_cache[key]
+        # We return copies of the sets, so callers can't change the cached ones
+        return final_code, set(functions), set(column_header_dependencies), set(index_label_dependencies)
+
+    parse_formula_cache_misses += 1
+    final_code, functions, column_header_dependencies, index_label_dependencies = parse_formula_without_cache(
+        formula, column_header, formula_label, index_labels_formula_is_applied_to, dfs, df_names, sheet_index, include_df_set
+    )
+
+    if key is not None:
+        parse_formula_cache[key] = (final_code, set(functions), set(column_header_dependencies), set(index_label_dependencies))
+        if len(parse_formula_cache) > MAX_PARSE_FORMULA_CACHE_SIZE:
+            parse_formula_cache.popitem(last=False)
+
+    return final_code, functions, column_header_dependencies, index_label_dependencies
+
+
+def parse_formula_without_cache(
+        formula: Optional[str], 
+        column_header: ColumnHeader, 
+        formula_label: Union[str, bool, int, float],
+        index_labels_formula_is_applied_to: FormulaAppliedToType,
+        dfs: List[pd.DataFrame],
+        df_names: List[str],
+        sheet_index: int,
+        include_df_set: bool=True,
+    ) -> ParsedFormula:
+    """
+    Parses the formula, without using the parse formula cache. See parse_formula.
     """
     df = dfs[sheet_index]
     df_name = df_names[sheet_index]
@@ -1042,7 +1215,7 @@ def parse_formula(
             index_labels = index_labels_formula_is_applied_to["index_labels"] # type: ignore
             # If you're writing to an index that is a datetime, we make sure that these objects are datetimes (this is only necessary)
             # on versions of pandas earlier than 1.0
-            if is_datetime_index(df.index) and is_prev_version(get_pandas_version(), '1.0.0'):
+            if is_datetime_index(get_dataframe_index(df)) and is_prev_version(get_pandas_version(), '1.0.0'):
                 index_labels = pd.to_datetime(index_labels)
 
             final_code = f'{df_name}.loc[{get_column_header_list_as_transpiled_code(index_labels)}, [{transpiled_column_header}]] = {code_with_functions}' # type: ignore
@@ -15,6 +15,11 @@ class CopyPreprocessStepPerformer(PreprocessStepPerformer):
     """
     This preprocessing step is responsible for making a copy of all of the
     passed arguments, so that dataframes aren't modified incorrectly.
+
+    If deep is False, dataframes are only shallow copied, and so share their
+    data with the dataframes the user passed. This is safe as steps never 
+    modify the dataframes of a state in place - they deep copy the sheets
+    that they modify - so copies are only made when they are needed.
     """
 
     @classmethod
@@ -26,13 +31,13 @@ class CopyPreprocessStepPerformer(PreprocessStepPerformer):
         return 'copy'
 
     @classmethod
-    def execute(cls, args: Collection[Any]) -> Tuple[List[Any], Optional[List[str]], Optional[Dict[str, Any]]]:
+    def execute(cls, args: Collection[Any], deep: bool=True) -> Tuple[List[Any], Optional[List[str]], Optional[Dict[str, Any]]]:
         
         new_args = []
         for arg in args:
             if isinstance(arg, pd.DataFrame):
                 # Do a pandas copy if it's a dataframe
-                arg_copy = arg.copy(deep=True)
+                arg_copy = arg.copy(deep=deep)
             else:
                 # Simple deepcopy if it's a string
                 arg_copy = deepcopy(arg)
@@ -12,7 +12,8 @@ def get_conditonal_formatting_result(
         conditional_formatting_rules: List[Dict[str, Any]],
         max_rows: Optional[int]=MAX_ROWS,
     ) -> ConditionalFormattingResult: 
-    from mitosheet.step_performers.filter import check_filters_contain_condition_that_needs_full_df
+    from mitosheet.step_performers.filter import (
+        check_filters_contain_condition_that_needs_full_df, get_full_applied_filter)
 
     invalid_conditional_formats: ConditionalFormattingInvalidResults = dict()
     formatted_result: ConditionalFormattingCellResults = dict()
@@ -35,13 +36,12 @@ def get_conditonal_formatting_result(
                 # on the full dataframe. In other cases, we only operate on the first 1500 rows, for speed
                 _df = df
                 if not check_filters_contain_condition_that_needs_full_df(filters):
-                    df = df.head(max_rows)
+                    _df = df.head(max_rows)
 
                 column_header = state.column_ids.get_column_header_by_id(sheet_index, column_id)
 
-                # Use the get_applied_filter function from our filtering infrastructure
-                from mitosheet.step_performers.filter import \
-                    get_full_applied_filter
+                # Use the get_applied_filter function from our filtering infrastructure, which caches the
+                # mask of each filter, so we only recompute the masks of columns that have changed
                 full_applied_filter, _ = get_full_applied_filter(_df, column_header, 'And', filters)
 
                 # We can only take the first max_rows here, as this is all we need
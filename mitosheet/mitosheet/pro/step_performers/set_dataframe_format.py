@@ -34,7 +34,7 @@ class SetDataframeFormatStepPerformer(StepPerformer):
         df_format: DataframeFormat = get_param(params, 'df_format')
         
         # We make a new state to modify it
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
         post_state.df_formats[sheet_index] = df_format
 
         return post_state, {
@@ -63,4 +63,8 @@ class SetDataframeFormatStepPerformer(StepPerformer):
 
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
-        return {get_param(params, 'sheet_index')} # TODO: add the modified indexes here!
\ No newline at end of file
+        return {get_param(params, 'sheet_index')} # TODO: add the modified indexes here!
+
+    @classmethod
+    def get_read_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
+        return {get_param(params, 'sheet_index')}
\ No newline at end of file
@@ -4,6 +4,7 @@ from mitosheet.public.v2 import (
 
 from mitosheet.public.v3.rolling_range import RollingRange
 from mitosheet.public.v3.formatting import add_formatting_to_excel_sheet
+from mitosheet.public.v3.graphs import sum_bar_graph_data, bin_scatter_graph_data, get_box_graph_quantiles, downsample_line_graph_data
 from mitosheet.public.v3.sheet_functions import FUNCTIONS
 from mitosheet.public.v3.sheet_functions import *
 from mitosheet.public.v3.types.bool import cast_string_to_bool
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Graphing every row of a large dataframe crashes the browser, and so rather than
+graphing the first rows of a large dataframe, we reduce the dataframe to the data
+that the graph actually shows.
+
+These functions are used by both Mito and the generated graph code, so that the
+graph in Mito is the same as the graph that the generated code creates.
+"""
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+
+
+def sum_bar_graph_data(df: pd.DataFrame, x: Any, y: List[Any], groupby: List[Any]) -> pd.DataFrame:
+    """
+    Returns the sum of the y columns for each x value in each group, which is
+    the height of the stacked bars that px.bar shows for these rows.
+    """
+    return df.groupby([x] + groupby, sort=False)[y].sum().reset_index()
+
+
+def bin_scatter_graph_data(df: pd.DataFrame, x: Any, y: Any, groupby: List[Any], num_bins: int) -> pd.DataFrame:
+    """
+    Splits the scatter plot of each group into a num_bins by num_bins grid, and
+    returns the first row in each cell of the grid that contains a point.
+
+    Plotly does not draw points with a missing x or y value, so we drop these rows.
+    """
+    x_values = _get_numeric_values(df[x])
+    y_values = _get_numeric_values(df[y])
+    is_valid = ~np.isnan(x_values) & ~np.isnan(y_values)
+
+    keys = pd.DataFrame({
+        'x_bin': _get_bins(x_values, num_bins),
+        'y_bin': _get_bins(y_values, num_bins),
+    })
+    for index, column_header in enumerate(groupby):
+        keys[f'group_{index}'] = df[column_header].values
+
+    return df[is_valid & ~keys.duplicated().values]
+
+
+def get_box_graph_quantiles(df: pd.DataFrame, value_columns: List[Any], groupby: List[Any], num_quantiles: int) -> pd.DataFrame:
+    """
+    Returns num_quantiles evenly spaced quantiles of the value columns in each
+    group, from which px.box computes the same box as from the values themselves.
+    """
+    quantiles = np.linspace(0, 1, num_quantiles)
+    if len(groupby) == 0:
+        return df[value_columns].quantile(quantiles).reset_index(drop=True)
+
+    return df.groupby(groupby, sort=False)[value_columns].quantile(quantiles).reset_index(level=-1, drop=True).reset_index()
+
+
+def downsample_line_graph_data(df: pd.DataFrame, x: Any, y: List[Any], groupby: List[Any], num_points: int) -> pd.DataFrame:
+    """
+    Returns the rows of the df that the Largest-Triangle-Three-Buckets algorithm
+    selects for the line of each y column in each group, which keeps the peaks
+    and troughs of the line, rather than just its start.
+    """
+    x_values = _get_numeric_values(df[x])
+    if len(groupby) == 0:
+        group_indexes = [np.arange(len(df.index))]
+    else:
+        group_indexes = list(df.groupby(groupby, sort=False).indices.values())
+
+    selected_indexes = []
+    for column_header in y:
+        y_values = _get_numeric_values(df[column_header])
+        is_valid = ~np.isnan(x_values) & ~np.isnan(y_values)
+        for indexes in group_indexes:
+            valid_indexes = indexes[is_valid[indexes]]
+            selected_indexes.append(valid_indexes[_get_lttb_indexes(x_values[valid_indexes], y_values[valid_indexes], num_points)])
+
+    if len(selected_indexes) == 0:
+        return df.iloc[:0]
+
+    return df.iloc[np.unique(np.concatenate(selected_indexes))]
+
+
+def _get_numeric_values(series: pd.Series) -> np.ndarray:
+    """
+    Returns the values of the number or datetime series as floats, with NaN for missing values.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return (series - series.min()).dt.total_seconds().values
+    return series.astype(float).values
+
+
+def _get_bins(values: np.ndarray, num_bins: int) -> np.ndarray:
+    """
+    Returns the bin of each value, when splitting the range of the values into
+    num_bins bins of equal width, or -1 for missing values.
+    """
+    bins = np.full(len(values), -1, dtype=np.int64)
+    is_valid = ~np.isnan(values)
+    if not is_valid.any():
+        return bins
+
+    min_value = values[is_valid].min()
+    max_value = values[is_valid].max()
+    if max_value == min_value:
+        bins[is_valid] = 0
+        return bins
+
+    bins[is_valid] = np.minimum(
+        ((values[is_valid] - min_value) / (max_value - min_value) * num_bins).astype(np.int64),
+        num_bins - 1
+    )
+    return bins
+
+
+def _get_lttb_indexes(x: np.ndarray, y: np.ndarray, num_points: int) -> np.ndarray:
+    """
+    Returns the indexes of the num_points points that the Largest-Triangle-Three-Buckets
+    algorithm selects, which always include the first and last points.
+
+    Each of the other points is the point in its bucket that makes the largest triangle
+    with the previously selected point and the average of the next bucket.
+    """
+    num_values = len(x)
+    if num_values <= num_points or num_points < 3:
+        return np.arange(num_values)
+
+    # The first and last points are their own buckets, so we split the rest into num_points - 2 buckets
+    bucket_edges = np.linspace(1, num_values - 1, num_points - 1).astype(np.int64)
+
+    indexes = np.empty(num_points, dtype=np.int64)
+    indexes[0] = 0
+    indexes[-1] = num_values - 1
+
+    previous_index = 0
+    for bucket_index in range(num_points - 2):
+        start, end = bucket_edges[bucket_index], bucket_edges[bucket_index + 1]
+        if bucket_index + 2 < len(bucket_edges):
+            next_start, next_end = bucket_edges[bucket_index + 1], bucket_edges[bucket_index + 2]
+        else:
+            next_start, next_end = num_values - 1, num_values
+
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+        previous_x = x[previous_index]
+        previous_y = y[previous_index]
+
+        # Twice the area of the triangle made by the previous point, each point in the bucket, and the average of the next bucket
+        areas = np.abs(
+            (previous_x - average_x) * (y[start:end] - previous_y) - (previous_x - x[start:end]) * (average_y - previous_y)
+        )
+        previous_index = start + int(np.argmax(areas))
+        indexes[bucket_index + 1] = previous_index
+
+    return indexes
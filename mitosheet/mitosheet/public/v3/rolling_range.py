@@ -1,7 +1,8 @@
 
 from datetime import datetime, timedelta
-from typing import Callable, Union
+from typing import Callable, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 
@@ -28,6 +29,10 @@ class RollingRange():
 
     Thus, we need to attach both the window size and the offset in a single expression, and
     thus this is exactly what we capture in this new object.
+
+    Calling a function on every window is slow for large dataframes, so for the common reductions
+    (sum, count, min, max, std, var) we also provide methods that compute the same result for all
+    windows at once.
     """
 
     def __init__(self, obj: pd.DataFrame, window: int, offset: int):
@@ -47,7 +52,7 @@ class RollingRange():
         end = start + self.window
 
         while (start - self.offset) < len(self.obj): 
-            df_subset = self.obj[max(0, start):end] # avoid negative start, as this wraps around to the end
+            df_subset = self.obj[max(0, start):max(0, end)] # avoid negative start and end, as this wraps around to the end
 
             # We manually detect the default value case, as it messes up types otherwise (e.g. .sum().sum() returns a float with an empty df)
             if len(df_subset) == 0:
@@ -67,4 +72,114 @@ class RollingRange():
             else:
                 result = result + default_values
 
-        return pd.Series(result, index=self.obj.index)
\ No newline at end of file
+        return pd.Series(result, index=self.obj.index)
+
+    def sum(self) -> pd.Series:
+        """
+        Returns the sum of each window, where empty windows sum to 0.
+        """
+        if not self._is_numeric():
+            return self.apply(lambda df: df.sum().sum())
+
+        row_sums = self.obj.sum(axis=1)
+        if pd.api.types.is_integer_dtype(row_sums.dtype):
+            # Integer sums are exact, so we can take the difference of the cumulative sums
+            return self._get_cumulative_sum_difference(row_sums)
+
+        # For floats, we use pandas rolling sums, which avoid the precision loss of cumulative sums
+        return self._get_rolling_reduction(row_sums, 'sum').fillna(0)
+
+    def count(self) -> pd.Series:
+        """
+        Returns the number of non-null values in each window.
+        """
+        return self._get_cumulative_sum_difference(self.obj.count(axis=1))
+
+    def min(self) -> pd.Series:
+        """
+        Returns the minimum value of each window, where empty windows are 0.
+        """
+        if not self._is_numeric():
+            return self.apply(lambda df: df.min().min())
+
+        return self._get_rolling_reduction(self.obj.min(axis=1), 'min')
+
+    def max(self) -> pd.Series:
+        """
+        Returns the maximum value of each window, where empty windows are 0.
+        """
+        if not self._is_numeric():
+            return self.apply(lambda df: df.max().max())
+
+        return self._get_rolling_reduction(self.obj.max(axis=1), 'max')
+
+    def std(self) -> pd.Series:
+        """
+        Returns the sample standard deviation of all the values in each window, where 
+        empty windows are 0.
+        """
+        # Rolling windows only work on a single column
+        if not self._is_numeric() or len(self.obj.columns) != 1:
+            return self.apply(lambda df: df.stack().std())
+
+        return self._get_rolling_reduction(self.obj.iloc[:, 0], 'std')
+
+    def var(self) -> pd.Series:
+        """
+        Returns the sample variance of all the values in each window, where 
+        empty windows are 0.
+        """
+        # Rolling windows only work on a single column
+        if not self._is_numeric() or len(self.obj.columns) != 1:
+            return self.apply(lambda df: df.stack().var())
+
+        return self._get_rolling_reduction(self.obj.iloc[:, 0], 'var')
+
+    def _is_numeric(self) -> bool:
+        return all(dtype.kind in 'iuf' for dtype in self.obj.dtypes)
+
+    def _get_window_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the first and one past the last position of the window of
+        each row, clipped to the rows of the obj.
+        """
+        num_rows = len(self.obj)
+        positions = np.arange(num_rows)
+        starts = np.clip(positions + self.offset, 0, num_rows)
+        ends = np.clip(positions + self.offset + self.window, 0, num_rows)
+        return starts, np.maximum(starts, ends)
+
+    def _get_cumulative_sum_difference(self, row_values: pd.Series) -> pd.Series:
+        """
+        Sums the row_values in each window, by taking the difference of the 
+        cumulative sums at the ends of the window.
+        """
+        starts, ends = self._get_window_bounds()
+        cumulative_sums = np.concatenate([[0], np.cumsum(row_values.to_numpy())])
+        return pd.Series(cumulative_sums[ends] - cumulative_sums[starts], index=self.obj.index)
+
+    def _get_rolling_reduction(self, row_values: pd.Series, reduction: str) -> pd.Series:
+        """
+        Applies a pandas rolling reduction to the row_values in each window. Windows
+        with only null values are NaN, and windows with no rows are 0.
+        """
+        num_rows = len(self.obj)
+        starts, ends = self._get_window_bounds()
+
+        # We pad the values on both sides with a full window of nulls, which rolling 
+        # windows skip, so that the windows that run off either end have the same size
+        padding = np.full(self.window, np.nan)
+        padded_values = pd.Series(np.concatenate([padding, row_values.to_numpy(dtype=float), padding]))
+        rolled_values = getattr(padded_values.rolling(self.window, min_periods=1), reduction)().to_numpy()
+
+        # The window of each row ends at the position start + window - 1 of the obj
+        window_end_positions = np.arange(num_rows) + self.offset + 2 * self.window - 1
+        window_end_positions = np.clip(window_end_positions, 0, len(padded_values) - 1)
+        result = pd.Series(np.where(ends > starts, rolled_values[window_end_positions], 0), index=self.obj.index)
+
+        # Keep integers as integers, like reducing each window does. We cast the series, rather 
+        # than the values, as nullable integer dtypes are not numpy dtypes
+        if pd.api.types.is_integer_dtype(row_values.dtype) and reduction in ('min', 'max'):
+            result = result.astype(row_values.dtype)
+
+        return result
@@ -8,7 +8,7 @@ import pandas as pd
 from mitosheet.errors import MitoError
 from mitosheet.is_type_utils import (is_bool_dtype, is_datetime_dtype,
                                      is_float_dtype, is_int_dtype,
-                                     is_string_dtype)
+                                     is_string_dtype, is_timedelta_dtype)
 from mitosheet.public.v3.errors import handle_sheet_function_errors
 from mitosheet.public.v3.sheet_functions.utils import \
     get_series_from_primitive_or_series
@@ -64,28 +64,54 @@ def TYPE(series: pd.Series) -> pd.Series:
     }
     """
 
-    def get_element_type(element):
+    def get_element_type_name(element_type: type) -> str:
         # Start with bool!
-        if isinstance(element, bool):
+        if issubclass(element_type, bool):
             return 'bool'
-        elif isinstance(element, int):
+        elif issubclass(element_type, int):
             return 'number'
-        elif isinstance(element, float):
-            if np.isnan(element):
-                return 'NaN'
-            return 'number'
-        elif element is None or element is pd.NaT:
+        elif issubclass(element_type, float):
+            # Floats are 'NaN' or 'number', which we check for each element below
+            return 'float'
+        elif element_type is type(None) or element_type is type(pd.NaT):
             return 'NaN'
-        elif isinstance(element, str):
+        elif issubclass(element_type, str):
             return 'string'
-        elif isinstance(element, datetime) or isinstance(element, pd.Timestamp):
+        elif issubclass(element_type, datetime):
             return 'datetime'
-        elif isinstance(element, timedelta) or isinstance(element, pd.Timedelta):
+        elif issubclass(element_type, timedelta):
             return 'timedelta'
         return 'object'
 
-    return series.apply(get_element_type).astype('str')
+    column_dtype = str(series.dtype)
+    is_na = series.isna().values
+
+    def get_type_names_or_nan(type_name: str) -> np.ndarray:
+        return np.array([type_name, 'NaN'], dtype=object).take(is_na.astype(np.intp))
+
+    # Columns with these dtypes only hold one type of element, or NaN, so we don't need to look at each element
+    if isinstance(series.dtype, np.dtype) and is_bool_dtype(column_dtype):
+        type_names = np.full(len(series), 'bool', dtype=object)
+    elif isinstance(series.dtype, np.dtype) and is_int_dtype(column_dtype):
+        type_names = np.full(len(series), 'number', dtype=object)
+    elif isinstance(series.dtype, np.dtype) and is_float_dtype(column_dtype):
+        type_names = get_type_names_or_nan('number')
+    elif is_datetime_dtype(column_dtype):
+        type_names = get_type_names_or_nan('datetime')
+    elif isinstance(series.dtype, np.dtype) and is_timedelta_dtype(column_dtype):
+        type_names = get_type_names_or_nan('timedelta')
+    else:
+        # Otherwise, we get the type of each element, and only work out the name of each distinct type once
+        element_types = series.astype(object).map(type)
+        type_names = element_types.map({
+            element_type: get_element_type_name(element_type) for element_type in element_types.unique()
+        }).values.astype(object)
+
+        is_float = type_names == 'float'
+        type_names[is_float & is_na] = 'NaN'
+        type_names[is_float & ~is_na] = 'number'
 
+    return pd.Series(type_names, index=series.index)
 
 
 @handle_sheet_function_errors
@@ -120,16 +146,20 @@ def GETPREVIOUSVALUE(series: pd.Series, condition: BoolRestrictedInputType) -> p
         last_occurrence = False
     elif is_datetime_dtype(column_dtype):
         last_occurrence = pd.NaT
+    else:
+        # The default can't be stored in a column of this dtype
+        series = series.astype(object)
 
     condition = get_series_from_primitive_or_series(condition, series.index)
 
-    result = []
-    for index, value in condition.items():
-        if value:
-            last_occurrence = series[index]
-        result.append(last_occurrence)
+    # For each row, the position of the last row where the condition is True, or -1 if there is none yet
+    is_condition_met = condition.values.astype(bool)
+    last_occurrence_positions = np.maximum.accumulate(np.where(is_condition_met, np.arange(len(is_condition_met)), -1))
 
-    return pd.Series(result, index=series.index)
+    # Taking the values at these positions keeps the dtype of the series, and carries NaN values forward like any other value
+    result = series.take(np.maximum(last_occurrence_positions, 0)).where(last_occurrence_positions >= 0, last_occurrence)
+    result.index = series.index
+    return result
 
 @handle_sheet_function_errors
 def GETNEXTVALUE(series: pd.Series, condition: BoolRestrictedInputType) -> pd.Series:
@@ -243,13 +273,26 @@ def VLOOKUP(lookup_value: AnyPrimitiveOrSeriesInputType, where: pd.DataFrame, in
     # can be added back to the calling dataframe.
     merged.index = value.index
     
-    def get_value_at_index_in_row(row):
-        try:
-            return row.iloc[indices_to_return_from_range[row.name]]
-        # Because we can't control what the user puts in the index, we need to catch any errors
-        except Exception:
-            return None
-    return merged.apply(get_value_at_index_in_row, axis=1)
+    # The position of the column to return in each row of merged, or NaN if the index is not a whole number
+    positions = pd.to_numeric(pd.Series(indices_to_return_from_range.values), errors='coerce').values.astype(float)
+    num_columns = len(merged.columns)
+    # Like iloc, negative positions count from the end of the row
+    is_valid_position = (positions == np.floor(positions)) & (positions >= -num_columns) & (positions < num_columns)
+    positions = np.where(is_valid_position, positions, 0).astype(np.int64) % num_columns
+
+    unique_positions = np.unique(positions[is_valid_position])
+    if is_valid_position.all() and len(unique_positions) == 1:
+        result = merged.iloc[:, unique_positions[0]].copy()
+        result.index = value.index
+        return result
+
+    # Otherwise, we take the values of each row from the column that row returns, and return None for invalid indexes
+    values = np.full(len(merged.index), None, dtype=object)
+    for position in unique_positions:
+        row_positions = np.flatnonzero(is_valid_position & (positions == position))
+        values[row_positions] = merged.iloc[:, position].take(row_positions).astype(object).values
+
+    return pd.Series(values, index=value.index).infer_objects()
 
 # TODO: we should see if we can list these automatically!
 MISC_FUNCTIONS = {
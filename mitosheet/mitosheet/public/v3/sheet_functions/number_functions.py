@@ -104,7 +104,7 @@ def AVG(*argv: Optional[NumberInputType]) -> NumberFunctionReturnType:
             num_entries += int(num_non_null_values)
 
         elif isinstance(arg, RollingRange):
-            num_non_null_values_series = arg.apply(lambda df: df.count().sum())
+            num_non_null_values_series = arg.count()
             num_entries += num_non_null_values_series
             
         elif isinstance(arg, pd.Series):
@@ -349,7 +349,8 @@ def MAX(*argv: Union[NumberInputType, None, DatetimeRestrictedInputType]) -> Uni
         argv,
         lambda df: df.max().max(),
         lambda previous_value, new_value: max(previous_value, new_value),
-        lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).max(axis=1)
+        lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).max(axis=1),
+        lambda rolling_range: rolling_range.max()
     )
 
     # If we don't find any arguements, we default to 0 -- like Excel -- even for numbers
@@ -408,7 +409,8 @@ def MIN(*argv: Union[NumberInputType, None, DatetimeRestrictedInputType]) -> Uni
         argv,
         lambda df: df.min().min(),
         lambda previous_value, new_value: min(previous_value, new_value),
-        lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).min(axis=1)
+        lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).min(axis=1),
+        lambda rolling_range: rolling_range.min()
     )
 
     # If we don't find any arguements, we default to 0 -- like Excel
@@ -590,7 +592,7 @@ def STDEV(arg: NumberInputType) -> NumberFunctionReturnType:
     elif isinstance(arg, pd.DataFrame):
         return arg.stack().std() # We have to compute them all together
     else:
-        return arg.apply(lambda x: x.stack().std()) # type: ignore
+        return arg.std() # type: ignore
 
 
 @cast_values_in_all_args_to_type('number')
@@ -625,7 +627,8 @@ def SUM(*argv: Optional[NumberInputType]) -> NumberFunctionReturnType:
         argv,
         lambda df: df.sum().sum(),
         lambda previous_value, new_value: previous_value + new_value,
-        lambda previous_series, new_series: previous_series + new_series
+        lambda previous_series, new_series: previous_series + new_series,
+        lambda rolling_range: rolling_range.sum()
     )
 
 @cast_values_in_all_args_to_type('number')
@@ -740,7 +743,7 @@ def VAR(arg: NumberInputType) -> NumberFunctionReturnType:
     elif isinstance(arg, pd.DataFrame):
         return arg.stack().var() # type: ignore
     else:
-        return arg.apply(lambda x: x.stack().var()) # type: ignore
+        return arg.var() # type: ignore
 
 
 NUMBER_FUNCTIONS = {
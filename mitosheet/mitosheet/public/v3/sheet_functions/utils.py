@@ -62,7 +62,8 @@ def __get_new_result_series_or_primitive(
         arg: Union[PrimitiveType, None, pd.Series, RollingRange, pd.DataFrame], 
         get_primitive_value_from_dataframe: Callable[[pd.DataFrame], PrimitiveType],
         get_new_result_from_primitive_values: Callable[[PrimitiveType, PrimitiveType], PrimitiveType],
-        get_new_result_from_series: Callable[[pd.Series, pd.Series], pd.Series]
+        get_new_result_from_series: Callable[[pd.Series, pd.Series], pd.Series],
+        get_series_from_rolling_range: Optional[Callable[[RollingRange], pd.Series]]
     ) -> ResultType:
     """
     This helper function does the preprocessing for a single arg, and then combines it
@@ -83,7 +84,10 @@ def __get_new_result_series_or_primitive(
         return get_new_result(previous_result, reduced_df)
 
     elif isinstance(arg, RollingRange):
-        new_series = arg.apply(lambda df: get_primitive_value_from_dataframe(df))
+        if get_series_from_rolling_range is not None:
+            new_series = get_series_from_rolling_range(arg)
+        else:
+            new_series = arg.apply(lambda df: get_primitive_value_from_dataframe(df))
         return get_new_result(previous_result, new_series)
         
     elif isinstance(arg, pd.Series):
@@ -101,7 +105,8 @@ def get_final_result_series_or_primitive(
         argv: Tuple[Union[PrimitiveType, None, pd.Series, RollingRange, pd.DataFrame], ...], 
         get_primitive_value_from_dataframe: Callable[[pd.DataFrame], PrimitiveType],
         get_new_result_from_primitive_values: Callable[[PrimitiveType, PrimitiveType], PrimitiveType],
-        get_new_result_from_series: Callable[[pd.Series, pd.Series], pd.Series]
+        get_new_result_from_series: Callable[[pd.Series, pd.Series], pd.Series],
+        get_series_from_rolling_range: Optional[Callable[[RollingRange], pd.Series]]=None
     ) -> ResultType:
     """
     This function is the main workhorse of many sheet functions that fit a common pattern:
@@ -110,7 +115,8 @@ def get_final_result_series_or_primitive(
     2. They update the result with each arg in two steps, preprocessing the arg and then combining that with the result
     3. Preprocessing the arg:
         - For dataframe values, they turned into primitive values with get_primitive_value_from_dataframe
-        - For rolling ranges, they are turned into series using repeated application of get_primitive_value_from_dataframe
+        - For rolling ranges, they are turned into series using repeated application of get_primitive_value_from_dataframe,
+          unless get_series_from_rolling_range is passed, in which case it is used to compute all the windows at once
     4. Combining with the previous result. We are either combining two primtiive values, a primitive value and a series, or two series
         - If combining two primitive values, we combine with get_new_result_from_primitive_values
         - If combining a primitive value and a series, we use a .apply on the series with get_new_result_from_primitive_values
@@ -132,7 +138,8 @@ def get_final_result_series_or_primitive(
             arg,
             get_primitive_value_from_dataframe,
             get_new_result_from_primitive_values,
-            get_new_result_from_series
+            get_new_result_from_series,
+            get_series_from_rolling_range
         )
 
     return result 
@@ -2,46 +2,49 @@ from datetime import datetime, timedelta
 from typing import Optional, Union
 
 import numpy as np
+import pandas as pd
+
+from mitosheet.public.v3.types.str import is_string_series
+
+STRING_TO_BOOL_CONVERSION_DICT = {
+    '1': True,
+    '1.0': True,
+    1: True,
+    1.0: True,
+    'TRUE': True,
+    'True': True, 
+    'true': True,
+    'T': True,
+    't': True,
+    'Y': True,
+    'y': True,
+    'Yes': True,
+    'yes': True,
+    #########################
+    '0': False,
+    '0.0': False,
+    0: False,
+    0.0: False,
+    'FALSE': False,
+    'False': False,
+    'false': False,
+    'F': False,
+    'f': False,
+    'N': False,
+    'n': False,
+    'No': False,
+    'no': False, 
+    'none': False,
+    'None': False
+}
 
 
 def cast_string_to_bool(
         s: str,
     ) -> Optional[bool]:
 
-    string_to_bool_conversion_dict = {
-        '1': True,
-        '1.0': True,
-        1: True,
-        1.0: True,
-        'TRUE': True,
-        'True': True, 
-        'true': True,
-        'T': True,
-        't': True,
-        'Y': True,
-        'y': True,
-        'Yes': True,
-        'yes': True,
-        #########################
-        '0': False,
-        '0.0': False,
-        0: False,
-        0.0: False,
-        'FALSE': False,
-        'False': False,
-        'false': False,
-        'F': False,
-        'f': False,
-        'N': False,
-        'n': False,
-        'No': False,
-        'no': False, 
-        'none': False,
-        'None': False
-    }
-
-    if s in string_to_bool_conversion_dict:
-        return string_to_bool_conversion_dict[s]
+    if s in STRING_TO_BOOL_CONVERSION_DICT:
+        return STRING_TO_BOOL_CONVERSION_DICT[s]
     else:
         return None # TODO: maybe we should default to False
 
@@ -60,4 +63,28 @@ def cast_to_bool(unknown: Union[str, int, float, bool, datetime, timedelta]) ->
     elif isinstance(unknown, bool):
         return unknown
 
-    return None
\ No newline at end of file
+    return None
+
+
+def cast_series_to_bool(series: pd.Series) -> pd.Series:
+    """
+    Casts the entire series at once, for series of numbers and strings, rather 
+    than casting each element with cast_to_bool. 
+    """
+    dtype = str(series.dtype)
+    if dtype == 'bool':
+        return series.copy()
+    elif dtype == 'int64':
+        return series.astype(bool)
+    elif dtype == 'float64':
+        # We cast NaN's to false
+        return series.fillna(0).astype(bool)
+    elif is_string_series(series):
+        bools = series.map(STRING_TO_BOOL_CONVERSION_DICT)
+        is_bool = bools.notnull()
+        if is_bool.all():
+            return bools.astype(bool)
+        # Strings that are not bools are cast to None
+        return bools.astype(object).mask(~is_bool, None)
+
+    return series.apply(cast_to_bool)
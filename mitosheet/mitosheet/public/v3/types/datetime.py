@@ -51,6 +51,8 @@ def cast_series_to_datetime(series: pd.Series) -> pd.Series:
             errors='coerce',
             **get_to_datetime_params(series)
         ) 
+    elif dtype == 'datetime64[ns]':
+        return series.copy()
     
     # Otherwise, we just cast it element-wise
     return series.apply(cast_to_datetime)
@@ -1,6 +1,23 @@
 
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from mitosheet.public.v3.types.str import is_string_series
+
+MILLION_IDENTIFIERS = ["Million", 'Mil', 'M', 'million', 'mil', 'm']
+BILLION_IDENTIFIERS = ["Billion", 'Bil', 'B', 'billion', 'bil', 'b']
+
+# Matches strings that are numbers with an optional negative sign, dollar sign, accounting 
+# parentheses, American commas, million or billion identifier and percentage sign, which
+# are the common cases that cast_string_to_float handles
+FORMATTED_NUMBER_REGEX = (
+    r'^\s*(?P<negative>-)?\$?(?P<open>\()?'
+    r'(?P<number>\d{1,3}(?:,\d{3})+(?:\.\d*)?|\d+(?:\.\d*)?|\.\d+)'
+    r'(?P<identifier>Million|million|Mil|mil|M|m|Billion|billion|Bil|bil|B|b)?'
+    r'(?P<percentage>%)?(?P<close>\))?\s*$'
+)
 
 
 def get_million_identifier_in_string(string: str) -> Union[str, None]:
@@ -8,9 +25,8 @@ def get_million_identifier_in_string(string: str) -> Union[str, None]:
     Given a string, returns the million identifier in it. 
     Returns '' if none exist. 
     """
-    million_identifiers = ["Million", 'Mil', 'M', 'million', 'mil', 'm']
     # So that we return the biggest matching element
-    million_identifiers = list(sorted(million_identifiers, key=len, reverse=True))
+    million_identifiers = list(sorted(MILLION_IDENTIFIERS, key=len, reverse=True))
 
     for identifier in million_identifiers:
         if identifier in string:
@@ -25,9 +41,8 @@ def get_billion_identifier_in_string(string: str) -> Union[str, None]:
     Returns '' if none exist. 
     """
 
-    billion_identifiers = ["Billion", 'Bil', 'B', 'billion', 'bil', 'b']
     # So that we return the biggest matching element
-    billion_identifiers = list(sorted(billion_identifiers, key=len, reverse=True))
+    billion_identifiers = list(sorted(BILLION_IDENTIFIERS, key=len, reverse=True))
 
     for identifier in billion_identifiers:
         if identifier in string:
@@ -122,4 +137,87 @@ def cast_to_float(unknown: Union[str, int, float, bool, datetime, timedelta]) ->
     elif isinstance(unknown, bool):
         return float(unknown)
 
-    return None
\ No newline at end of file
+    return None
+
+
+def cast_string_series_to_float(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Casts a series of strings to floats, in the same way as cast_string_to_float, but
+    without calling cast_string_to_float on each string, as this is slow. Specifically:
+    1. We try to cast all strings optimistically at once.
+    2. Otherwise, we match each unique string against FORMATTED_NUMBER_REGEX, which handles
+       the common cases of cast_string_to_float, and cast the numbers that match at once.
+    3. We only call cast_string_to_float on the unique strings that are left. 
+
+    Returns the floats, and a mask of the strings that could be cast. Strings that
+    cannot be cast are NaN in the floats.
+    """
+    values = series.to_numpy(dtype=object)
+
+    # Try to handle case 1, optimistically
+    try:
+        floats = values.astype('float64')
+        return pd.Series(floats, index=series.index, name=series.name), pd.Series(True, index=series.index, name=series.name)
+    except (ValueError, TypeError):
+        pass
+
+    # Columns often have the same string many times, so we only cast each unique string once
+    codes, unique_values = pd.factorize(values)
+    unique_strings = pd.Series(unique_values, dtype=object)
+
+    matches = unique_strings.str.extract(FORMATTED_NUMBER_REGEX)
+    number = matches['number']
+    has_comma = number.str.contains(',', regex=False, na=False)
+    has_period = number.str.contains('.', regex=False, na=False)
+
+    is_match = number.notnull() & (matches['open'].isnull() == matches['close'].isnull())
+    # Commas are only American if the string ends 3 characters after the last comma (see
+    # case 4), so we cast numbers with commas followed by identifiers one-by-one
+    is_match = (is_match & ~(has_comma & ~has_period & (matches['identifier'].notnull() | matches['percentage'].notnull()))).to_numpy()
+
+    unique_floats = np.full(len(unique_values), np.nan)
+    unique_is_float = np.zeros(len(unique_values), dtype=bool)
+
+    matched_floats = number[is_match].str.replace(',', '', regex=False).to_numpy(dtype=object).astype('float64')
+    is_negative = (matches['negative'].notnull() | matches['open'].notnull())[is_match].to_numpy()
+    identifier = matches['identifier'][is_match]
+    multiplier = np.where(
+        identifier.isin(BILLION_IDENTIFIERS).to_numpy(), 
+        1000000000.0, 
+        np.where(identifier.isin(MILLION_IDENTIFIERS).to_numpy(), 1000000.0, 1.0)
+    )
+    multiplier = np.where(matches['percentage'][is_match].notnull().to_numpy(), multiplier / 100, multiplier)
+
+    unique_floats[is_match] = matched_floats * np.where(is_negative, -1.0, 1.0) * multiplier
+    unique_is_float[is_match] = True
+
+    for i in np.flatnonzero(~is_match):
+        f = cast_string_to_float(unique_values[i])
+        if f is not None:
+            unique_floats[i] = f
+            unique_is_float[i] = True
+
+    floats = unique_floats[codes]
+    is_float = unique_is_float[codes]
+    return pd.Series(floats, index=series.index, name=series.name), pd.Series(is_float, index=series.index, name=series.name)
+
+
+def cast_series_to_float(series: pd.Series) -> pd.Series:
+    """
+    Casts the entire series at once, for series of numbers and strings, rather 
+    than casting each element with cast_to_float. 
+    """
+    dtype = str(series.dtype)
+    if dtype == 'float64':
+        return series.copy()
+    elif dtype == 'int64' or dtype == 'bool':
+        return series.astype('float64')
+    elif is_string_series(series):
+        floats, is_float = cast_string_series_to_float(series)
+        # If no strings can be cast, then the casted series is a series of None
+        if not is_float.any():
+            return pd.Series(np.full(len(series), None), index=series.index, name=series.name)
+        return floats
+    
+    return series.apply(cast_to_float)
+
@@ -2,8 +2,16 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union
 
+import numpy as np
+import pandas as pd
+
 from mitosheet.public.v3.errors import make_invalid_param_type_conversion_error
-from mitosheet.public.v3.types.float import cast_string_to_float
+from mitosheet.public.v3.types.float import cast_string_series_to_float, cast_string_to_float
+from mitosheet.public.v3.types.str import is_string_series
+
+# Floats in this range can be cast to an int64 without overflowing
+MIN_FLOAT_CASTABLE_TO_INT64 = -2.0 ** 63
+MAX_FLOAT_CASTABLE_TO_INT64 = 2.0 ** 63
 
 
 def cast_str_to_int(s: str) -> Optional[int]:
@@ -26,4 +34,31 @@ def cast_to_int(unknown: Union[str, int, float, bool, datetime, timedelta]) -> O
         except:
             raise make_invalid_param_type_conversion_error(unknown, 'int')
 
-    return None
\ No newline at end of file
+    return None
+
+
+def is_castable_to_int64(floats: pd.Series) -> bool:
+    return bool(((floats >= MIN_FLOAT_CASTABLE_TO_INT64) & (floats < MAX_FLOAT_CASTABLE_TO_INT64)).all())
+
+
+def cast_series_to_int(series: pd.Series) -> pd.Series:
+    """
+    Casts the entire series at once, for series of numbers and strings, rather 
+    than casting each element with cast_to_int. 
+    
+    If any element cannot be cast to an int64 (e.g. NaN values, which error), then
+    we cast each element with cast_to_int, so we error in the same way.
+    """
+    dtype = str(series.dtype)
+    if dtype == 'int64':
+        return series.copy()
+    elif dtype == 'bool':
+        return series.astype('int64')
+    elif dtype == 'float64' and is_castable_to_int64(series):
+        return series.astype('int64')
+    elif is_string_series(series):
+        floats, is_float = cast_string_series_to_float(series)
+        if is_float.all() and is_castable_to_int64(floats):
+            return floats.astype('int64')
+
+    return series.apply(cast_to_int)
@@ -2,7 +2,11 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union
 
-from mitosheet.public.v3.types.float import cast_string_to_float
+import numpy as np
+import pandas as pd
+
+from mitosheet.public.v3.types.float import cast_string_series_to_float, cast_string_to_float
+from mitosheet.public.v3.types.str import is_string_series
 
 
 def cast_to_number(unknown: Union[str, int, float, bool, datetime, timedelta]) -> Optional[Union[int, float]]:
@@ -20,4 +24,24 @@ def cast_to_number(unknown: Union[str, int, float, bool, datetime, timedelta]) -
         return unknown
     
 
-    return None
\ No newline at end of file
+    return None
+
+
+def cast_series_to_number(series: pd.Series) -> pd.Series:
+    """
+    Casts the entire series at once, for series of numbers and strings, rather 
+    than casting each element with cast_to_number. 
+    """
+    dtype = str(series.dtype)
+    if dtype == 'int64' or dtype == 'float64':
+        return series.copy()
+    elif dtype == 'bool':
+        return series.astype('int64')
+    elif is_string_series(series):
+        floats, is_float = cast_string_series_to_float(series)
+        # If no strings can be cast, then the casted series is a series of None
+        if not is_float.any():
+            return pd.Series(np.full(len(series), None), index=series.index, name=series.name)
+        return floats
+
+    return series.apply(cast_to_number)
@@ -2,9 +2,34 @@ from datetime import datetime, timedelta
 from typing import Optional, Union
 
 import numpy as np
+import pandas as pd
 
 def cast_to_string(unknown: Union[str, int, float, bool, datetime, timedelta]) -> Optional[str]:
     if isinstance(unknown, float) and np.isnan(unknown):
         return None
 
-    return str(unknown)
\ No newline at end of file
+    return str(unknown)
+
+
+def is_string_series(series: pd.Series) -> bool:
+    """
+    Returns True if every element in the series is a string.
+    """
+    return str(series.dtype) == 'object' and len(series) > 0 and pd.api.types.infer_dtype(series, skipna=False) == 'string'
+
+
+def cast_series_to_string(series: pd.Series) -> pd.Series:
+    """
+    Casts the entire series at once, for series of numbers and strings, rather 
+    than casting each element with cast_to_string. 
+    """
+    dtype = str(series.dtype)
+    if is_string_series(series):
+        return series.copy()
+    elif dtype == 'int64' or dtype == 'bool':
+        return series.astype(str)
+    elif dtype == 'float64':
+        # NaN values are cast to None
+        return series.astype(str).mask(series.isnull(), None)
+
+    return series.apply(cast_to_string)
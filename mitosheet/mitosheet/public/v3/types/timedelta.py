@@ -13,4 +13,18 @@ def cast_to_timedelta(unknown: Union[str, int, float, bool, datetime, timedelta]
     elif isinstance(unknown, timedelta):
         return unknown
 
-    return None
\ No newline at end of file
+    return None
+
+
+def cast_series_to_timedelta(series: pd.Series) -> pd.Series:
+    """
+    Casts the entire series at once, for series of timedeltas and ints, rather 
+    than casting each element with cast_to_timedelta. 
+    """
+    dtype = str(series.dtype)
+    if dtype == 'timedelta64[ns]':
+        return series.copy()
+    elif dtype == 'int64':
+        return pd.to_timedelta(series)
+
+    return series.apply(cast_to_timedelta)
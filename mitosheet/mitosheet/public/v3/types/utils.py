@@ -5,23 +5,24 @@ import pandas as pd
 from mitosheet.is_type_utils import is_bool_dtype, is_datetime_dtype, is_float_dtype, is_int_dtype, is_string_dtype, is_timedelta_dtype
 
 from mitosheet.public.v3.rolling_range import RollingRange
-from mitosheet.public.v3.types.bool import cast_to_bool
+from mitosheet.public.v3.types.bool import cast_series_to_bool, cast_to_bool
 from mitosheet.public.v3.types.datetime import cast_series_to_datetime, cast_to_datetime
-from mitosheet.public.v3.types.float import cast_to_float
-from mitosheet.public.v3.types.int import cast_to_int
-from mitosheet.public.v3.types.number import cast_to_number
-from mitosheet.public.v3.types.str import cast_to_string
-from mitosheet.public.v3.types.timedelta import cast_to_timedelta
+from mitosheet.public.v3.types.float import cast_series_to_float, cast_to_float
+from mitosheet.public.v3.types.int import cast_series_to_int, cast_to_int
+from mitosheet.public.v3.types.number import cast_series_to_number, cast_to_number
+from mitosheet.public.v3.types.str import cast_series_to_string, cast_to_string, is_string_series
+from mitosheet.public.v3.types.timedelta import cast_series_to_timedelta, cast_to_timedelta
 from mitosheet.types import PrimitiveTypeName
 
-SERIES_CONVERSION_FUNCTIONS: Dict[PrimitiveTypeName, Optional[Callable[[pd.Series], pd.Series]]] = {
-    'str': None,
-    'int': None,
-    'float': None,
-    'number': None,
-    'bool': None,
+# Casting each element of a series is slow, so we cast entire series at once where possible
+SERIES_CONVERSION_FUNCTIONS: Dict[PrimitiveTypeName, Callable[[pd.Series], pd.Series]] = {
+    'str': cast_series_to_string,
+    'int': cast_series_to_int,
+    'float': cast_series_to_float,
+    'number': cast_series_to_number,
+    'bool': cast_series_to_bool,
     'datetime': cast_series_to_datetime,
-    'timedelta': None,
+    'timedelta': cast_series_to_timedelta,
 }
 
 ELEMENT_CONVERSION_FUNCTIONS: Dict[PrimitiveTypeName, Callable[[Any], Optional[Any]]] = {
@@ -97,38 +98,31 @@ def get_arg_cast_to_type(
 
         return element_conversion_function_without_skip(arg)
 
-    if series_conversion_function_without_skip is not None:
-        def series_conversion_function(arg: Any) -> Any:
-            arg_type_name = get_primitive_type_name_from_series(arg)
-            if arg_type_name in primitive_types_to_ignore: # type: ignore
-                return arg
+    def series_conversion_function(arg: pd.Series) -> pd.Series:
+        arg_type_name = get_primitive_type_name_from_series(arg)
+        if arg_type_name in primitive_types_to_ignore: # type: ignore
+            return arg
 
-            return series_conversion_function_without_skip(arg) # type: ignore
-    else:
-        series_conversion_function = None # type: ignore
+        # Object series can have elements of any type, so unless they are all strings, we 
+        # check which elements to ignore one-by-one
+        if len(primitive_types_to_ignore) > 0 and str(arg.dtype) == 'object' and not is_string_series(arg): # type: ignore
+            return arg.apply(element_conversion_function)
+
+        # Empty series keep their dtype when cast
+        if len(arg) == 0 and str(arg.dtype) != 'object':
+            return arg.apply(element_conversion_function)
+
+        return series_conversion_function_without_skip(arg)
 
     if is_primitive_value(arg):
         return element_conversion_function(arg)
     
     elif isinstance(arg, pd.Series):
-        if series_conversion_function is not None:
-            return series_conversion_function(arg)
-
-        return arg.apply(element_conversion_function)
+        return series_conversion_function(arg)
 
     elif isinstance(arg, pd.DataFrame):
-
-        if series_conversion_function is not None:
-            return arg.apply(lambda c: series_conversion_function(c))
-
-        return arg.apply(lambda c: c.apply(element_conversion_function))
+        return arg.apply(lambda c: series_conversion_function(c))
 
     elif isinstance(arg, RollingRange):
-        obj = arg.obj
-
-        if series_conversion_function is not None:
-            new_obj = obj.apply(lambda c: series_conversion_function(c))
-        else:
-            new_obj = obj.apply(lambda c: c.apply(element_conversion_function))
-            
-        return RollingRange(new_obj, arg.window, arg.offset)
\ No newline at end of file
+        new_obj = arg.obj.apply(lambda c: series_conversion_function(c))
+        return RollingRange(new_obj, arg.window, arg.offset)
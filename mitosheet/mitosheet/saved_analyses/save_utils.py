@@ -9,18 +9,95 @@ in analyses.
 """
 
 from mitosheet.step import Step
+import atexit
 import os
 import json
-from typing import Any, Dict, List, Optional
+import time
+from threading import Condition, Lock, Thread
+from typing import Any, Dict, List, Optional, Set, Tuple
 from mitosheet._version import __version__
 from mitosheet.types import CodeOptions, StepsManagerType
-from mitosheet.utils import NpEncoder
+from mitosheet.utils import NpEncoder, get_json_array_from_json_fragments
 from mitosheet.save_paths import MITO_FOLDER
 
 # The current version of the saved Mito analysis
 # where we save all the analyses for this version
 SAVED_ANALYSIS_FOLDER = os.path.join(MITO_FOLDER, 'saved_analyses')
 
+# We save the analysis after every edit, so we wait this many seconds for more
+# edits before writing it in the background, and then only write the latest version
+SAVED_ANALYSIS_WRITE_DELAY = .5
+
+
+class SavedAnalysisWriter():
+    """
+    Writes saved analyses on a background thread, so that writing them to a slow 
+    disk does not block handling messages from the frontend. 
+    
+    If an analysis is written again before the previous version of it was written, 
+    then only the latest version is written. Each analysis is written to a temporary 
+    file that is then renamed to the analysis file, so the analysis file is never
+    partially written.
+
+    Reading saved analyses first calls flush, so they read the latest version.
+    """
+
+    def __init__(self, delay: float=SAVED_ANALYSIS_WRITE_DELAY) -> None:
+        self.delay = delay
+        self.condition = Condition()
+        # Writes happen while holding this lock, so the versions of an analysis 
+        # are written in the order they are written
+        self.write_lock = Lock()
+        # The analysis string to write to each analysis path, and when it was first pending
+        self.pending_writes: Dict[str, Tuple[str, float]] = {}
+        self.thread: Optional[Thread] = None
+
+    def write(self, analysis_path: str, saved_analysis_string: str) -> None:
+        with self.condition:
+            pending_time = self.pending_writes[analysis_path][1] if analysis_path in self.pending_writes else time.perf_counter()
+            self.pending_writes[analysis_path] = (saved_analysis_string, pending_time)
+
+            if self.thread is None:
+                self.thread = Thread(target=self.write_pending_writes_in_background, daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def write_pending_writes_in_background(self) -> None:
+        while True:
+            with self.condition:
+                while len(self.pending_writes) == 0:
+                    self.condition.wait()
+
+                # Wait until the first pending write has waited for the delay
+                wait_time = min(pending_time for _, pending_time in self.pending_writes.values()) + self.delay - time.perf_counter()
+                if wait_time > 0:
+                    self.condition.wait(wait_time)
+                    continue
+
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes all the pending writes, returning once they are written.
+        """
+        with self.write_lock:
+            with self.condition:
+                pending_writes = self.pending_writes
+                self.pending_writes = {}
+
+            for analysis_path, (saved_analysis_string, _) in pending_writes.items():
+                try:
+                    _write_saved_analysis_string(analysis_path, saved_analysis_string)
+                except:
+                    # Saving the analysis is best effort, and we save it again after the next edit
+                    pass
+
+
+saved_analysis_writer = SavedAnalysisWriter()
+
+# Make sure we write the pending saved analyses before the kernel exits
+atexit.register(saved_analysis_writer.flush)
+
 
 def get_analysis_exists(analysis_name: Optional[str]) -> bool:
     """
@@ -31,6 +108,8 @@ def get_analysis_exists(analysis_name: Optional[str]) -> bool:
     if analysis_name is None:
         return False
 
+    saved_analysis_writer.flush()
+
     analysis_path = f'{SAVED_ANALYSIS_FOLDER}/{analysis_name}.json'
     return os.path.exists(analysis_path)
 
@@ -40,6 +119,7 @@ def read_analysis(analysis_name: str) -> Optional[Dict[str, Any]]:
     ~/.mito/{analysis_name}.json and returns a JSON object
     representing it.
     """
+    saved_analysis_writer.flush()
 
     analysis_path = f'{SAVED_ANALYSIS_FOLDER}/{analysis_name}.json'
     if not os.path.exists(analysis_path):
@@ -66,6 +146,8 @@ def _get_all_analysis_filenames():
     """
     Returns the names of the files in the SAVED_ANALYSIS_FOLDER
     """
+    saved_analysis_writer.flush()
+
     if not os.path.exists(SAVED_ANALYSIS_FOLDER):
         return []
 
@@ -117,21 +199,78 @@ def rename_saved_analysis(old_analysis_name, new_analysis_name):
     else:
         raise Exception(f'Invalid rename, with old and new analysis are {old_analysis_name} and {new_analysis_name}')
 
+class SavedAnalysisStepsSerializer():
+    """
+    We save the analysis after every edit, and serializing every step each time
+    is slow for long analyses. As steps do not change once they are created, we 
+    keep the json of each step and only serialize the new steps.
+    """
+
+    def __init__(self) -> None:
+        self.steps: List[Step] = []
+        self.step_indexes_to_skip: Set[int] = set()
+        self.step_jsons: Dict[int, Tuple[Step, str]] = {}
+
+    def get_steps_json(self, steps: List[Step]) -> str:
+        """
+        Returns the same json as json.dumps(get_steps_obj_for_saved_analysis(steps)).
+        """
+        from mitosheet.steps_manager import get_step_indexes_to_skip_from_previous_steps
+        self.step_indexes_to_skip = get_step_indexes_to_skip_from_previous_steps(steps, self.steps, self.step_indexes_to_skip)
+        self.steps = list(steps)
+
+        step_jsons: Dict[int, Tuple[Step, str]] = {}
+        step_json_fragments: List[Optional[str]] = []
+        for step_index, step in enumerate(steps):
+            if step.step_type == 'initialize' or step_index in self.step_indexes_to_skip:
+                continue
+
+            if id(step) in self.step_jsons and self.step_jsons[id(step)][0] is step:
+                step_json = self.step_jsons[id(step)][1]
+            else:
+                step_json = json.dumps(get_step_obj_for_saved_analysis(step), cls=NpEncoder)
+
+            step_jsons[id(step)] = (step, step_json)
+            step_json_fragments.append(step_json)
+
+        # We only keep the json of the steps we still have
+        self.step_jsons = step_jsons
+        return get_json_array_from_json_fragments(step_json_fragments)
+
+
 def get_saved_analysis_string(steps_manager: StepsManagerType) -> str:
-    saved_analysis_string = json.dumps({
-        'version': __version__,
-        'steps_data': get_steps_obj_for_saved_analysis(steps_manager.steps_including_skipped),
+    # We splice in the steps json, so that we only serialize the new steps
+    steps_json = steps_manager.saved_analysis_steps_serializer.get_steps_json(steps_manager.steps_including_skipped)
+    saved_analysis_string_without_steps = json.dumps({
         'public_interface_version': steps_manager.public_interface_version,
         'args': steps_manager.original_args_raw_strings,
         'code': steps_manager.code(),
         'code_options': steps_manager.code_options
     }, cls=NpEncoder)
+    saved_analysis_string = '{"version": ' + json.dumps(__version__) + ', "steps_data": ' + steps_json + ', ' + saved_analysis_string_without_steps[1:]
     return saved_analysis_string
 
+def _write_saved_analysis_string(analysis_path: str, saved_analysis_string: str) -> None:
+    """
+    Writes the saved analysis to a temporary file, and then renames it to the 
+    analysis_path, so that the analysis file is never partially written.
+    """
+    temporary_analysis_path = f'{analysis_path}.{os.getpid()}.tmp'
+    with open(temporary_analysis_path, 'w+') as f:
+        f.write(saved_analysis_string)
+    os.replace(temporary_analysis_path, analysis_path)
+
 def _write_saved_analysis_file(analysis_path: str, steps_manager: StepsManagerType) -> None:
     saved_analysis_string = get_saved_analysis_string(steps_manager)
-    with open(analysis_path, 'w+') as f:
-        f.write(saved_analysis_string)
+    _write_saved_analysis_string(analysis_path, saved_analysis_string)
+
+
+def get_step_obj_for_saved_analysis(step: Step) -> Dict[str, Any]:
+    return {
+        'step_version': step.step_performer.step_version(),
+        'step_type': step.step_type,
+        'params': step.params
+    }
 
 
 def get_steps_obj_for_saved_analysis(
@@ -175,22 +314,19 @@ def get_steps_obj_for_saved_analysis(
             continue
 
         # Save the step type
-        step_summary = {
-            'step_version': step.step_performer.step_version(),
-            'step_type': step.step_type,
-            'params': step.params
-        }
-
-        steps_json_obj.append(step_summary)                
+        steps_json_obj.append(get_step_obj_for_saved_analysis(step))
 
     return steps_json_obj
 
-def write_save_analysis_file(steps_manager: StepsManagerType, analysis_name: Optional[str]=None) -> None:
+def write_save_analysis_file(steps_manager: StepsManagerType, analysis_name: Optional[str]=None, in_background: bool=False) -> None:
     """
     Writes the analysis saved in steps_manager to
     ~/.mito/{analysis_name}. If analysis_name is none, gets the temporary
     name from the steps_manager.
 
+    If in_background, the analysis is written by the saved_analysis_writer
+    on a background thread, which only writes the latest of rapid writes.
+
     Note that a step container may contain invalid steps/out of
     date steps, but we save them all, as they will play back validly
     as they were valid when they were added.
@@ -206,4 +342,10 @@ def write_save_analysis_file(steps_manager: StepsManagerType, analysis_name: Opt
         analysis_name = steps_manager.analysis_name
 
     analysis_path = f'{SAVED_ANALYSIS_FOLDER}/{analysis_name}.json'
-    _write_saved_analysis_file(analysis_path, steps_manager)
\ No newline at end of file
+    if in_background:
+        # We get the analysis string now, as the steps manager is not safe to use from another thread
+        saved_analysis_writer.write(analysis_path, get_saved_analysis_string(steps_manager))
+    else:
+        # Make sure a pending write does not overwrite this one
+        saved_analysis_writer.flush()
+        _write_saved_analysis_file(analysis_path, steps_manager)
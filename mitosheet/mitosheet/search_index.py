@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+The search bar searches a sheet on every keystroke, and so we keep a search
+index of each sheet: the lowercased string of every cell, stored per column.
+Searching is then just a vectorized substring check over these columns.
+
+As columns that are not modified by a step are shallow copies of the previous
+step's columns, edits only rebuild the index of the columns they modify.
+"""
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.utils import get_values_fingerprint
+
+
+def get_searchable_values(series: pd.Series) -> pd.Series:
+    """
+    Returns the lowercased string of each value in the series, which is the
+    same as str(value).lower(), or None for NaN values, which never match.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series.dtype) or pd.api.types.is_timedelta64_dtype(series.dtype):
+        # Casting dates to strings drops their time, so we convert each date like str does
+        strings = series.astype(object).map(str)
+    else:
+        strings = series.astype(str)
+
+    return strings.str.lower().where(series.notna().values, None).reset_index(drop=True)
+
+
+class SearchIndexCache():
+    """
+    Caches the searchable values of each column of each sheet. A column's
+    values are only recomputed when the column's data changes.
+
+    NOTE: search matches are found on the API thread, so we lock the cache.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        # For each sheet, the searchable values of each column position, along with the
+        # values they were computed from and the fingerprint of those values
+        self.search_indexes: Dict[int, List[Tuple[Any, Any, pd.Series]]] = {}
+
+    def get_search_index(self, sheet_index: int, df: pd.DataFrame) -> List[pd.Series]:
+        """
+        Returns the searchable values of each column of the df.
+        """
+        with self.lock:
+            cached_search_index = self.search_indexes.get(sheet_index, [])
+
+        search_index: List[Tuple[Any, Any, pd.Series]] = []
+        for column_index in range(len(df.columns)):
+            series = df.iloc[:, column_index]
+            values = series.values
+            fingerprint = get_values_fingerprint(values)
+
+            cached_column: Optional[Tuple[Any, Any, pd.Series]] = cached_search_index[column_index] if column_index < len(cached_search_index) else None
+            # We keep a reference to the values, so the fingerprint of other values can't match them
+            if cached_column is not None and (cached_column[0] is values or cached_column[1] == fingerprint):
+                search_index.append(cached_column)
+            else:
+                search_index.append((values, fingerprint, get_searchable_values(series)))
+
+        with self.lock:
+            self.search_indexes[sheet_index] = search_index
+
+        return [searchable_values for _, _, searchable_values in search_index]
+
+    def get_search_matches(
+            self,
+            sheet_index: int,
+            df: pd.DataFrame,
+            search_value: str,
+            start_row: int,
+            num_rows: int
+        ) -> Tuple[int, List[Dict[str, int]], List[Dict[str, int]]]:
+        """
+        Returns the total number of matches to the search_value in the column headers
+        and cells of the df, the column headers that match, and the cells that match
+        in the num_rows rows starting at start_row, in row major order.
+        """
+        lowercase_search_value = search_value.lower()
+        search_index = self.get_search_index(sheet_index, df)
+
+        column_matches = [
+            {'rowIndex': -1, 'colIndex': column_index}
+            for column_index, column_header in enumerate(df.columns)
+            if lowercase_search_value in str(column_header).lower()
+        ]
+
+        end_row = start_row + num_rows
+        total_number_matches = len(column_matches)
+        page_matches = []
+        for searchable_values in search_index:
+            is_match = searchable_values.str.contains(lowercase_search_value, regex=False, na=False).values
+            total_number_matches += int(is_match.sum())
+            page_matches.append(is_match[start_row:end_row])
+
+        cell_matches = []
+        if len(page_matches) > 0:
+            # Stacking the columns side by side gives us the matches in row major order
+            for row_index, column_index in np.argwhere(np.column_stack(page_matches)):
+                cell_matches.append({'rowIndex': start_row + int(row_index), 'colIndex': int(column_index)})
+
+        return total_number_matches, column_matches, cell_matches
@@ -11,7 +11,7 @@ import pandas as pd
 from mitosheet.column_headers import ColumnIDMap
 from mitosheet.types import FrontendFormulaAndLocation, OverwriteSheetIndexParams
 from mitosheet.types import ColumnHeader, ColumnID, DataframeFormat
-from mitosheet.utils import  get_first_unused_dataframe_name
+from mitosheet.utils import get_dataframe_buffers, get_first_unused_dataframe_name, get_released_dataframe, is_copy_on_write_enabled
 
 # Constants for where the dataframe in the state came from
 DATAFRAME_SOURCE_PASSED = "passed"  # passed in mitosheet.sheet
@@ -144,30 +144,145 @@ class State:
         self.user_defined_importers = user_defined_importers if user_defined_importers is not None else []
         self.user_defined_editors = user_defined_editors if user_defined_editors is not None else []
 
-    def copy(self, deep_sheet_indexes: Optional[Union[List[int], Set[int], None]]=None) -> "State":
+        # If the dataframes in this state are released to save memory, they are replaced 
+        # with empty dataframes with the same columns. See release_dataframes
+        self.dataframes_released = False
+
+    def copy(
+        self, 
+        deep_sheet_indexes: Optional[Union[List[int], Set[int], None]]=None,
+        share_unmodified_metadata: bool=False
+    ) -> "State":
         """
         Returns a copy of the state, while only making deep copies of
         those dataframes in the deep_sheet_indexes. Ideally, we'd copy
         even less than that deeply.
+
+        If share_unmodified_metadata is True, then the metadata (column ids, formulas,
+        filters and formats) of the sheets not in the deep_sheet_indexes, as well as
+        each of the graphs, is shared with this state rather than deep copied. The
+        containing lists are always new, so appending, popping or replacing an entry
+        is safe - but the caller must only mutate the metadata of the sheets in 
+        deep_sheet_indexes in place. 
         """
         if deep_sheet_indexes is None:
             deep_sheet_indexes = []
+
+        # With copy on write, shallow copies are copied lazily when the modified sheets are 
+        # changed, so we only copy the columns that are actually changed
+        copy_on_write = is_copy_on_write_enabled()
+        dfs = [df.copy(deep=index in deep_sheet_indexes and not copy_on_write) for index, df in enumerate(self.dfs)]
+
+        if not share_unmodified_metadata:
+            return State(
+                dfs,
+                self.public_interface_version,
+                df_names=deepcopy(self.df_names),
+                df_sources=deepcopy(self.df_sources),
+                column_ids=deepcopy(self.column_ids),
+                column_formulas=deepcopy(self.column_formulas),
+                column_filters=deepcopy(self.column_filters),
+                df_formats=deepcopy(self.df_formats),
+                graph_data_array=deepcopy(self.graph_data_array),
+                user_defined_functions=deepcopy(self.user_defined_functions),
+                user_defined_importers=deepcopy(self.user_defined_importers),
+                user_defined_editors=deepcopy(self.user_defined_editors),
+            )
         
+        def copy_modified(sheet_metadata: List[Any]) -> List[Any]:
+            return [
+                deepcopy(metadata) if index in deep_sheet_indexes else metadata
+                for index, metadata in enumerate(sheet_metadata)
+            ]
+
         return State(
-            [df.copy(deep=index in deep_sheet_indexes) for index, df in enumerate(self.dfs)],
+            dfs,
             self.public_interface_version,
-            df_names=deepcopy(self.df_names),
-            df_sources=deepcopy(self.df_sources),
-            column_ids=deepcopy(self.column_ids),
-            column_formulas=deepcopy(self.column_formulas),
-            column_filters=deepcopy(self.column_filters),
-            df_formats=deepcopy(self.df_formats),
-            graph_data_array=deepcopy(self.graph_data_array),
-            user_defined_functions=deepcopy(self.user_defined_functions),
-            user_defined_importers=deepcopy(self.user_defined_importers),
-            user_defined_editors=deepcopy(self.user_defined_editors),
+            df_names=list(self.df_names),
+            df_sources=list(self.df_sources),
+            column_ids=self.column_ids.copy(deep_sheet_indexes=deep_sheet_indexes),
+            column_formulas=copy_modified(self.column_formulas),
+            column_filters=copy_modified(self.column_filters),
+            df_formats=copy_modified(self.df_formats),
+            graph_data_array=list(self.graph_data_array),
+            user_defined_functions=list(self.user_defined_functions),
+            user_defined_importers=list(self.user_defined_importers),
+            user_defined_editors=list(self.user_defined_editors),
+        )
+
+    def copy_with_sheets_from(self, other_state: "State", sheet_indexes: Collection[int]) -> "State":
+        """
+        Returns a copy of this state where the dataframes and metadata of 
+        the sheets in sheet_indexes are taken from the other_state. The two
+        states must have the same sheets at these indexes.
+
+        Like a copy that shares unmodified metadata, the metadata of all 
+        sheets is shared with the state it comes from, and so must not be
+        mutated in place.
+        """
+        state = self.copy(share_unmodified_metadata=True)
+        for sheet_index in sheet_indexes:
+            state.dfs[sheet_index] = other_state.dfs[sheet_index].copy(deep=False)
+            state.df_names[sheet_index] = other_state.df_names[sheet_index]
+            state.df_sources[sheet_index] = other_state.df_sources[sheet_index]
+            state.column_ids.column_id_to_column_header[sheet_index] = other_state.column_ids.column_id_to_column_header[sheet_index]
+            state.column_ids.column_header_to_column_id[sheet_index] = other_state.column_ids.column_header_to_column_id[sheet_index]
+            state.column_formulas[sheet_index] = other_state.column_formulas[sheet_index]
+            state.column_filters[sheet_index] = other_state.column_filters[sheet_index]
+            state.df_formats[sheet_index] = other_state.df_formats[sheet_index]
+        return state
+
+    def get_dataframe_buffers(self) -> Dict[int, int]:
+        """
+        Returns a mapping from the id of each buffer backing the dataframes
+        in this state to the number of bytes in that buffer. Buffers that are
+        shared between dataframes are only counted once.
+        """
+        buffers: Dict[int, int] = {}
+        for df in self.dfs:
+            buffers.update(get_dataframe_buffers(df))
+        return buffers
+
+    def get_retained_bytes(self, prev_state: Optional["State"]=None) -> int:
+        """
+        Returns the number of bytes of dataframe data that this state holds 
+        onto that are not shared with the prev_state. As unmodified dataframes 
+        share their data with the state they were copied from, this is the 
+        memory cost of keeping this state around.
+        """
+        buffers = self.get_dataframe_buffers()
+        prev_buffers = prev_state.get_dataframe_buffers() if prev_state is not None else {}
+
+        return sum(
+            nbytes for buffer_id, nbytes in buffers.items() if buffer_id not in prev_buffers
         )
 
+    def release_dataframes(self) -> bool:
+        """
+        Replaces each of the dataframes in this state with an empty dataframe with
+        the same columns, dtypes and index (see get_released_dataframe), so that 
+        this state no longer holds onto their data. The rest of the state is kept, 
+        so the state can still be transpiled. 
+
+        Use restore_dataframes to give the state its dataframes back. Returns True
+        if the dataframes were released.
+        """
+        # Versions of pandas before 1.0 have no attrs to store the index in, so 
+        # we can't release the dataframes on them
+        if not hasattr(pd.DataFrame, 'attrs'):
+            return False
+
+        self.dfs = [get_released_dataframe(df) for df in self.dfs]
+        self.dataframes_released = True
+        return True
+
+    def restore_dataframes(self, dfs: List[pd.DataFrame]) -> None:
+        """
+        Gives a state that had its dataframes released its dataframes back.
+        """
+        self.dfs = list(dfs)
+        self.dataframes_released = False
+
     def add_df_to_state(
         self,
         new_df: pd.DataFrame,
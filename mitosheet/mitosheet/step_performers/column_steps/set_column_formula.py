@@ -180,6 +180,14 @@ class SetColumnFormulaStepPerformer(StepPerformer):
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {get_param(params, 'sheet_index')}
 
+    @classmethod
+    def get_read_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
+        # Formulas can reference other sheets, as in =df2!A, in which case
+        # we might read from any sheet
+        if '!' in get_param(params, 'new_formula'):
+            return set()
+        return {get_param(params, 'sheet_index')}
+
 
 def _get_fixed_invalid_formula(
         new_formula: str, 
@@ -38,7 +38,7 @@ class DataframeDeleteStepPerformer(StepPerformer):
     def execute(cls, prev_state: State, params: Dict[str, Any]) -> Tuple[State, Optional[Dict[str, Any]]]:
         sheet_index: int = get_param(params, 'sheet_index')
         
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
         # Execute the delete
         delete_dataframe_from_state(post_state, sheet_index)
@@ -34,7 +34,7 @@ class DataframeDuplicateStepPerformer(StepPerformer):
     def execute(cls, prev_state: State, params: Dict[str, Any]) -> Tuple[State, Optional[Dict[str, Any]]]:
         sheet_index: int = get_param(params, 'sheet_index')
 
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
         # Execute the step
         pandas_start_time = perf_counter()
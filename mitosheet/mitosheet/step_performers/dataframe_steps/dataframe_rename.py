@@ -50,7 +50,7 @@ class DataframeRenameStepPerformer(StepPerformer):
             }
 
         # Create a new step and save the parameters
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
         new_dataframe_name = get_valid_dataframe_name(post_state.df_names, new_dataframe_name)
         post_state.df_names[sheet_index] = new_dataframe_name
@@ -85,7 +85,7 @@ class ExportToFileStepPerformer(StepPerformer):
         file_name = get_final_file_name(_file_name, _type) # Ensure that the file name has the correct extension
         
         # We make a new state to modify it
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
         pandas_start_time = perf_counter()
 
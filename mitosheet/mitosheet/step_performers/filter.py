@@ -5,10 +5,13 @@
 # Distributed under the terms of the GPL License.
 
 import functools
+from collections import OrderedDict
 from datetime import date
+from threading import Lock
 from time import perf_counter
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
@@ -16,6 +19,7 @@ from mitosheet.state import State
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.utils.utils import get_param
 from mitosheet.types import ColumnHeader, ColumnID, Filter, FilterGroup, OperatorType, StepType
+from mitosheet.utils import get_values_fingerprint
 from mitosheet.types import (
     FC_BOOLEAN_IS_FALSE, FC_BOOLEAN_IS_TRUE, FC_DATETIME_EXACTLY,
     FC_DATETIME_GREATER, FC_DATETIME_GREATER_THAN_OR_EQUAL, FC_DATETIME_LESS,
@@ -41,6 +45,19 @@ FILTER_CONDITIONS_THAT_REQUIRE_FULL_DATAFRAME = [
     FC_NUMBER_HIGHEST,
 ]
 
+# Conditional formats apply their filters again every time the sheet is sent to the
+# frontend, and so we cache the mask of each filter, keyed by the memory the filtered
+# column is stored in. As columns that an edit does not modify are shallow copies of
+# the previous step's columns, their masks are not recomputed. Once the masks take up
+# more than this many bytes, we delete the least recently used ones.
+MAX_FILTER_MASK_CACHE_BYTES = 256 * 1024 * 1024
+
+# Each mask, along with the values and index it was computed from, so their fingerprints stay valid
+filter_mask_cache: 'OrderedDict[Tuple[Any, ...], Tuple[Any, Any, pd.Series, int]]' = OrderedDict()
+filter_mask_cache_bytes = 0
+# Conditional formats are computed on the API thread too, so we lock the cache
+filter_mask_cache_lock = Lock()
+
 
 class FilterStepPerformer(StepPerformer):
     """
@@ -117,6 +134,10 @@ class FilterStepPerformer(StepPerformer):
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {get_param(params, 'sheet_index')}
 
+    @classmethod
+    def get_read_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
+        return {get_param(params, 'sheet_index')}
+
 
 def get_applied_filter(
     df: pd.DataFrame, column_header: ColumnHeader, filter_: Filter
@@ -206,6 +227,74 @@ def get_applied_filter(
     raise Exception(f"Invalid type passed in filter {filter_}")
 
 
+def get_filter_mask_cache_key(series: pd.Series, filter_: Filter) -> Optional[Tuple[Any, ...]]:
+    """
+    Returns the key of the mask of the filter applied to the series, or None if
+    we can't tell when the series changes, in which case we don't cache the mask.
+    """
+    values = series.values
+    if not isinstance(values, np.ndarray):
+        return None
+
+    # Some columns (e.g. timezone aware dates) convert their values each time we get them, so we can't 
+    # fingerprint them. We compare fingerprints, as with copy on write, each access returns a new view
+    values_fingerprint = get_values_fingerprint(values)
+    if values_fingerprint != get_values_fingerprint(series.values):
+        return None
+
+    index = series.index
+    if isinstance(index, pd.RangeIndex):
+        index_fingerprint: Any = (index.start, index.stop, index.step)
+    elif isinstance(index.values, np.ndarray):
+        index_fingerprint = get_values_fingerprint(index.values)
+    else:
+        return None
+
+    value = filter_["value"]
+    # We include the type of the value, as 1 and '1' filter differently, and the dtype of the 
+    # series, as columns with different timezones can share the same values
+    return (values_fingerprint, str(series.dtype), index_fingerprint, filter_["condition"], type(value).__name__, repr(value))
+
+
+def get_cached_applied_filter(
+    df: pd.DataFrame, column_header: ColumnHeader, filter_: Filter
+) -> pd.Series:
+    """
+    Returns the same mask as get_applied_filter, reusing the mask from the
+    last time this filter was applied to the same column, if we can.
+
+    NOTE: the returned mask may be shared, so it must not be modified in place.
+    """
+    global filter_mask_cache_bytes
+
+    series = df[column_header]
+    key = get_filter_mask_cache_key(series, filter_)
+    if key is None:
+        return get_applied_filter(df, column_header, filter_)
+
+    with filter_mask_cache_lock:
+        cached_mask = filter_mask_cache.get(key)
+        if cached_mask is not None:
+            filter_mask_cache.move_to_end(key)
+            return cached_mask[2]
+
+    applied_filter = get_applied_filter(df, column_header, filter_)
+    applied_filter_bytes = int(applied_filter.memory_usage(index=False))
+    if applied_filter_bytes > MAX_FILTER_MASK_CACHE_BYTES:
+        return applied_filter
+
+    with filter_mask_cache_lock:
+        if key not in filter_mask_cache:
+            filter_mask_cache[key] = (series.values, series.index, applied_filter, applied_filter_bytes)
+            filter_mask_cache_bytes += applied_filter_bytes
+
+        while filter_mask_cache_bytes > MAX_FILTER_MASK_CACHE_BYTES:
+            _, (_, _, _, evicted_bytes) = filter_mask_cache.popitem(last=False)
+            filter_mask_cache_bytes -= evicted_bytes
+
+    return applied_filter
+
+
 def combine_filters(operator: OperatorType, filters: List[pd.Series]) -> pd.Series:
     def filter_reducer(filter_one: pd.Series, filter_two: pd.Series) -> pd.Series:
         # Helper for combining filters based on the operations
@@ -231,7 +320,7 @@ def get_full_applied_filter(
     for filter_or_group in filters:
         if "filters" not in filter_or_group:
             filter_: Filter = filter_or_group #type: ignore
-            applied_filters.append(get_applied_filter(df, column_header, filter_))
+            applied_filters.append(get_cached_applied_filter(df, column_header, filter_))
         else:
             filter_group: FilterGroup = filter_or_group #type: ignore
             full_group_filter, _ = get_full_applied_filter(df, column_header, filter_group['operator'], filter_group["filters"])
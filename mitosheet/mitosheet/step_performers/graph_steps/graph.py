@@ -12,10 +12,10 @@ import pandas as pd
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.empty_code_chunk import EmptyCodeChunk
 from mitosheet.state import State
+from mitosheet.step_performers.graph_steps.graph_artifacts import add_graph_artifact
 from mitosheet.step_performers.graph_steps.graph_utils import (
     get_column_header_from_optional_column_id_graph_param,
-    get_graph_index_by_graph_id,
-    get_html_and_script_from_figure, get_new_graph_tab_name)
+    get_graph_index_by_graph_id, get_new_graph_tab_name)
 from mitosheet.step_performers.graph_steps.plotly_express_graphs import (
     get_plotly_express_graph, get_plotly_express_graph_code)
 from mitosheet.step_performers.step_performer import StepPerformer
@@ -91,7 +91,7 @@ class GraphStepPerformer(StepPerformer):
         include_plotlyjs: bool = get_param(params, 'include_plotlyjs')
         
         # We make a new state to modify it
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
         # Extract variables from graph parameters
         graph_type = graph_creation["graph_type"]
@@ -125,8 +125,9 @@ class GraphStepPerformer(StepPerformer):
         histfunc = graph_creation.get('histfunc', None)
         nbins = graph_creation.get('nbins', None)
 
-        # Create a copy of the dataframe, just for safety.
-        df: pd.DataFrame = prev_state.dfs[sheet_index].copy()
+        # We don't copy the dataframe, as graphing does not modify it, and aggregations of
+        # large dataframes are cached by the fingerprint of the dataframe, which copying changes
+        df: pd.DataFrame = prev_state.dfs[sheet_index]
         df_name: str = prev_state.df_names[sheet_index]
 
         # If the graph tab already exists, use its name. Otherwise, create a new graph tab name.
@@ -181,7 +182,8 @@ class GraphStepPerformer(StepPerformer):
                 )
             )
 
-            html_and_script = get_html_and_script_from_figure(fig, height, width, include_plotlyjs)
+            # We render the graph when the frontend first requests it, rather than storing the HTML in the state
+            graph_artifact_id = add_graph_artifact(fig, height, width, include_plotlyjs)
 
             graph_generation_code = get_plotly_express_graph_code(
                 graph_type,
@@ -208,8 +210,7 @@ class GraphStepPerformer(StepPerformer):
                 "graph_id": graph_id,
                 "graph_output": {
                     "graphGeneratedCode": graph_generation_code,
-                    "graphHTML": html_and_script["html"],
-                    "graphScript": html_and_script["script"],
+                    "graphArtifactID": graph_artifact_id,
                 },
                 "graph_tab_name": graph_tab_name
             }
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+When the safety filter is on, rather than graphing the first rows of a large
+dataframe, we reduce the dataframe to the data that the graph shows, using the
+functions in mitosheet.public.v3.graphs, so the generated code can do the same.
+
+Editing the style of a graph reruns the graph step on the same dataframe, and so
+we cache the most recent aggregations, keyed by the fingerprint of the dataframe.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from mitosheet.dataframe_viewport import get_dataframe_fingerprint
+from mitosheet.is_type_utils import is_datetime_dtype, is_number_dtype
+from mitosheet.public.v3.graphs import (bin_scatter_graph_data,
+                                        downsample_line_graph_data,
+                                        get_box_graph_quantiles,
+                                        sum_bar_graph_data)
+from mitosheet.step_performers.graph_steps.graph_utils import (BAR, BOX, LINE,
+                                                               SCATTER)
+from mitosheet.types import ColumnHeader
+from mitosheet.utils import is_prev_version
+
+# The number of bins along each axis that we split scatter plots into
+SCATTER_GRAPH_NUM_BINS = 100
+# The number of quantiles we compute for each box in a box plot
+BOX_GRAPH_NUM_QUANTILES = 1001
+# The number of points we keep for each line in a line graph
+LINE_GRAPH_NUM_POINTS = 2000
+# If an aggregation still has more rows than this, we graph the first rows instead
+MAX_AGGREGATED_ROWS = 100_000
+# The most recent aggregations we keep
+MAX_CACHED_GRAPH_AGGREGATIONS = 10
+
+GRAPH_AGGREGATION_FUNCTIONS: Dict[str, Callable[..., pd.DataFrame]] = {
+    'sum_bar_graph_data': sum_bar_graph_data,
+    'bin_scatter_graph_data': bin_scatter_graph_data,
+    'get_box_graph_quantiles': get_box_graph_quantiles,
+    'downsample_line_graph_data': downsample_line_graph_data,
+}
+
+# Label for each aggregation used in the graph title
+GRAPH_AGGREGATION_TITLE_LABELS = {
+    'sum_bar_graph_data': '(aggregated)',
+    'bin_scatter_graph_data': '(downsampled)',
+    'get_box_graph_quantiles': '(aggregated)',
+    'downsample_line_graph_data': '(downsampled)',
+}
+
+# The name of the function in mitosheet.public.v3.graphs, and its params other than the df
+GraphAggregation = Tuple[str, Dict[str, Any]]
+
+# Each aggregation, along with the dataframe it was computed from, so its fingerprint stays valid
+graph_aggregation_cache: 'OrderedDict[Tuple[Any, ...], Tuple[pd.DataFrame, Optional[pd.DataFrame]]]' = OrderedDict()
+graph_aggregation_cache_lock = Lock()
+
+
+def get_graph_aggregation(
+    graph_type: str,
+    df: pd.DataFrame,
+    x_axis_column_headers: List[ColumnHeader],
+    y_axis_column_headers: List[ColumnHeader],
+    color_column_header: Optional[ColumnHeader],
+    facet_col_column_header: Optional[ColumnHeader],
+    facet_row_column_header: Optional[ColumnHeader],
+) -> Optional[GraphAggregation]:
+    """
+    Returns the aggregation that reduces the df to the data that the graph shows,
+    or None if we can't aggregate the data of this graph.
+    """
+    axis_column_headers = x_axis_column_headers + y_axis_column_headers
+    groupby: List[ColumnHeader] = []
+    for column_header in [color_column_header, facet_col_column_header, facet_row_column_header]:
+        if column_header is not None and column_header not in axis_column_headers and column_header not in groupby:
+            groupby.append(column_header)
+
+    def is_number_column(column_header: ColumnHeader) -> bool:
+        return is_number_dtype(str(df[column_header].dtype))
+
+    def is_number_or_datetime_column(column_header: ColumnHeader) -> bool:
+        return is_number_column(column_header) or is_datetime_dtype(str(df[column_header].dtype))
+
+    if len(set(axis_column_headers)) != len(axis_column_headers):
+        return None
+
+    if graph_type == BAR:
+        if len(x_axis_column_headers) == 1 and len(y_axis_column_headers) > 0 and all(is_number_column(column_header) for column_header in y_axis_column_headers):
+            return 'sum_bar_graph_data', {'x': x_axis_column_headers[0], 'y': y_axis_column_headers, 'groupby': groupby}
+    elif graph_type == SCATTER:
+        if len(x_axis_column_headers) == 1 and len(y_axis_column_headers) == 1 and all(is_number_or_datetime_column(column_header) for column_header in axis_column_headers):
+            return 'bin_scatter_graph_data', {'x': x_axis_column_headers[0], 'y': y_axis_column_headers[0], 'groupby': groupby, 'num_bins': SCATTER_GRAPH_NUM_BINS}
+    elif graph_type == BOX:
+        if len(y_axis_column_headers) > 0 and len(x_axis_column_headers) <= 1:
+            # Each x value gets its own box
+            value_column_headers = y_axis_column_headers
+            groupby = x_axis_column_headers + groupby
+        elif len(y_axis_column_headers) == 0:
+            value_column_headers = x_axis_column_headers
+        else:
+            return None
+
+        # Computing many quantiles of each group requires pandas 1.0
+        if len(groupby) > 0 and is_prev_version(pd.__version__, '1.0.0'):
+            return None
+
+        if all(is_number_column(column_header) for column_header in value_column_headers):
+            return 'get_box_graph_quantiles', {'value_columns': value_column_headers, 'groupby': groupby, 'num_quantiles': BOX_GRAPH_NUM_QUANTILES}
+    elif graph_type == LINE:
+        if len(x_axis_column_headers) == 1 and len(y_axis_column_headers) > 0 and is_number_or_datetime_column(x_axis_column_headers[0]) and all(is_number_column(column_header) for column_header in y_axis_column_headers):
+            return 'downsample_line_graph_data', {'x': x_axis_column_headers[0], 'y': y_axis_column_headers, 'groupby': groupby, 'num_points': LINE_GRAPH_NUM_POINTS}
+
+    return None
+
+
+def get_aggregated_df(df: pd.DataFrame, graph_aggregation: GraphAggregation) -> Optional[pd.DataFrame]:
+    """
+    Returns the df reduced by the aggregation, or None if the aggregation fails
+    or does not reduce the df to a size that is safe to graph.
+    """
+    function_name, params = graph_aggregation
+    # Renaming columns does not change the fingerprint of the data, so we include the column headers
+    key = (get_dataframe_fingerprint(df), tuple(df.columns), function_name, repr(params))
+
+    with graph_aggregation_cache_lock:
+        if key in graph_aggregation_cache:
+            graph_aggregation_cache.move_to_end(key)
+            return graph_aggregation_cache[key][1]
+
+    aggregated_df: Optional[pd.DataFrame]
+    try:
+        aggregated_df = GRAPH_AGGREGATION_FUNCTIONS[function_name](df, **params)
+        if len(aggregated_df.index) > MAX_AGGREGATED_ROWS:
+            aggregated_df = None
+    except Exception:
+        aggregated_df = None
+
+    with graph_aggregation_cache_lock:
+        graph_aggregation_cache[key] = (df, aggregated_df)
+        while len(graph_aggregation_cache) > MAX_CACHED_GRAPH_AGGREGATIONS:
+            graph_aggregation_cache.popitem(last=False)
+
+    return aggregated_df
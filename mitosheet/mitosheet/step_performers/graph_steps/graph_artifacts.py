@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+The HTML and script of a graph can be large, especially if it includes plotly.js
+itself, and so we don't store them in the graph_data_array of a state, which is
+copied on every step and sent to the frontend with the analysis data.
+
+Instead, graph steps store the figure of each graph as a graph artifact, and the
+graph_data_array refers to it by its ID. The ID is a hash of the figure and its
+rendering params, so identical graphs share one artifact. The frontend gets the
+HTML and script of a graph with the get_graph_artifact API call, and we only
+render them the first time they are requested.
+
+Each StepsManager sets the artifacts that its steps refer to, and artifacts that
+no StepsManager refers to are deleted.
+"""
+import hashlib
+import json
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set
+from weakref import WeakKeyDictionary
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from mitosheet.step_performers.graph_steps.graph_utils import get_html_and_script_from_figure
+
+
+class GraphArtifact():
+
+    def __init__(self, fig_json: str, height: str, width: str, include_plotlyjs: bool) -> None:
+        self.fig_json = fig_json
+        self.height = height
+        self.width = width
+        self.include_plotlyjs = include_plotlyjs
+        self.html_and_script: Optional[Dict[str, str]] = None
+        # Rendering is slow, so we lock each artifact rather than all of them while we render it
+        self.render_lock = Lock()
+
+
+graph_artifacts: Dict[str, GraphArtifact] = {}
+# For each StepsManager, the IDs of the artifacts that its steps refer to
+referenced_graph_artifact_ids: 'WeakKeyDictionary[Any, Set[str]]' = WeakKeyDictionary()
+# The API thread renders artifacts, so we lock the artifacts
+graph_artifacts_lock = Lock()
+
+
+def add_graph_artifact(fig: go.Figure, height: str, width: str, include_plotlyjs: bool) -> str:
+    """
+    Saves the figure as a graph artifact, and returns its ID.
+    """
+    fig_json = fig.to_json()
+    graph_artifact_id = hashlib.sha256(
+        json.dumps([fig_json, height, width, include_plotlyjs], default=str).encode('utf-8')
+    ).hexdigest()
+
+    with graph_artifacts_lock:
+        if graph_artifact_id not in graph_artifacts:
+            graph_artifacts[graph_artifact_id] = GraphArtifact(fig_json, height, width, include_plotlyjs)
+
+    return graph_artifact_id
+
+
+def get_graph_artifact_html_and_script(graph_artifact_id: str) -> Optional[Dict[str, str]]:
+    """
+    Returns the HTML and script of the graph artifact, rendering them if this is
+    the first time they are requested, or None if there is no such artifact.
+    """
+    with graph_artifacts_lock:
+        graph_artifact = graph_artifacts.get(graph_artifact_id)
+
+    if graph_artifact is None:
+        return None
+
+    # We only render each artifact once, as the id of the graph div is random on each render
+    with graph_artifact.render_lock:
+        if graph_artifact.html_and_script is None:
+            fig = pio.from_json(graph_artifact.fig_json)
+            graph_artifact.html_and_script = get_html_and_script_from_figure(
+                fig, graph_artifact.height, graph_artifact.width, graph_artifact.include_plotlyjs
+            )
+
+        return graph_artifact.html_and_script
+
+
+def get_graph_artifact_ids(graph_data_array: List[Dict[str, Any]]) -> Set[str]:
+    return {
+        graph_data['graph_output']['graphArtifactID']
+        for graph_data in graph_data_array
+        if 'graph_output' in graph_data
+    }
+
+
+def set_referenced_graph_artifact_ids(owner: Any, graph_artifact_ids: Iterable[str]) -> None:
+    """
+    Sets the IDs of the graph artifacts that the owner refers to, and deletes the
+    artifacts that no owner refers to.
+    """
+    with graph_artifacts_lock:
+        referenced_graph_artifact_ids[owner] = set(graph_artifact_ids)
+
+        all_referenced_graph_artifact_ids: Set[str] = set()
+        for owner_graph_artifact_ids in referenced_graph_artifact_ids.values():
+            all_referenced_graph_artifact_ids.update(owner_graph_artifact_ids)
+
+        for graph_artifact_id in list(graph_artifacts.keys()):
+            if graph_artifact_id not in all_referenced_graph_artifact_ids:
+                del graph_artifacts[graph_artifact_id]
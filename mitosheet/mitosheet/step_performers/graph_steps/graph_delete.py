@@ -31,7 +31,7 @@ class GraphDeleteStepPerformer(StepPerformer):
     def execute(cls, prev_state: State, params: Dict[str, Any]) -> Tuple[State, Optional[Dict[str, Any]]]:
         graph_id: GraphID = get_param(params, 'graph_id')
 
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
         graph_index = get_graph_index_by_graph_id(post_state.graph_data_array, graph_id)
         del post_state.graph_data_array[graph_index]
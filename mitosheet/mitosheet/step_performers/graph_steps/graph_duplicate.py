@@ -38,7 +38,7 @@ class GraphDuplicateStepPerformer(StepPerformer):
         old_graph_id: GraphID = get_param(params, 'old_graph_id')
         new_graph_id: GraphID = get_param(params, 'new_graph_id')
 
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
         graph_index = get_graph_index_by_graph_id(post_state.graph_data_array, old_graph_id)
         if (graph_index == -1):
             raise Exception(f'Graph with graph_id {old_graph_id} not found')
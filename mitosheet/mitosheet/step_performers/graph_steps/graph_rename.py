@@ -46,9 +46,13 @@ class GraphRenameStepPerformer(StepPerformer):
             return prev_state, None
 
         # Create a new step and save the parameters
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
-        post_state.graph_data_array[graph_data_index]["graph_tab_name"] = new_graph_tab_name
+        # The graph data is shared with the prev_state, so we replace it rather than editing it
+        post_state.graph_data_array[graph_data_index] = {
+            **old_graph_data,
+            "graph_tab_name": new_graph_tab_name
+        }
         
         return post_state, {
             'pandas_processing_time': 0 # No time spent on pandas, only metadata changes
@@ -42,15 +42,13 @@ GRAPH_TITLE_LABELS = {
 def get_graph_title(
     x_axis_column_headers: List[ColumnHeader],
     y_axis_column_headers: List[ColumnHeader],
-    filtered: bool,
+    graph_filter_label: Optional[str],
     graph_type: str,
 ) -> str:
     """
-    Helper function for determing the title of the graph
+    Helper function for determing the title of the graph. The graph_filter_label
+    lets the user know that their graph had a filter or aggregation applied.
     """
-    # Get the label to let the user know that their graph had a filter applied.
-    graph_filter_label: Optional[str] = "(first 1000 rows)" if filtered else None
-
     # Compile all of the column headers into one comma separated string
     all_column_headers = (", ").join(
         str(s) for s in x_axis_column_headers + y_axis_column_headers
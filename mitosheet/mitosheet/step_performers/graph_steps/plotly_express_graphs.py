@@ -4,7 +4,7 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import plotly.express as px
@@ -17,6 +17,9 @@ from mitosheet.step_performers.graph_steps.graph_utils import (BAR, BOX,
                                                                LINE, SCATTER,
                                                                STRIP, VIOLIN,
                                                                get_graph_title)
+from mitosheet.step_performers.graph_steps.graph_aggregation import (
+    GRAPH_AGGREGATION_TITLE_LABELS, GraphAggregation, get_aggregated_df,
+    get_graph_aggregation)
 from mitosheet.transpiler.transpile_utils import get_param_dict_as_code
 from mitosheet.types import ColumnHeader
 
@@ -27,6 +30,7 @@ DO_NOT_CHANGE_TITLE_FONT_COLOR_DEFAULT = '#2F3E5D'
 # The number of rows that we filter the graph to
 # This must be kept in sync with GRAPH_SAFETY_FILTER_CUTOFF in GraphSidebar.tsx
 GRAPH_SAFETY_FILTER_CUTOFF = 1000
+GRAPH_SAFETY_FILTER_TITLE_LABEL = f"(first {GRAPH_SAFETY_FILTER_CUTOFF} rows)"
 
 # Not all of Ploty's graphs support the color parameter. Those are listed here
 GRAPHS_THAT_DONT_SUPPORT_COLOR = [DENSITY_HEATMAP]
@@ -84,6 +88,70 @@ def graph_filtering_code(
         # If we don't filter the graph, then return an empty string
         return ""
 
+
+def get_applied_graph_aggregation(
+    graph_type: str,
+    df: pd.DataFrame,
+    safety_filter_turned_on_by_user: bool,
+    x_axis_column_headers: List[ColumnHeader],
+    y_axis_column_headers: List[ColumnHeader],
+    color_column_header: Optional[ColumnHeader],
+    facet_col_column_header: Optional[ColumnHeader],
+    facet_row_column_header: Optional[ColumnHeader],
+) -> Optional[Tuple[GraphAggregation, pd.DataFrame]]:
+    """
+    If the safety filter is applied, returns the aggregation that reduces the dataframe
+    to the data that the graph shows, along with the aggregated dataframe. Returns None
+    if we can't aggregate this graph, in which case we filter to the first rows instead.
+    """
+    if not safety_filter_applied(df, safety_filter_turned_on_by_user):
+        return None
+
+    graph_aggregation = get_graph_aggregation(
+        graph_type,
+        df,
+        x_axis_column_headers,
+        y_axis_column_headers,
+        color_column_header,
+        facet_col_column_header,
+        facet_row_column_header,
+    )
+    if graph_aggregation is None:
+        return None
+
+    aggregated_df = get_aggregated_df(df, graph_aggregation)
+    if aggregated_df is None:
+        return None
+
+    return graph_aggregation, aggregated_df
+
+
+def graph_aggregation_code(df_name: str, graph_aggregation: GraphAggregation) -> str:
+    """
+    Returns the code for aggregating the dataframe so we don't crash the browser
+    """
+    function_name, params = graph_aggregation
+    params_code = get_param_dict_as_code(params, as_single_line=True)
+    return f"""
+# Reduce the dataframe to the data that the graph shows, so that it does not crash the browser
+from mitosheet.public.v3 import {function_name}
+{df_name}_aggregated = {function_name}({df_name}, {params_code})
+"""
+
+
+def get_graph_filter_label(
+    is_safety_filter_applied: bool, applied_graph_aggregation: Optional[Tuple[GraphAggregation, pd.DataFrame]]
+) -> Optional[str]:
+    """
+    Returns the label that lets the user know their graph was aggregated or filtered
+    """
+    if applied_graph_aggregation is not None:
+        function_name = applied_graph_aggregation[0][0]
+        return GRAPH_AGGREGATION_TITLE_LABELS[function_name]
+    elif is_safety_filter_applied:
+        return GRAPH_SAFETY_FILTER_TITLE_LABEL
+    return None
+
 def get_graph_creation_param_dict(
         graph_type: str,
         x_axis_column_headers: List[ColumnHeader],
@@ -288,7 +356,7 @@ def graph_creation_code(
         return f"fig = px.ecdf({df_name}, {param_code})"
     return ""
 
-def get_graph_styling_param_dict(graph_type: str, column_headers: List[ColumnHeader], filtered: bool, graph_styling_params: Dict[str, Any]) -> Dict[str, Any]:
+def get_graph_styling_param_dict(graph_type: str, column_headers: List[ColumnHeader], graph_filter_label: Optional[str], graph_styling_params: Dict[str, Any]) -> Dict[str, Any]:
     """
     A param dict is a potentially nested dictonary with strings as keys with
     """
@@ -301,7 +369,7 @@ def get_graph_styling_param_dict(graph_type: str, column_headers: List[ColumnHea
         if use_custom_title:
             all_params['title'] = graph_styling_params['title']['title']
         else:
-            all_params['title'] = get_graph_title(column_headers, [], filtered, graph_type)
+            all_params['title'] = get_graph_title(column_headers, [], graph_filter_label, graph_type)
 
         # Set the font color of the main title, if it has been changed
         title_font_color = graph_styling_params['title']['title_font_color']
@@ -401,12 +469,12 @@ def get_graph_styling_param_dict(graph_type: str, column_headers: List[ColumnHea
 
 
 def graph_styling(
-    fig: go.Figure, graph_type: str, column_headers: List[ColumnHeader], filtered: bool, graph_styling_params: Dict[str, Any]
+    fig: go.Figure, graph_type: str, column_headers: List[ColumnHeader], graph_filter_label: Optional[str], graph_styling_params: Dict[str, Any]
 ) -> go.Figure:
     """
     Styles the Plotly express graph figure
     """
-    param_dict = get_graph_styling_param_dict(graph_type, column_headers, filtered, graph_styling_params) 
+    param_dict = get_graph_styling_param_dict(graph_type, column_headers, graph_filter_label, graph_styling_params) 
 
     # Actually update the style of the graph
     fig.update_layout(
@@ -418,13 +486,13 @@ def graph_styling(
 def graph_styling_code(
     graph_type: 
     str, column_headers: List[ColumnHeader], 
-    filtered: bool,
+    graph_filter_label: Optional[str],
     graph_styling_params: Dict[str, Any]
 ) -> str:
     """
     Returns the code for styling the Plotly express graph
     """
-    param_dict = get_graph_styling_param_dict(graph_type, column_headers, filtered, graph_styling_params) 
+    param_dict = get_graph_styling_param_dict(graph_type, column_headers, graph_filter_label, graph_styling_params) 
     params_code = get_param_dict_as_code(param_dict)
     return f"fig.update_layout({params_code})"
 
@@ -450,7 +518,7 @@ def get_plotly_express_graph(
 ) -> go.Figure:
     """
     Generates and returns a Plotly express graph in 3 steps
-    1) filtering -- make sure that dataframe is a safe size to graph
+    1) filtering -- make sure that dataframe is a safe size to graph, by aggregating it if we can
     2) graph creation -- actually construct the graph
     3) graph styling -- style the graph
     """
@@ -460,7 +528,21 @@ def get_plotly_express_graph(
     is_safety_filter_applied = safety_filter_applied(
         df, safety_filter_turned_on_by_user
     )
-    df = graph_filtering(df, safety_filter_turned_on_by_user)
+    applied_graph_aggregation = get_applied_graph_aggregation(
+        graph_type,
+        df,
+        safety_filter_turned_on_by_user,
+        x_axis_column_headers,
+        y_axis_column_headers,
+        color_column_header,
+        facet_col_column_header,
+        facet_row_column_header,
+    )
+    if applied_graph_aggregation is not None:
+        df = applied_graph_aggregation[1]
+    else:
+        df = graph_filtering(df, safety_filter_turned_on_by_user)
+    graph_filter_label = get_graph_filter_label(is_safety_filter_applied, applied_graph_aggregation)
 
     # Step 2: Graph Creation
     fig = graph_creation(
@@ -482,7 +564,7 @@ def get_plotly_express_graph(
     )
 
     # Step 3: Graph Styling
-    fig = graph_styling(fig, graph_type, all_column_headers, is_safety_filter_applied, graph_styling_params)
+    fig = graph_styling(fig, graph_type, all_column_headers, graph_filter_label, graph_styling_params)
 
     return fig
 
@@ -509,7 +591,7 @@ def get_plotly_express_graph_code(
 ) -> str:
     """
     Generates the code for a Plotly express graph in 3 steps
-    1) filtering -- make sure that dataframe is a safe size to graph
+    1) filtering -- make sure that dataframe is a safe size to graph, by aggregating it if we can
     2) graph creation -- actually construct the graph
     3) graph styling -- style the graph
     """
@@ -521,9 +603,23 @@ def get_plotly_express_graph_code(
     is_safety_filter_applied = safety_filter_applied(
         df, safety_filter_turned_on_by_user
     )
-    if is_safety_filter_applied:
+    applied_graph_aggregation = get_applied_graph_aggregation(
+        graph_type,
+        df,
+        safety_filter_turned_on_by_user,
+        x_axis_column_headers,
+        y_axis_column_headers,
+        color_column_header,
+        facet_col_column_header,
+        facet_row_column_header,
+    )
+    if applied_graph_aggregation is not None:
+        code.append(graph_aggregation_code(df_name, applied_graph_aggregation[0]))
+        df_name = f"{df_name}_aggregated"
+    elif is_safety_filter_applied:
         code.append(graph_filtering_code(df_name, df, safety_filter_turned_on_by_user))
         df_name = f"{df_name}_filtered"
+    graph_filter_label = get_graph_filter_label(is_safety_filter_applied, applied_graph_aggregation)
 
     # Step 2: Graph Creation
     code.append(
@@ -555,7 +651,7 @@ def get_plotly_express_graph_code(
     # Step 3: Graph Styling
     all_column_headers = x_axis_column_headers + y_axis_column_headers
     code.append(
-        graph_styling_code(graph_type, all_column_headers, is_safety_filter_applied, graph_styling_params)
+        graph_styling_code(graph_type, all_column_headers, graph_filter_label, graph_styling_params)
     )
 
     return "\n".join(code)
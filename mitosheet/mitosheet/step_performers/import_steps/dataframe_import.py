@@ -65,7 +65,7 @@ class DataframeImportStepPerformer(StepPerformer):
         df_names: str = get_param(params, 'df_names')
 
         # We make a new state to modify it
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
         pandas_start_time = perf_counter()
         
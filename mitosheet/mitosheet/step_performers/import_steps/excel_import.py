@@ -4,18 +4,32 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import pandas as pd
+
 from mitosheet.code_chunks.code_chunk import CodeChunk
-from mitosheet.code_chunks.step_performers.import_steps.excel_import_code_chunk import \
-    ExcelImportCodeChunk
+from mitosheet.code_chunks.step_performers.import_steps.excel_import_code_chunk import (
+    ExcelImportCodeChunk, build_read_excel_params)
 from mitosheet.errors import make_file_not_found_error
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
+from mitosheet.step_performers.import_steps.import_cache import (
+    cache_import, get_cached_import, get_import_cache_key)
+from mitosheet.step_performers.import_steps.simple_import import get_file_fingerprint
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.utils.utils import get_param
 from mitosheet.utils import get_valid_dataframe_names
 
+# We only parse sheets in separate processes for files larger than this, as
+# starting the processes and sending the parsed sheets back takes some time
+MIN_PARALLEL_EXCEL_IMPORT_BYTES = 5 * 1024 * 1024
+# The most sheets we parse at once when importing
+MAX_EXCEL_IMPORT_PROCESSES = 8
+
 
 class ExcelImportStepPerformer(StepPerformer):
     """
@@ -44,16 +58,32 @@ class ExcelImportStepPerformer(StepPerformer):
             'new_df_names': new_df_names
         }
 
-        return cls.execute_through_transpile(
-            prev_state,
-            params,
-            execution_data,
-            new_dataframe_params={
-                'df_source': DATAFRAME_SOURCE_IMPORTED,
-                'new_df_names': new_df_names,
-                'overwrite': None
-            }
-        )
+        # If the file has not changed since it was imported with these params, we load the dfs we saved then
+        cache_key = get_import_cache_key(cls.step_type(), [get_file_fingerprint(file_name)], params)
+        pandas_start_time = perf_counter()
+        dfs: Optional[List[pd.DataFrame]] = get_cached_import(cache_key)
+        if dfs is None:
+            # We read the sheets ourselves, rather than executing the transpiled code, so that 
+            # we can read them in parallel. Note that we read them with the same parameters
+            # as the transpiled code, so the dataframes are the same
+            read_excel_params = build_read_excel_params(
+                sheet_names,
+                get_param(params, 'has_headers'),
+                get_param(params, 'skiprows'),
+                get_param(params, 'decimal')
+            )
+            dfs = read_excel_sheets(file_name, read_excel_params)
+            cache_import(cache_key, dfs)
+        pandas_processing_time = perf_counter() - pandas_start_time
+
+        post_state = prev_state.copy(share_unmodified_metadata=True)
+        for df, df_name in zip(dfs, new_df_names):
+            post_state.add_df_to_state(df, DATAFRAME_SOURCE_IMPORTED, df_name=df_name)
+
+        return post_state, {
+            'pandas_processing_time': pandas_processing_time,
+            **execution_data
+        }
 
     @classmethod
     def transpile(
@@ -77,3 +107,40 @@ class ExcelImportStepPerformer(StepPerformer):
     @classmethod
     def get_modified_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
         return {-1}
+
+
+def read_excel_sheet(file_name: str, read_excel_params: Dict[str, Any]) -> pd.DataFrame:
+    return pd.read_excel(file_name, engine='openpyxl', **read_excel_params)
+
+
+def read_excel_sheets(file_name: str, read_excel_params: Dict[str, Any]) -> List[pd.DataFrame]:
+    """
+    Returns the sheets that pd.read_excel(file_name, engine='openpyxl', **read_excel_params) 
+    reads, in the order of the sheet_name param.
+
+    Parsing a sheet with openpyxl is CPU bound, so for large files with multiple sheets, 
+    we parse each sheet in its own process. We spawn these processes rather than forking
+    them, as forking a kernel that has other threads running can deadlock. Note that pandas already opens the workbook 
+    with openpyxl in read only mode, so each process just streams through the rows of 
+    its sheet, rather than loading the whole workbook.
+    """
+    sheet_names: List[str] = read_excel_params['sheet_name']
+    unique_sheet_names = list(dict.fromkeys(sheet_names))
+
+    if len(unique_sheet_names) > 1 and os.path.getsize(file_name) >= MIN_PARALLEL_EXCEL_IMPORT_BYTES:
+        sheet_read_excel_params = [{**read_excel_params, 'sheet_name': sheet_name} for sheet_name in unique_sheet_names]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(len(unique_sheet_names), os.cpu_count() or 1, MAX_EXCEL_IMPORT_PROCESSES),
+                mp_context=multiprocessing.get_context('spawn')
+            ) as executor:
+                sheet_dfs = list(executor.map(read_excel_sheet, [file_name] * len(unique_sheet_names), sheet_read_excel_params))
+            sheet_name_to_df = dict(zip(unique_sheet_names, sheet_dfs))
+            return [sheet_name_to_df[sheet_name] for sheet_name in sheet_names]
+        except Exception:
+            # If we can't parse the sheets in other processes (e.g. they can't be started), we
+            # parse them all in this process, which also raises any error with reading the file
+            pass
+
+    sheet_name_to_df = read_excel_sheet(file_name, read_excel_params)
+    return [sheet_name_to_df[sheet_name] for sheet_name in sheet_names]
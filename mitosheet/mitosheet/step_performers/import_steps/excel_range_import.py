@@ -5,12 +5,18 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 
+from time import perf_counter
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import pandas as pd
+
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.import_steps.excel_range_import_code_chunk import \
     ExcelRangeImportCodeChunk
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
+from mitosheet.step_performers.import_steps.import_cache import (
+    cache_import, get_cached_import, get_import_cache_key)
+from mitosheet.step_performers.import_steps.simple_import import get_file_fingerprint
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.utils.utils import get_param
 from mitosheet.types import ExcelRangeImport
@@ -40,7 +46,21 @@ class ExcelRangeImportStepPerformer(StepPerformer):
             'new_df_names': new_df_names
         }
 
-        return cls.execute_through_transpile(
+        # If the file has not changed since it was imported with these params, we load the dfs we saved then
+        cache_key = get_import_cache_key(cls.step_type(), [get_file_fingerprint(get_param(params, 'file_path'))], params)
+        pandas_start_time = perf_counter()
+        cached_dfs: Optional[List[pd.DataFrame]] = get_cached_import(cache_key)
+        if cached_dfs is not None:
+            post_state = prev_state.copy()
+            for df, df_name in zip(cached_dfs, new_df_names):
+                post_state.add_df_to_state(df, DATAFRAME_SOURCE_IMPORTED, df_name=df_name)
+
+            return post_state, {
+                'pandas_processing_time': perf_counter() - pandas_start_time,
+                **execution_data
+            }
+
+        post_state, execution_data = cls.execute_through_transpile(
             prev_state,
             params,
             execution_data,
@@ -51,6 +71,10 @@ class ExcelRangeImportStepPerformer(StepPerformer):
             }
         )
 
+        cache_import(cache_key, post_state.dfs[len(prev_state.dfs):])
+
+        return post_state, execution_data
+
     @classmethod
     def transpile(
         cls,
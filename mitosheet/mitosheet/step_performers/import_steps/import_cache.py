@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Imports are often the slowest steps of an analysis, and replaying an analysis
+reads all of its files again. If MITO_CONFIG_IMPORT_CACHE_MAX_BYTES is set,
+we save the dataframes that an import reads to disk, keyed by the fingerprints
+of the imported files and the params of the import, so that replaying an import
+of files that have not changed just loads the saved dataframes.
+
+Once the saved dataframes take up more than MITO_CONFIG_IMPORT_CACHE_MAX_BYTES,
+we delete the least recently used ones.
+
+NOTE: we save dataframes with pickle rather than parquet or feather, as pickle
+round-trips every dataframe exactly (e.g. object columns with mixed types) and
+does not require pyarrow.
+"""
+import hashlib
+import json
+import os
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from mitosheet.save_paths import MITO_FOLDER
+
+IMPORT_CACHE_FOLDER = os.path.join(MITO_FOLDER, 'import_cache')
+IMPORT_CACHE_FILE_EXTENSION = '.pkl'
+
+# Set from the MitoConfig by the StepsManager. If None, imports are not cached
+import_cache_max_bytes: Optional[int] = None
+import_cache_lock = Lock()
+
+FileFingerprint = Tuple[str, int, int]
+
+
+def set_import_cache_max_bytes(max_bytes: Optional[int]) -> None:
+    global import_cache_max_bytes
+    import_cache_max_bytes = max_bytes
+
+
+def get_import_cache_key(step_type: str, file_fingerprints: List[Optional[FileFingerprint]], params: Dict[str, Any]) -> Optional[str]:
+    """
+    Returns the key of the import of the files with the given fingerprints
+    with the given params, or None if the import should not be cached, as
+    the cache is turned off or we can't tell if one of the files changes.
+    """
+    if import_cache_max_bytes is None or any(file_fingerprint is None for file_fingerprint in file_fingerprints):
+        return None
+
+    # Pickles from other versions of pandas may not load, so we include the version in the key
+    key = json.dumps([step_type, file_fingerprints, params, pd.__version__], sort_keys=True, default=str)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def get_import_cache_path(cache_key: str) -> str:
+    return os.path.join(IMPORT_CACHE_FOLDER, cache_key + IMPORT_CACHE_FILE_EXTENSION)
+
+
+def get_cached_import(cache_key: Optional[str]) -> Optional[Any]:
+    """
+    Returns the value saved for the cache_key, or None if there is none.
+    """
+    if cache_key is None:
+        return None
+
+    cache_path = get_import_cache_path(cache_key)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        value = pd.read_pickle(cache_path)
+        # We use the modified time of the saved values to find the least recently used ones
+        os.utime(cache_path)
+        return value
+    except Exception:
+        # If the saved value can't be read, we just read the files again
+        remove_cached_import(cache_path)
+        return None
+
+
+def cache_import(cache_key: Optional[str], value: Any) -> None:
+    """
+    Saves the value for the cache_key, and then deletes the least recently used
+    values until the cache is no larger than import_cache_max_bytes.
+
+    Failing to save the value does not fail the import.
+    """
+    if cache_key is None or import_cache_max_bytes is None:
+        return
+
+    cache_path = get_import_cache_path(cache_key)
+    # We write to a temporary file first, so other processes never read a partially written value
+    temporary_cache_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(IMPORT_CACHE_FOLDER, exist_ok=True)
+        pd.to_pickle(value, temporary_cache_path)
+        os.replace(temporary_cache_path, cache_path)
+    except Exception:
+        remove_cached_import(temporary_cache_path)
+        return
+
+    evict_cached_imports(import_cache_max_bytes)
+
+
+def evict_cached_imports(max_bytes: int) -> None:
+    with import_cache_lock:
+        cached_imports = []
+        for file_name in os.listdir(IMPORT_CACHE_FOLDER):
+            if not file_name.endswith(IMPORT_CACHE_FILE_EXTENSION):
+                continue
+            cache_path = os.path.join(IMPORT_CACHE_FOLDER, file_name)
+            try:
+                stat = os.stat(cache_path)
+            except OSError:
+                continue
+            cached_imports.append((stat.st_mtime_ns, stat.st_size, cache_path))
+
+        total_bytes = sum(size for _, size, _ in cached_imports)
+        for _, size, cache_path in sorted(cached_imports):
+            if total_bytes <= max_bytes:
+                break
+            remove_cached_import(cache_path)
+            total_bytes -= size
+
+
+def remove_cached_import(cache_path: str) -> None:
+    try:
+        os.remove(cache_path)
+    except OSError:
+        pass
@@ -3,8 +3,15 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import codecs
 import csv
+import io
 import os
+import re
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
 from os.path import basename, normpath
 from typing import Any, Dict, List, Optional, Set, Tuple
 
@@ -14,15 +21,39 @@ import pandas as pd
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import (
     DEFAULT_DECIMAL, DEFAULT_DELIMITER, DEFAULT_ENCODING,
-    DEFAULT_ERROR_BAD_LINES, DEFAULT_SKIPROWS, SimpleImportCodeChunk)
+    DEFAULT_ERROR_BAD_LINES, DEFAULT_SKIPROWS, SimpleImportCodeChunk,
+    get_read_csv_params)
 from mitosheet.errors import (make_file_not_found_error,
                               make_invalid_simple_import_error,
                               make_is_directory_error)
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
+from mitosheet.step_performers.import_steps.import_cache import (
+    cache_import, get_cached_import, get_import_cache_key)
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.utils.utils import get_param
 from mitosheet.utils import get_valid_dataframe_names
 
+# When guessing the metadata of a CSV file, we only read this many bytes from the start of the file
+CSV_SNIFF_SAMPLE_BYTES = 64 * 1024
+# The most rows before the header of a CSV file that we detect
+MAX_SNIFFED_SKIPROWS = 10
+# The delimiters we guess from, in the order we prefer them
+CSV_SNIFF_DELIMITERS = [',', ';', '\t', '|', ':', ' ']
+# If chardet is less confident than this about the encoding of a file, we use latin-1 
+MIN_SNIFFED_ENCODING_CONFIDENCE = .5
+
+DECIMAL_POINT_NUMBER_REGEX = re.compile(r'^[-+]?\d*\.\d+$')
+COMMA_DECIMAL_NUMBER_REGEX = re.compile(r'^[-+]?\d+,\d+$')
+
+# The most files we read at once when importing
+MAX_CSV_IMPORT_THREADS = 8
+
+# The most recent delimiter and encoding guesses we keep, for each file fingerprint
+MAX_DELIMITER_AND_ENCODING_CACHE_SIZE = 1000
+
+delimiter_and_encoding_cache: 'OrderedDict[Tuple[str, int, int], Tuple[str, str]]' = OrderedDict()
+delimiter_and_encoding_cache_lock = Lock()
+
 
 class SimpleImportStepPerformer(StepPerformer):
     """
@@ -58,7 +89,7 @@ class SimpleImportStepPerformer(StepPerformer):
                 raise make_file_not_found_error(file_name)
 
         # Create a new step
-        post_state = prev_state.copy()
+        post_state = prev_state.copy(share_unmodified_metadata=True)
 
         file_delimeters = []
         file_encodings = []
@@ -69,29 +100,51 @@ class SimpleImportStepPerformer(StepPerformer):
 
         just_final_file_names = [basename(normpath(file_name)) for file_name in file_names]
 
-        pandas_processing_time = 0.0
+        # The dataframes we already read when guessing the delimiter and encoding, or loaded from the import cache
+        read_dfs: List[Optional[pd.DataFrame]] = []
+        # The keys to save the read dataframes under, if they were not loaded from the import cache
+        cache_keys: List[Optional[str]] = []
+
         for index, (file_name, df_name) in enumerate(zip(file_names, get_valid_dataframe_names(post_state.df_names, just_final_file_names))):
             
+            decimal = decimals[index] if decimals is not None else DEFAULT_DECIMAL
+            _skiprows = skiprows[index] if skiprows is not None else DEFAULT_SKIPROWS
+            _error_bad_lines = error_bad_lines[index] if error_bad_lines is not None else DEFAULT_ERROR_BAD_LINES
+
+            # If the file has not changed since it was imported with these params, we load the df that 
+            # we saved then, along with the delimiter and encoding that we guessed
+            specified_delimeter = delimeters[index] if delimeters is not None and encodings is not None else None
+            specified_encoding = encodings[index] if delimeters is not None and encodings is not None else None
+            cache_key = get_import_cache_key(
+                cls.step_type(),
+                [get_file_fingerprint(file_name)],
+                {'delimeter': specified_delimeter, 'encoding': specified_encoding, 'decimal': decimal, 'skiprows': _skiprows, 'error_bad_lines': _error_bad_lines}
+            )
+            cached_import = get_cached_import(cache_key)
+            read_df: Optional[pd.DataFrame] = None
+            delimeter: str
+            encoding: str
+            if cached_import is not None:
+                read_df, delimeter, encoding = cached_import
+                cache_key = None
             # We try to read the csv with the parameters that the user specified. 
             # If the user has not specified parameters, then its because they did not go to the csv configure page, and instead
             # are using Mito's defaults. In this case, we're able to make educated guesses for the delimiter and encoding, and use pandas defaults
             # for the remainder of the parameters. 
-            if delimeters is not None and encodings is not None:
+            elif specified_delimeter is not None and specified_encoding is not None:
                 # Given the Mito UI, we expect that if the user has specified the delimiter and ecoding, 
                 # that the rest of the parameters are also defined. The only time that is not the case is when 
                 # the user is replaying an old simple import that does not have these fields. To account for that, 
                 # we just handle the None case here. This makes it easy to add new parameters without having to write 
                 # step upgraders. 
                 # This approach of handling optional step params instead of writing a step upgrader is also used in graphs.
-                delimeter = delimeters[index]
-                encoding = encodings[index]
+                delimeter = specified_delimeter
+                encoding = specified_encoding
             else:
-                _, delimeter, encoding = read_csv_get_delimiter_and_encoding(file_name)
-                
-            decimal = decimals[index] if decimals is not None else DEFAULT_DECIMAL
-            _skiprows = skiprows[index] if skiprows is not None else DEFAULT_SKIPROWS
-            _error_bad_lines = error_bad_lines[index] if error_bad_lines is not None else DEFAULT_ERROR_BAD_LINES
-                
+                guessed_read_df, delimeter, encoding = get_delimiter_and_encoding(file_name)
+                # The guessed delimiter and encoding are only read with the default values of the other parameters
+                if decimal == DEFAULT_DECIMAL and _skiprows == DEFAULT_SKIPROWS and _error_bad_lines == DEFAULT_ERROR_BAD_LINES:
+                    read_df = guessed_read_df
 
             # Save the delimeter and encodings for transpiling
             file_delimeters.append(delimeter)
@@ -101,8 +154,36 @@ class SimpleImportStepPerformer(StepPerformer):
             file_error_bad_lines.append(_error_bad_lines)
             
             new_df_names.append(df_name)
+            read_dfs.append(read_df)
+            cache_keys.append(cache_key)
 
-        execution_data = {
+        # We read the files ourselves, rather than executing the transpiled code, so that 
+        # we can read them in parallel. Note that we read them with the same parameters
+        read_csv_params = [
+            get_read_csv_params(delimeter, encoding, decimal, _skiprows, _error_bad_lines)
+            for delimeter, encoding, decimal, _skiprows, _error_bad_lines in 
+            zip(file_delimeters, file_encodings, file_decimals, file_skiprows, file_error_bad_lines)
+        ]
+
+        pandas_start_time = perf_counter()
+        try:
+            dfs = read_csv_files(file_names, read_csv_params, read_dfs)
+        except:
+            raise make_invalid_simple_import_error()
+        pandas_processing_time = perf_counter() - pandas_start_time
+
+        for df, cache_key, delimeter, encoding in zip(dfs, cache_keys, file_delimeters, file_encodings):
+            cache_import(cache_key, (df, delimeter, encoding))
+
+        for df, df_name in zip(dfs, new_df_names):
+            post_state.add_df_to_state(
+                df, 
+                DATAFRAME_SOURCE_IMPORTED,
+                df_name=df_name, 
+                use_deprecated_id_algorithm=use_deprecated_id_algorithm
+            )
+
+        return post_state, {
             'file_delimeters': file_delimeters,
             'file_encodings': file_encodings,
             'file_decimals': file_decimals,
@@ -112,21 +193,6 @@ class SimpleImportStepPerformer(StepPerformer):
             'new_df_names': new_df_names
         }
 
-        try:
-            return cls.execute_through_transpile(
-                prev_state,
-                params,
-                execution_data,
-                new_dataframe_params={
-                    'df_source': DATAFRAME_SOURCE_IMPORTED,
-                    'new_df_names': new_df_names,
-                    'overwrite': None
-                },
-                use_deprecated_id_algorithm=use_deprecated_id_algorithm
-            )
-        except:
-            raise make_invalid_simple_import_error()
-
     @classmethod
     def transpile(
         cls,
@@ -152,6 +218,74 @@ class SimpleImportStepPerformer(StepPerformer):
         return {-1}
 
 
+def get_file_fingerprint(file_name: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Returns the path, modified time and size of the file, which change if the
+    file is changed. Returns None for urls, as we can't tell if they change,
+    and for files that don't exist, so reading them raises the usual error.
+    """
+    if is_url_to_file(file_name):
+        return None
+    try:
+        stat = os.stat(file_name)
+    except OSError:
+        return None
+    return (os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size)
+
+
+def get_delimiter_and_encoding(file_name: str) -> Tuple[Optional[pd.DataFrame], str, str]:
+    """
+    Returns the same delimiter and encoding as read_csv_get_delimiter_and_encoding,
+    along with the read df. 
+    
+    As guessing the delimiter and encoding reads the entire file, we cache the 
+    guesses for each file, so that replaying an analysis that imports the same
+    unchanged files doesn't read them again. If the guesses are cached, then the 
+    returned df is None.
+    """
+    file_fingerprint = get_file_fingerprint(file_name)
+    if file_fingerprint is not None:
+        with delimiter_and_encoding_cache_lock:
+            delimiter_and_encoding = delimiter_and_encoding_cache.get(file_fingerprint)
+            if delimiter_and_encoding is not None:
+                delimiter_and_encoding_cache.move_to_end(file_fingerprint)
+                return None, delimiter_and_encoding[0], delimiter_and_encoding[1]
+
+    df, delimiter, encoding = read_csv_get_delimiter_and_encoding(file_name)
+
+    if file_fingerprint is not None:
+        with delimiter_and_encoding_cache_lock:
+            delimiter_and_encoding_cache[file_fingerprint] = (delimiter, encoding)
+            if len(delimiter_and_encoding_cache) > MAX_DELIMITER_AND_ENCODING_CACHE_SIZE:
+                delimiter_and_encoding_cache.popitem(last=False)
+
+    return df, delimiter, encoding
+
+
+def read_csv_files(file_names: List[str], read_csv_params: List[Dict[str, Any]], read_dfs: Optional[List[Optional[pd.DataFrame]]]=None) -> List[pd.DataFrame]:
+    """
+    Reads each of the files with pd.read_csv and the read_csv_params for that file,
+    reading multiple files in parallel. 
+    
+    If read_dfs is passed, any file with a df in read_dfs is not read again.
+    """
+    if read_dfs is None:
+        read_dfs = [None for _ in file_names]
+
+    def read_csv(index: int) -> pd.DataFrame:
+        read_df = read_dfs[index] # type: ignore
+        if read_df is not None:
+            return read_df
+        return pd.read_csv(file_names[index], **read_csv_params[index])
+
+    files_to_read = [index for index, read_df in enumerate(read_dfs) if read_df is None]
+    if len(files_to_read) <= 1:
+        return [read_csv(index) for index in range(len(file_names))]
+
+    with ThreadPoolExecutor(max_workers=min(len(files_to_read), MAX_CSV_IMPORT_THREADS)) as executor:
+        return list(executor.map(read_csv, range(len(file_names))))
+
+
 def read_csv_get_delimiter_and_encoding(file_name: str) -> Tuple[pd.DataFrame, str, str]:
     """
     Given a file_name, will read in the file as a CSV, and
@@ -205,6 +339,160 @@ def guess_encoding(file_name: str) -> str:
         return result['encoding']
 
 
+def get_csv_sample(file_name: str, sample_bytes: int=CSV_SNIFF_SAMPLE_BYTES) -> Tuple[bytes, bool]:
+    """
+    Returns the first sample_bytes of the file, and if the file is longer 
+    than this sample
+    """
+    with open(file_name, 'rb') as f:
+        sample = f.read(sample_bytes + 1)
+    return sample[:sample_bytes], len(sample) > sample_bytes
+
+
+def decode_csv_sample(sample: bytes, encoding: str) -> str:
+    """
+    Decodes the sample with the encoding, ignoring any character that is cut off
+    at the end of the sample. Throws a UnicodeDecodeError if the sample is not
+    in this encoding.
+    """
+    return codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+
+
+def sniff_encoding(sample: bytes) -> Tuple[str, str]:
+    """
+    Returns the encoding of the sample, along with the decoded sample. 
+
+    Like read_csv_get_delimiter_and_encoding, we use utf-8 if we can, and otherwise
+    use chardet to guess the encoding, falling back to latin-1.
+    """
+    try:
+        return DEFAULT_ENCODING, decode_csv_sample(sample, DEFAULT_ENCODING)
+    except UnicodeDecodeError:
+        pass
+
+    detector = chardet.UniversalDetector()
+    for line in sample.splitlines(keepends=True):
+        detector.feed(line)
+        if detector.done:
+            break
+    result = detector.close()
+    encoding = result['encoding']
+
+    if encoding is not None and result['confidence'] >= MIN_SNIFFED_ENCODING_CONFIDENCE:
+        try:
+            decoded_sample = decode_csv_sample(sample, encoding)
+            # chardet calls latin-1 ISO-8859-1, so we use the name we fall back to below
+            if codecs.lookup(encoding).name == codecs.lookup('latin-1').name:
+                encoding = 'latin-1'
+            return encoding, decoded_sample
+        except (UnicodeDecodeError, LookupError):
+            pass
+
+    return 'latin-1', decode_csv_sample(sample, 'latin-1')
+
+
+def sniff_delimiter(lines: List[str]) -> str:
+    """
+    Returns the delimiter that splits the most lines into the same number of 
+    columns, or the default delimiter if no delimiter splits the lines. 
+    
+    Unlike csv.Sniffer, this handles rows before the header (e.g. a title).
+    """
+    best_consistency, best_delimiter = 0.0, DEFAULT_DELIMITER
+    for delimiter in CSV_SNIFF_DELIMITERS:
+        try:
+            num_columns = [len(row) for row in csv.reader(lines, delimiter=delimiter) if len(row) > 0]
+        except csv.Error:
+            continue
+        if len(num_columns) == 0:
+            continue
+
+        most_common_num_columns, count = Counter(num_columns).most_common(1)[0]
+        consistency = count / len(num_columns)
+        if most_common_num_columns > 1 and consistency > best_consistency:
+            best_consistency, best_delimiter = consistency, delimiter
+
+    return best_delimiter
+
+
+def sniff_decimal(rows: List[List[str]]) -> str:
+    """
+    Returns ',' if the numbers in the rows use a comma as the decimal separator, 
+    and otherwise the default decimal separator. As a comma followed by three digits 
+    is likely a thousands separator, we only use a comma if there is some other 
+    comma separated number, and no decimal point separated numbers.
+    """
+    comma_decimal_values = []
+    for row in rows:
+        for value in row:
+            value = value.strip()
+            if DECIMAL_POINT_NUMBER_REGEX.match(value):
+                return DEFAULT_DECIMAL
+            if COMMA_DECIMAL_NUMBER_REGEX.match(value):
+                comma_decimal_values.append(value)
+
+    if any(len(value.split(',')[1]) != 3 for value in comma_decimal_values):
+        return ','
+    return DEFAULT_DECIMAL
+
+
+def sniff_skiprows(rows: List[List[str]]) -> int:
+    """
+    Returns the number of rows before the header of the CSV, which we detect as the
+    rows at the start of the file with at most half as many columns as the rest of the
+    file (e.g. a title). 
+    """
+    non_empty_rows = [row for row in rows if len(row) > 0]
+    if len(non_empty_rows) == 0:
+        return DEFAULT_SKIPROWS
+
+    num_columns = Counter(len(row) for row in non_empty_rows).most_common(1)[0][0]
+
+    for row_index, row in enumerate(rows[:MAX_SNIFFED_SKIPROWS + 1]):
+        if len(row) > num_columns // 2:
+            # Only skip the rows if there is a header and a row of data after them
+            if len(row) == num_columns and len([row for row in rows[row_index:] if len(row) == num_columns]) >= 2:
+                return row_index
+            break
+        
+    return DEFAULT_SKIPROWS
+
+
+def sniff_csv_metadata(file_name: str, sample_bytes: int=CSV_SNIFF_SAMPLE_BYTES) -> Tuple[str, str, str, int]:
+    """
+    Returns our guesses for the delimiter, encoding, decimal separator and skiprows of 
+    the CSV file at file_name. 
+
+    Unlike read_csv_get_delimiter_and_encoding, this only reads the first sample_bytes 
+    of the file, so it takes the same time no matter how large the file is.
+    """
+    if is_url_to_file(file_name):
+        return DEFAULT_DELIMITER, DEFAULT_ENCODING, DEFAULT_DECIMAL, DEFAULT_SKIPROWS
+
+    sample, is_truncated = get_csv_sample(file_name, sample_bytes)
+    encoding, text = sniff_encoding(sample)
+
+    lines = io.StringIO(text, newline=None).readlines()
+    # The last line is likely cut off if we didn't read the entire file
+    if is_truncated and len(lines) > 1:
+        lines = lines[:-1]
+    
+    if len(lines) == 0:
+        return DEFAULT_DELIMITER, encoding, DEFAULT_DECIMAL, DEFAULT_SKIPROWS
+
+    delimiter = sniff_delimiter(lines)
+    try:
+        rows = list(csv.reader(lines, delimiter=delimiter))
+    except csv.Error:
+        return delimiter, encoding, DEFAULT_DECIMAL, DEFAULT_SKIPROWS
+
+    skiprows = sniff_skiprows(rows)
+    # We don't look for numbers in the header
+    decimal = sniff_decimal(rows[skiprows + 1:])
+
+    return delimiter, encoding, decimal, skiprows
+
+
 def is_url_to_file(file_name: str) -> bool:
     """
     Returns true if the file_name is a url to a file -- which we need to know
@@ -9,7 +9,7 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.state import State
-from mitosheet.transpiler.transpile_utils import get_globals_for_exec
+from mitosheet.transpiler.transpile_utils import get_compiled_code, get_globals_for_exec
 from mitosheet.types import (ColumnHeader, ColumnID,
                              ExecuteThroughTranspileNewDataframeParams, StepType)
 
@@ -131,12 +131,19 @@ class StepPerformer(ABC, object):
             execution_data = {}
 
         modified_dataframe_indexes = cls.get_modified_dataframe_indexes(params)
+        # If no modified indexes are returned, then any dataframe might be modified, and so
+        # we cannot share the metadata of any sheet with the previous state
+        share_unmodified_metadata = len(modified_dataframe_indexes) > 0
+
         # If the modified indexes are -1, then only new dataframes have been created -- and in this
         # case we just don't detect modifications
         if modified_dataframe_indexes == {-1}:
             modified_dataframe_indexes = set()
 
-        post_state = prev_state.copy(deep_sheet_indexes=modified_dataframe_indexes)
+        post_state = prev_state.copy(
+            deep_sheet_indexes=modified_dataframe_indexes,
+            share_unmodified_metadata=share_unmodified_metadata
+        )
 
         code_chunks = cls.transpile(post_state, params, execution_data)
         code = []
@@ -153,14 +160,14 @@ class StepPerformer(ABC, object):
         exec_locals = {**exec_globals}
         
         pandas_start_time = perf_counter()
-        exec(final_code, exec_globals, exec_locals)
+        exec(get_compiled_code(final_code), exec_globals, exec_locals)
 
         # Go through the optional code lines
         optional_code_that_successfully_executed: Tuple[List[str], List[str]] = ([], [])
         if optional_code is not None:
             for optional_import in optional_code[1]:
                 try:
-                    exec(optional_import, exec_globals, exec_locals)
+                    exec(get_compiled_code(optional_import), exec_globals, exec_locals)
                     optional_code_that_successfully_executed = (
                         optional_code_that_successfully_executed[0],
                         optional_code_that_successfully_executed[1] + [optional_import],
@@ -183,7 +190,7 @@ class StepPerformer(ABC, object):
                 # but it's fine for now -- since partial updates don't seem to 
                 # manifest in practice
                 try:
-                    exec(optional_code_line, exec_globals, exec_locals)
+                    exec(get_compiled_code(optional_code_line), exec_globals, exec_locals)
                     optional_code_that_successfully_executed = (
                         optional_code_that_successfully_executed[0] + non_code_lines_before_optional_line + [optional_code_line],
                         optional_code_that_successfully_executed[1],
@@ -239,4 +246,17 @@ class StepPerformer(ABC, object):
         If it returned -1, then it modified all new dataframes (on
         the left side of the dfs array).
         """
-        pass
\ No newline at end of file
+        pass
+
+    @classmethod
+    def get_read_dataframe_indexes(cls, params: Dict[str, Any]) -> Set[int]:
+        """
+        Returns a set of all the sheet indexes that this step reads
+        from. Together with get_modified_dataframe_indexes, this lets
+        us reuse the result of this step rather than re-executing it 
+        when none of the sheets it touches have changed.
+
+        If it returns an empty set, then this step might read from 
+        every dataframe, and so is always re-executed.
+        """
+        return set()
@@ -7,6 +7,7 @@
 import json
 import random
 import string
+from collections import Counter
 from copy import copy, deepcopy
 from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple, Union
 
@@ -14,16 +15,23 @@ import pandas as pd
 from mitosheet.api.get_parameterizable_params import get_parameterizable_params_metadata
 from mitosheet.api.get_path_contents import get_path_parts
 
+from mitosheet.code_chunks.code_chunk_utils import CodeChunksCache
+from mitosheet.dataframe_viewport import DataframeViewportCache
 from mitosheet.enterprise.mito_config import MitoConfig
+from mitosheet.errors import make_input_dataframe_changed_error
 from mitosheet.enterprise.telemetry.mito_log_uploader import MitoLogUploader
 from mitosheet.experiments.experiment_utils import get_current_experiment
 from mitosheet.step_performers.column_steps.set_column_formula import get_user_defined_sheet_function_objects
+from mitosheet.step_performers.graph_steps.graph_artifacts import get_graph_artifact_ids, set_referenced_graph_artifact_ids
 from mitosheet.step_performers.import_steps.dataframe_import import DataframeImportStepPerformer
 from mitosheet.step_performers.import_steps.excel_range_import import ExcelRangeImportStepPerformer
+from mitosheet.step_performers.import_steps.import_cache import set_import_cache_max_bytes
 from mitosheet.step_performers.user_defined_import import UserDefinedImportStepPerformer
 from mitosheet.telemetry.telemetry_utils import log
 from mitosheet.preprocessing import PREPROCESS_STEP_PERFORMERS
-from mitosheet.saved_analyses.save_utils import get_analysis_exists
+from mitosheet.preprocessing.preprocess_copy import CopyPreprocessStepPerformer
+from mitosheet.search_index import SearchIndexCache
+from mitosheet.saved_analyses.save_utils import SavedAnalysisStepsSerializer, get_analysis_exists
 from mitosheet.state import State
 from mitosheet.step import Step
 from mitosheet.step_performers import EVENT_TYPE_TO_STEP_PERFORMER
@@ -38,7 +46,7 @@ from mitosheet.transpiler.transpile_utils import get_default_code_options
 from mitosheet.types import CodeOptions, ColumnDefinintion, ColumnDefinitions, DefaultEditingMode, MitoTheme, ParamMetadata
 from mitosheet.updates import UPDATES
 from mitosheet.user.utils import is_enterprise, is_pro, is_running_test
-from mitosheet.utils import NpEncoder, dfs_to_array_for_json, get_default_df_formats, get_new_id, is_default_df_names
+from mitosheet.utils import NpEncoder, add_buffer_offset_to_sheet_data_json, dfs_to_array_for_json, get_dataframe_content_fingerprint, get_default_df_formats, get_json_array_from_json_fragments, get_new_id, get_sheet_data_json_fragments_and_versions, is_copy_on_write_enabled, is_default_df_names
 from mitosheet.step_performers.utils.user_defined_function_utils import get_user_defined_importers_for_frontend, get_user_defined_editors_for_frontend
 from mitosheet.step_performers.utils.user_defined_function_utils import validate_and_wrap_sheet_functions, validate_user_defined_editors
 
@@ -57,9 +65,92 @@ def get_step_indexes_to_skip(step_list: List[Step]) -> Set[int]:
     return step_indexes_to_skip
 
 
+def get_step_indexes_to_skip_from_previous_steps(
+        step_list: List[Step], 
+        previous_step_list: List[Step], 
+        previous_step_indexes_to_skip: Set[int]
+    ) -> Set[int]:
+    """
+    Returns the same step indexes to skip as get_step_indexes_to_skip, but if 
+    the step_list starts with the previous_step_list, only checks the new steps, 
+    as a step only skips the steps before it.
+    """
+    if len(previous_step_list) > len(step_list) or any(previous_step is not step for previous_step, step in zip(previous_step_list, step_list)):
+        return get_step_indexes_to_skip(step_list)
+
+    step_indexes_to_skip = previous_step_indexes_to_skip
+    for step_index in range(len(previous_step_list), len(step_list)):
+        step_indexes_to_skip = step_indexes_to_skip.union(
+            step_list[step_index].step_indexes_to_skip(step_list[:step_index])
+        )
+
+    return step_indexes_to_skip
+
+
+def get_written_sheet_indexes(step: Step) -> Optional[Set[int]]:
+    """
+    Returns the sheet indexes that the step changed when it was last executed, 
+    or None if any sheet might have changed.
+    """
+    modified_indexes = step.step_performer.get_modified_dataframe_indexes(step.params)
+    if len(modified_indexes) == 0:
+        return None
+    
+    if -1 in modified_indexes:
+        # If no dataframes were created, then this step overwrote an existing one, 
+        # which we don't know the index of
+        prev_num_sheets, post_num_sheets = len(step.prev_state.dfs), len(step.post_state.dfs) # type: ignore
+        if post_num_sheets <= prev_num_sheets:
+            return None
+        modified_indexes = (modified_indexes - {-1}).union(range(prev_num_sheets, post_num_sheets))
+    
+    return modified_indexes
+
+
+def union_sheet_indexes(sheet_indexes_one: Optional[Set[int]], sheet_indexes_two: Optional[Set[int]]) -> Optional[Set[int]]:
+    """
+    Unions two sets of sheet indexes, where None means all sheets.
+    """
+    if sheet_indexes_one is None or sheet_indexes_two is None:
+        return None
+    return sheet_indexes_one.union(sheet_indexes_two)
+
+
+def get_reused_step(step: Step, new_prev_state: State, changed_sheet_indexes: Set[int]) -> Optional[Step]:
+    """
+    If the step only reads and writes sheets that did not change since it was last 
+    executed, then executing it on the new_prev_state would just make the same changes
+    to these sheets again. In this case, returns a new step that reuses these changes
+    rather than executing, and otherwise returns None.
+    """
+    if step.prev_state is None or step.post_state is None or step.post_state.dataframes_released:
+        return None
+
+    read_indexes = step.step_performer.get_read_dataframe_indexes(step.params)
+    written_indexes = get_written_sheet_indexes(step)
+    if len(read_indexes) == 0 or written_indexes is None:
+        return None
+
+    num_sheets = len(new_prev_state.dfs)
+    if num_sheets != len(step.prev_state.dfs) or num_sheets != len(step.post_state.dfs):
+        return None
+
+    if not read_indexes.union(written_indexes).isdisjoint(changed_sheet_indexes):
+        return None
+
+    return Step(
+        step.step_type, 
+        step.step_id, 
+        step.params,
+        new_prev_state,
+        new_prev_state.copy_with_sheets_from(step.post_state, written_indexes),
+        step.execution_data
+    )
+
+
 def execute_step_list_from_index(
     step_list: List[Step], start_index: Optional[int]=None
-) -> List[Step]:
+) -> Tuple[List[Step], int]:
     """
     Given a list of steps, and a specific index to start from, will assume that
     the step_list[start_index] is valid, and execute this list of steps from
@@ -69,6 +160,10 @@ def execute_step_list_from_index(
     means that the returned step list will only have valid prev_state/post_states
     for the steps that are not skipped.
 
+    Steps that were executed before, and that only read and write sheets that have 
+    not changed since, are not re-executed, but rather reuse their previous changes. 
+    Returns the new step list, and the number of steps that were reused.
+
     If start_index is not given, will start from the initialize step.
     """
 
@@ -83,31 +178,88 @@ def execute_step_list_from_index(
     new_step_list = step_list[: start_index + 1]
     last_valid_step = step_list[start_index]
 
+    # To figure out which steps we can reuse, we track which sheets the state we are 
+    # executing on differs from the state the steps were previously executed on. If 
+    # changed_sheet_indexes is None, then any sheet might differ
+    old_state: Optional[State] = last_valid_step.final_defined_state
+    changed_sheet_indexes: Optional[Set[int]] = set()
+    num_reused_steps = 0
+
     for partial_index, step in enumerate(step_list[start_index + 1 :]):
         step_index = partial_index + start_index + 1
+        # If this step continued on from the old state, the steps after it were
+        # previously executed on top of its changes
+        previously_continued_old_state = step.prev_state is old_state and step.post_state is not None
+
         # If we're skipping a step, add it to the new step list (since we don't
         # want to lose it), but don't reexecute it
         if step_index in step_indexes_to_skip:
             new_step_list.append(step)
+
+            if previously_continued_old_state:
+                changed_sheet_indexes = union_sheet_indexes(changed_sheet_indexes, get_written_sheet_indexes(step))
+                old_state = step.post_state
             continue
+
+        new_step = get_reused_step(step, last_valid_step.final_defined_state, changed_sheet_indexes) \
+            if previously_continued_old_state and changed_sheet_indexes is not None else None
+
+        if new_step is not None:
+            num_reused_steps += 1
+        else:
+            # Create a new step with the same params
+            new_step = Step(step.step_type, step.step_id, step.params)
+
+            # Set the previous state of the new step, and then update
+            # what the last valid step is. Note that we find the actually
+            # executed steps before passing them
+            non_skipped_steps = [step for index, step in enumerate(new_step_list) if index not in step_indexes_to_skip]
+            new_step.set_prev_state_and_execute(last_valid_step.final_defined_state, non_skipped_steps)
             
-        # Create a new step with the same params
-        new_step = Step(step.step_type, step.step_id, step.params)
-
-        # Set the previous state of the new step, and then update
-        # what the last valid step is. Note that we find the actually
-        # executed steps before passing them
-        non_skipped_steps = [step for index, step in enumerate(new_step_list) if index not in step_indexes_to_skip]
-        new_step.set_prev_state_and_execute(last_valid_step.final_defined_state, non_skipped_steps)
-        last_valid_step = new_step
+            changed_sheet_indexes = union_sheet_indexes(changed_sheet_indexes, get_written_sheet_indexes(new_step))
+            if previously_continued_old_state:
+                changed_sheet_indexes = union_sheet_indexes(changed_sheet_indexes, get_written_sheet_indexes(step))
+
+        if previously_continued_old_state:
+            old_state = step.post_state
 
+        last_valid_step = new_step
         new_step_list.append(new_step)
 
-    return new_step_list
+    return new_step_list, num_reused_steps
+
+
+def materialize_step_state(step_list: List[Step], step_index: int) -> None:
+    """
+    Makes sure that the post_state of the step at step_index holds onto its 
+    dataframes. If they were released (see StepsManager.release_step_states), 
+    they are recomputed by replaying the steps after the closest state before
+    this one that was not released.
+    """
+    # Walk back through the states this state was computed from, until we find one
+    # that was not released. Note the initialize state is never released
+    steps_to_replay: List[Step] = []
+    step = step_list[step_index]
+    while step.post_state is not None and step.post_state.dataframes_released:
+        steps_to_replay.append(step)
+
+        prev_state = step.prev_state
+        step_index -= 1
+        while step_index > 0 and step_list[step_index].post_state is not prev_state:
+            step_index -= 1
+        step = step_list[step_index]
+
+    for step in reversed(steps_to_replay):
+        # A step that did not change the state shares its state with the step before it
+        if not step.post_state.dataframes_released: # type: ignore
+            continue
+
+        post_state, _ = step.step_performer.execute(step.prev_state, step.params) # type: ignore
+        step.post_state.restore_dataframes(post_state.dfs) # type: ignore
 
 
 def get_modified_sheet_indexes(
-    steps: List[Step], starting_step_index: int, ending_step_index: int
+    steps: List[Step], starting_step_index: Optional[int], ending_step_index: int
 ) -> Set[int]:
     """
     Returns a best guess for which sheets have been modified starting at
@@ -115,7 +267,7 @@ def get_modified_sheet_indexes(
 
     This is a best guess for caching reasons, and so may return sheets that
     have in fact not been modified. If a sheet index has been modified, it should
-    always be returned.
+    always be returned. If starting_step_index is None, all sheets are returned.
     """
     # If only one step has been performed, we can calculate the modified sheet indexes,
     # otherwise we just say all of them (undo, replay might interact weird)
@@ -191,6 +343,7 @@ class StepsManager:
             default_editing_mode: Optional[DefaultEditingMode]=None,
             theme: Optional[MitoTheme]=None,
             input_cell_execution_count: Optional[int]=None,
+            copy_dataframes: bool=True,
         ):
         """
         When initalizing the StepsManager, we also do preprocessing
@@ -198,6 +351,12 @@ class StepsManager:
 
         All preprocessing can be found in mitosheet/preprocessing, and each of
         the transformations are applied before the data is considered imported.
+
+        If copy_dataframes is False, the passed dataframes are not copied, and
+        are instead shared with the initial state. As steps deep copy the sheets 
+        they modify, the passed dataframes are still never changed by Mito. But
+        the user changing them in place would change the analysis, so we check 
+        they are unchanged before each edit.
         """
 
         # We just randomly generate analysis names as a string of 10 letters
@@ -215,9 +374,10 @@ class StepsManager:
         self.import_folder = import_folder
 
         # The args are a tuple of dataframes or strings, and we start by making them
-        # into a list, and making copies of them for safe keeping
+        # into a list. The dataframes are copied in preprocessing, so we only keep
+        # shallow copies of them here
         self.original_args = [
-            arg.copy(deep=True) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
+            arg.copy(deep=False) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
             for arg in args
         ]
 
@@ -226,11 +386,26 @@ class StepsManager:
         self.preprocess_execution_data = {}
         df_names = None
         for preprocess_step_performer in PREPROCESS_STEP_PERFORMERS:
-            args, df_names, execution_data = preprocess_step_performer.execute(args)
+            if preprocess_step_performer is CopyPreprocessStepPerformer:
+                args, df_names, execution_data = CopyPreprocessStepPerformer.execute(args, deep=copy_dataframes)
+            else:
+                args, df_names, execution_data = preprocess_step_performer.execute(args)
             self.preprocess_execution_data[
                 preprocess_step_performer.preprocess_step_type()
             ] = execution_data    
 
+        # If the dataframes are shared with the user, we fingerprint them so we can tell
+        # if the user changes them in place. See check_input_dataframes_unchanged. With
+        # copy on write, changes the user makes never reach our shallow copies, so we don't
+        self.input_dataframe_fingerprints: List[Tuple[pd.DataFrame, Tuple[Any, ...]]] = [] 
+        if not copy_dataframes and not is_copy_on_write_enabled():
+            convert_to_dataframe_execution_data = self.preprocess_execution_data['convert_to_dataframe']
+            conversion_params = convert_to_dataframe_execution_data['conversion_params'] if convert_to_dataframe_execution_data is not None else []
+            self.input_dataframe_fingerprints = [
+                (df, get_dataframe_content_fingerprint(df)) for df, (_, _, type_converted_from, _) in zip(args, conversion_params)
+                if type_converted_from == 'dataframe'
+            ]
+
         # We set the original_args_raw_strings. If we later have an args update, then these
         # are overwritten by the args update (and are actually correct). But since we don't 
         # always have an args update, this is the best we can do at this point in time. Notably, 
@@ -322,7 +497,42 @@ class StepsManager:
             self.curr_step.column_ids,
             self.curr_step.df_formats,
         )
-        self.last_step_index_we_wrote_sheet_json_on = 0
+        self.last_step_index_we_wrote_sheet_json_on: Optional[int] = 0
+        self.last_step_we_wrote_sheet_json_on: Optional[Step] = self.curr_step
+        # We also cache the json of each sheet, so we only serialize the modified sheets.
+        # Each sheet's json has a version, so we can only send the sheets that changed
+        self.saved_sheet_data_json_fragments, self.saved_sheet_data_versions = get_sheet_data_json_fragments_and_versions(
+            self.saved_sheet_data, [], [], []
+        )
+
+        # If the frontend can receive binary buffers, we also cache the sheet data with
+        # the numeric columns stored in buffers. As this is only used by some frontends,
+        # we don't compute it until it is first used
+        self.saved_binary_sheet_data: List[Dict] = []
+        self.saved_binary_sheet_data_buffers: List[List[memoryview]] = []
+        self.saved_binary_sheet_data_json_fragments: List[str] = []
+        self.saved_binary_sheet_data_versions: List[int] = []
+        self.last_step_index_we_wrote_binary_sheet_data_on: Optional[int] = None
+        self.last_step_we_wrote_binary_sheet_data_on: Optional[Step] = None
+
+        # The frontend can request any window of rows and columns of a sheet, 
+        # and we cache the most recent of these for each sheet
+        self.dataframe_viewport_cache = DataframeViewportCache()
+
+        # The search bar searches a sheet on every keystroke, so we keep an index 
+        # of the values of each column to search, and only rebuild modified columns
+        self.search_index_cache = SearchIndexCache()
+
+        # We generate the code after every edit, so we cache the code chunks of 
+        # each step and only transpile and optimize the steps that changed
+        self.code_chunks_cache = CodeChunksCache()
+
+        # We also save the analysis after every edit, so we cache the json of each step
+        self.saved_analysis_steps_serializer = SavedAnalysisStepsSerializer()
+
+        # When steps are re-executed, steps that do not depend on what changed reuse
+        # their previous result. We store how many did so in the last execution
+        self.num_reused_steps = 0
 
         # We store the number of update events that have been processed successfully,
         # which allows us to have some awareness about undos and redos in the front-end
@@ -341,6 +551,8 @@ class StepsManager:
 
         # We store the mito_config variables here so that we can use them in the api
         self.mito_config = mito_config
+        # The import steps save the dataframes they read to disk, up to the size set in the mito_config
+        set_import_cache_max_bytes(mito_config.import_cache_max_bytes)
 
         # Store the mito_log_uploader
         self.mito_log_uploader = mito_log_uploader
@@ -368,16 +580,19 @@ class StepsManager:
     def dfs(self) -> List[pd.DataFrame]:
         return self.steps_including_skipped[self.curr_step_idx].dfs
 
-    @property
-    def sheet_data_json(self) -> str:
+    def update_saved_sheet_data(self) -> None:
         """
-        sheet_json contains a serialized representation of the data
-        frames that is then fed into the Endo in the front-end.
+        Updates the saved sheet data and the json of each sheet, only 
+        recomputing the sheets that were modified since we last updated them.
 
         NOTE: we only display the _first_ 1,500 rows of the dataframe
         for speed reasons. This results in way less data getting
         passed around
         """
+        # If we are on the same step as last time, then no sheets have been modified
+        if self.last_step_index_we_wrote_sheet_json_on == self.curr_step_idx and self.last_step_we_wrote_sheet_json_on is self.curr_step:
+            return
+
         modified_sheet_indexes = get_modified_sheet_indexes(
             self.steps_including_skipped, self.last_step_index_we_wrote_sheet_json_on, self.curr_step_idx
         )
@@ -395,10 +610,116 @@ class StepsManager:
             self.curr_step.df_formats,
         )
 
+        self.saved_sheet_data_json_fragments, self.saved_sheet_data_versions = get_sheet_data_json_fragments_and_versions(
+            array, self.saved_sheet_data, self.saved_sheet_data_json_fragments, self.saved_sheet_data_versions
+        )
         self.saved_sheet_data = array
         self.last_step_index_we_wrote_sheet_json_on = self.curr_step_idx
+        self.last_step_we_wrote_sheet_json_on = self.curr_step
+
+    def update_saved_binary_sheet_data(self) -> None:
+        """
+        Updates the saved sheet data with numeric columns stored in buffers, and
+        the json of each sheet, only recomputing the sheets that were modified.
+        """
+        if self.last_step_index_we_wrote_binary_sheet_data_on == self.curr_step_idx and self.last_step_we_wrote_binary_sheet_data_on is self.curr_step:
+            return
 
-        return json.dumps(array, cls=NpEncoder)
+        modified_sheet_indexes = get_modified_sheet_indexes(
+            self.steps_including_skipped, self.last_step_index_we_wrote_binary_sheet_data_on, self.curr_step_idx
+        )
+
+        array = dfs_to_array_for_json(
+            self.curr_step.final_defined_state,
+            modified_sheet_indexes,
+            self.saved_binary_sheet_data,
+            self.curr_step.dfs,
+            self.curr_step.df_names,
+            self.curr_step.df_sources,
+            self.curr_step.column_formulas,
+            self.curr_step.column_filters,
+            self.curr_step.column_ids,
+            self.curr_step.df_formats,
+            column_data_buffers_array=self.saved_binary_sheet_data_buffers
+        )
+
+        self.saved_binary_sheet_data_json_fragments, self.saved_binary_sheet_data_versions = get_sheet_data_json_fragments_and_versions(
+            array, self.saved_binary_sheet_data, self.saved_binary_sheet_data_json_fragments, self.saved_binary_sheet_data_versions
+        )
+        self.saved_binary_sheet_data = array
+        self.last_step_index_we_wrote_binary_sheet_data_on = self.curr_step_idx
+        self.last_step_we_wrote_binary_sheet_data_on = self.curr_step
+
+    @property
+    def sheet_data_json(self) -> str:
+        """
+        sheet_json contains a serialized representation of the data
+        frames that is then fed into the Endo in the front-end.
+        """
+        self.update_saved_sheet_data()
+        return get_json_array_from_json_fragments(self.saved_sheet_data_json_fragments)
+
+    def get_sheet_data_json_and_buffers(self) -> Tuple[str, List[memoryview]]:
+        """
+        Returns the same sheet data as sheet_data_json, except numeric columns are
+        sent as binary buffers rather than in the json. This lets us skip turning
+        these columns into json entirely.
+
+        Each sheet in the json has a bufferOffset, and each column stored in a 
+        buffer has a columnDataBuffer, and so its data is in the returned buffers
+        at the index bufferOffset + columnDataBuffer.index.
+        """
+        self.update_saved_binary_sheet_data()
+
+        buffers: List[memoryview] = []
+        sheet_data_json_fragments = []
+        for sheet_data_json, sheet_buffers in zip(self.saved_binary_sheet_data_json_fragments, self.saved_binary_sheet_data_buffers):
+            sheet_data_json_fragments.append(add_buffer_offset_to_sheet_data_json(sheet_data_json, len(buffers)))
+            buffers.extend(sheet_buffers)
+
+        return get_json_array_from_json_fragments(sheet_data_json_fragments), buffers
+
+    def get_sheet_data_delta_json_and_buffers(
+            self, 
+            sent_sheet_data_versions: List[int], 
+            use_binary_sheet_data: bool
+        ) -> Tuple[str, List[memoryview], List[int]]:
+        """
+        Returns the sheet data of only the sheets that changed since the frontend
+        was sent the sheets with the sent_sheet_data_versions, along with the 
+        version of every sheet. Sheets that did not change are null, and the 
+        frontend reuses the sheet data it already has for them.
+
+        If use_binary_sheet_data, numeric columns of the changed sheets are sent
+        as buffers, as in get_sheet_data_json_and_buffers. 
+
+        Also returns the versions of the sheets, which the frontend now has.
+        """
+        if use_binary_sheet_data:
+            self.update_saved_binary_sheet_data()
+            sheet_data_json_fragments = self.saved_binary_sheet_data_json_fragments
+            sheet_data_versions = self.saved_binary_sheet_data_versions
+            sheet_buffers_array = self.saved_binary_sheet_data_buffers
+        else:
+            self.update_saved_sheet_data()
+            sheet_data_json_fragments = self.saved_sheet_data_json_fragments
+            sheet_data_versions = self.saved_sheet_data_versions
+            sheet_buffers_array = [[] for _ in sheet_data_json_fragments]
+
+        buffers: List[memoryview] = []
+        changed_sheet_data_json_fragments: List[Optional[str]] = []
+        for sheet_index, (sheet_data_json, sheet_data_version, sheet_buffers) in enumerate(zip(sheet_data_json_fragments, sheet_data_versions, sheet_buffers_array)):
+            if sheet_index < len(sent_sheet_data_versions) and sent_sheet_data_versions[sheet_index] == sheet_data_version:
+                changed_sheet_data_json_fragments.append(None)
+                continue
+
+            if use_binary_sheet_data:
+                sheet_data_json = add_buffer_offset_to_sheet_data_json(sheet_data_json, len(buffers))
+                buffers.extend(sheet_buffers)
+            changed_sheet_data_json_fragments.append(sheet_data_json)
+
+        sheet_data_delta_json = '{"sheetDataVersions": ' + json.dumps(sheet_data_versions) + ', "sheetDataArray": ' + get_json_array_from_json_fragments(changed_sheet_data_json_fragments) + '}'
+        return sheet_data_delta_json, buffers, copy(sheet_data_versions)
 
     @property
     def analysis_data_json(self):
@@ -506,10 +827,90 @@ class StepsManager:
             }
         ))
     
+    def get_retained_bytes_by_step(self) -> List[int]:
+        """
+        Returns, for each step (including skipped steps), the number of bytes of
+        dataframe data that the post_state of that step holds onto that are not
+        shared with its prev_state. The sum of this list is an estimate of the
+        memory the StepsManager holds onto for its dataframes.
+        """
+        return [
+            step.post_state.get_retained_bytes(step.prev_state) if step.post_state is not None else 0
+            for step in self.steps_including_skipped
+        ]
+
+    def release_step_states(self) -> None:
+        """
+        If the dataframes held onto by the states of the steps take up more than 
+        MITO_CONFIG_STEP_STATES_MAX_BYTES, releases the dataframes of the oldest 
+        states until they fit, or there is nothing left to release. 
+
+        The states of the initialize step, the current step, every checkpoint 
+        interval-th step and the last few steps are never released, so that a
+        released state can be recomputed by replaying the steps since the 
+        checkpoint before it. See materialize_step_state.
+        """
+        max_bytes = self.mito_config.step_states_max_bytes
+        if max_bytes is None:
+            return
+
+        checkpoint_interval = self.mito_config.step_states_checkpoint_interval
+        keep_last = self.mito_config.step_states_keep_last
+        step_indexes_to_skip = get_step_indexes_to_skip(self.steps_including_skipped)
+
+        # Steps that do not change the state share their state with the previous step, 
+        # so we handle each state once. We count the number of states that hold onto 
+        # each buffer, so we know how much memory releasing a state actually frees
+        states: Dict[int, State] = {}
+        kept_state_ids: Set[int] = {id(self.steps_including_skipped[0].post_state), id(self.curr_step.post_state)}
+        for step_index, step in enumerate(self.steps_including_skipped):
+            if step.post_state is None:
+                continue
+            states[id(step.post_state)] = step.post_state
+
+            if step_index not in step_indexes_to_skip and (
+                step_index % checkpoint_interval == 0 or step_index >= len(self.steps_including_skipped) - keep_last
+            ):
+                kept_state_ids.add(id(step.post_state))
+
+        buffer_counts: Counter = Counter()
+        buffer_bytes: Dict[int, int] = {}
+        state_buffers: Dict[int, Dict[int, int]] = {}
+        for state_id, state in states.items():
+            state_buffers[state_id] = state.get_dataframe_buffers()
+            buffer_counts.update(state_buffers[state_id].keys())
+            buffer_bytes.update(state_buffers[state_id])
+        
+        total_bytes = sum(buffer_bytes.values())
+        for state_id, state in states.items():
+            if total_bytes <= max_bytes:
+                break
+
+            if state_id in kept_state_ids or state.dataframes_released:
+                continue
+
+            if not state.release_dataframes():
+                return
+
+            for buffer_id in state_buffers[state_id]:
+                buffer_counts[buffer_id] -= 1
+                if buffer_counts[buffer_id] == 0:
+                    total_bytes -= buffer_bytes[buffer_id]
+
     @property
     def param_metadata(self) -> List[ParamMetadata]:
         return get_parameterizable_params_metadata(self)
 
+    def check_input_dataframes_unchanged(self) -> None:
+        """
+        If the dataframes passed to the mitosheet were not copied, checks that 
+        the user has not changed them in place, as the steps would be run on 
+        the changed data. Errors if they were changed.
+        """
+        for df, fingerprint in self.input_dataframe_fingerprints:
+            if get_dataframe_content_fingerprint(df) != fingerprint:
+                raise make_input_dataframe_changed_error()
+
     def handle_edit_event(self, edit_event: Dict[str, Any]) -> None:
         """
         Updates the widget state with a new step that was created
@@ -518,6 +919,7 @@ class StepsManager:
         If there is an error in the creation of the new step, this
         function will not create the new invalid step.
         """
+        self.check_input_dataframes_unchanged()
 
         # NOTE: We ignore any edit if we are in a historical state, for now. This is a result
         # of the fact that we don't allow previous editing currently
@@ -565,6 +967,7 @@ class StepsManager:
         other types of new data coming from the frontend (e.g. the df names
         or some existing steps).
         """
+        self.check_input_dataframes_unchanged()
 
         for update in UPDATES:
             if update_event["type"] == update["event_type"]:
@@ -572,6 +975,9 @@ class StepsManager:
                 params = {key: value for key, value in update_event['params'].items() if key in update['params']}  # type: ignore
                 # Actually execute this event
                 update["execute"](self, **params)  # type: ignore
+                # Updates can change the current step in place, so we can't assume its sheets are unchanged
+                self.last_step_we_wrote_sheet_json_on = None
+                self.last_step_we_wrote_binary_sheet_data_on = None
                 # Update the number of update events we record occuring
                 self.update_event_count += 1
                 # And then return
@@ -765,12 +1171,44 @@ class StepsManager:
         if last_valid_index is None:
             last_valid_index = self.find_last_valid_index(new_steps)
 
-        final_steps = execute_step_list_from_index(
+        # We execute from the last valid step, so we need its dataframes
+        materialize_step_state(new_steps, last_valid_index)
+
+        final_steps, self.num_reused_steps = execute_step_list_from_index(
             new_steps, start_index=last_valid_index
         )
         self.steps_including_skipped = final_steps
+
+        # If steps before the new last step were re-executed, then the sheets they modified 
+        # can't be found from the last step alone, and so we make sure to resend all sheets
+        if last_valid_index < len(self.steps_including_skipped) - 2:
+            self.last_step_index_we_wrote_sheet_json_on = None
+            self.last_step_index_we_wrote_binary_sheet_data_on = None
+
         self.curr_step_idx = len(self.steps_including_skipped) - 1
 
+        # The new current step may have been released, if no steps were re-executed
+        materialize_step_state(self.steps_including_skipped, self.curr_step_idx)
+        self.release_step_states()
+        self.release_graph_artifacts()
+
+    def release_graph_artifacts(self) -> None:
+        """
+        Graph steps store the HTML of their graphs as graph artifacts, outside of the
+        state. We tell the store which artifacts our steps, and the steps we could
+        redo, refer to, so that it can delete the artifacts no steps refer to.
+        """
+        steps = copy(self.steps_including_skipped)
+        for _, undone_steps in self.undone_step_list_store:
+            steps.extend(undone_steps)
+
+        graph_artifact_ids: Set[str] = set()
+        for step in steps:
+            if step.post_state is not None:
+                graph_artifact_ids.update(get_graph_artifact_ids(step.post_state.graph_data_array))
+
+        set_referenced_graph_artifact_ids(self, graph_artifact_ids)
+
     def execute_steps_data(self, new_steps_data: Optional[List[Dict[str, Any]]] = None) -> None:
         """
         Given steps data (e.g. from a saved analysis), will turn
@@ -2,13 +2,15 @@
 
 from typing import List, Tuple, Dict
 
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import pytest
 
-from mitosheet.ai.recon import exec_for_recon, get_modified_dataframe_recon_data, exec_and_get_new_state_and_result
+from mitosheet.ai.recon import exec_for_recon, get_modified_dataframe_recon_data, exec_and_get_new_state_and_result, get_recon_snapshot
 from mitosheet.errors import MitoError
 from mitosheet.state import State
+from mitosheet.tests.decorators import pandas_post_1_5_only
 from mitosheet.types import ColumnReconData, DataframeReconData, ModifiedDataframeReconData
 from mitosheet.utils import df_to_json_dumpsable
 
@@ -758,4 +760,44 @@ def test_invalid_code_execute(code, error):
     prev_state = State(df_names=list(old_dfs_map.keys()), dfs=list(old_dfs_map.values()), public_interface_version=3)
     with pytest.raises(MitoError) as e:
         exec_and_get_new_state_and_result(prev_state, code)
-    assert error in str(e)
\ No newline at end of file
+    assert error in str(e)
+
+def test_get_column_recon_only_reports_changed_columns_of_recon_snapshot():
+    old_df = pd.DataFrame({'a': [1, 2, 3], 'b': [1.0, 2.0, 3.0], 'c': ['x', 'y', 'z']})
+    new_df = get_recon_snapshot(old_df)
+    new_df['b'] = [1.0, 2.0, 4.0]
+    new_df['c'] = ['x', 'y', 'z']
+
+    _recon = get_modified_dataframe_recon_data(old_df, new_df)
+    assert _recon['column_recon']['modified_columns'] == ['b']
+
+
+@pandas_post_1_5_only
+@pytest.mark.parametrize('copy_on_write', [False, True])
+def test_exec_and_get_new_state_does_not_change_prev_state(copy_on_write):
+    with pd.option_context('mode.copy_on_write', copy_on_write):
+        df = pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]})
+        other_df = pd.DataFrame({'c': [7, 8, 9]})
+        prev_state = State(df_names=['df', 'other_df'], dfs=[df, other_df], public_interface_version=3)
+
+        new_state, _, frontend_result = exec_and_get_new_state_and_result(prev_state, "df.loc[0, 'a'] = 10")
+
+        assert prev_state.dfs[0].equals(pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]}))
+        assert new_state.dfs[0].equals(pd.DataFrame({'a': [10, 2, 3], 'b': [4, 5, 6]}))
+        assert frontend_result['modified_dataframes_recons']['df']['column_recon']['modified_columns'] == ['a']
+        # Dataframes the code does not reference are not copied
+        assert np.shares_memory(new_state.dfs[1]['c'].values, other_df['c'].values)
+
+
+@pytest.mark.parametrize('code', [
+    "df.index = df.index.astype(float)",
+    "df.columns = df.columns.astype(object)",
+])
+def test_exec_and_get_new_state_detects_changed_index_dtype(code):
+    df = pd.DataFrame({1: [1, 2, 3], 2: [4, 5, 6]})
+    prev_state = State(df_names=['df'], dfs=[df], public_interface_version=3)
+
+    new_state, _, frontend_result = exec_and_get_new_state_and_result(prev_state, code)
+
+    assert 'df' in frontend_result['modified_dataframes_recons']
+    assert (new_state.dfs[0].index.dtype, new_state.dfs[0].columns.dtype) != (df.index.dtype, df.columns.dtype)
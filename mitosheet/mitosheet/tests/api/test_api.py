@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the API call queue, which the API threads get API calls from.
+"""
+import time
+from threading import Event
+
+import pandas as pd
+import pytest
+
+from mitosheet.api.api import API, APICallMetrics, APICallQueue
+from mitosheet.api.cancellation import (APICallCancelledException,
+                                        set_current_api_call_cancelled_event)
+from mitosheet.api.get_unique_value_counts import get_unique_value_counts
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def get_event(event_type, params=None, id='id'):
+    return {'event': 'api_call', 'id': id, 'type': event_type, 'params': params if params is not None else {}}
+
+
+def test_api_queue_gets_api_calls_in_priority_order():
+    api_queue = APICallQueue(10, 2)
+    api_queue.put(get_event('get_unique_value_counts', id='1'))
+    api_queue.put(get_event('get_params', id='2'))
+    api_queue.put(get_event('get_search_matches', id='3'))
+    api_queue.put(get_event('get_path_contents', id='4'))
+
+    assert [api_queue.get().event['id'] for _ in range(4)] == ['3', '2', '4', '1']
+
+
+def test_api_queue_limits_running_low_priority_api_calls():
+    api_queue = APICallQueue(10, 1)
+    api_queue.put(get_event('get_unique_value_counts', {'column_id': 'A'}, id='1'))
+    api_queue.put(get_event('get_column_describe', {'column_id': 'A'}, id='2'))
+    api_queue.put(get_event('get_params', id='3'))
+
+    first_api_call = api_queue.get()
+    assert first_api_call.event['id'] == '3'
+    second_api_call = api_queue.get()
+    assert second_api_call.event['id'] == '1'
+
+    # The other low priority call waits until the running one is done
+    assert api_queue.get_next_api_call() is None
+    api_queue.done(second_api_call)
+    assert api_queue.get().event['id'] == '2'
+
+
+def test_api_queue_drops_superseded_queued_api_calls():
+    api_queue = APICallQueue(10, 2)
+    assert api_queue.put(get_event('get_search_matches', {'search_value': 'a'}, id='1')) == []
+    assert api_queue.put(get_event('get_search_matches', {'search_value': 'b'}, id='2')) == []
+
+    lost_events = api_queue.put(get_event('get_search_matches', {'search_value': 'a'}, id='3'))
+    assert [lost_event['id'] for lost_event in lost_events] == ['1']
+    assert [api_queue.get().event['id'] for _ in range(2)] == ['2', '3']
+
+
+def test_api_queue_cancels_superseded_running_api_calls():
+    api_queue = APICallQueue(10, 2)
+    api_queue.put(get_event('get_unique_value_counts', {'column_id': 'A'}, id='1'))
+    running_api_call = api_queue.get()
+
+    api_queue.put(get_event('get_unique_value_counts', {'column_id': 'B'}, id='2'))
+    assert not running_api_call.cancelled_event.is_set()
+
+    api_queue.put(get_event('get_unique_value_counts', {'column_id': 'A'}, id='3'))
+    assert running_api_call.cancelled_event.is_set()
+
+
+def test_api_queue_drops_oldest_lowest_priority_api_call_when_full():
+    api_queue = APICallQueue(3, 2)
+    api_queue.put(get_event('get_search_matches', id='1'))
+    api_queue.put(get_event('get_column_describe', id='2'))
+    api_queue.put(get_event('get_unique_value_counts', id='3'))
+
+    lost_events = api_queue.put(get_event('get_params', id='4'))
+    assert [lost_event['id'] for lost_event in lost_events] == ['2']
+    assert [api_queue.get().event['id'] for _ in range(3)] == ['1', '4', '3']
+
+
+def test_api_call_metrics():
+    api_call_metrics = APICallMetrics()
+    api_call_metrics.record('get_params', 1, 2)
+    api_call_metrics.record('get_params', 3, 4)
+    api_call_metrics.record('get_search_matches', 0, 1)
+
+    assert api_call_metrics.get_metrics() == {
+        'get_params': {'count': 2, 'average_queued_time': 2, 'average_processing_time': 3, 'max_latency': 7},
+        'get_search_matches': {'count': 1, 'average_queued_time': 0, 'average_processing_time': 1, 'max_latency': 1},
+    }
+
+
+def test_cancelled_api_call_raises():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    cancelled_event = Event()
+    cancelled_event.set()
+    set_current_api_call_cancelled_event(cancelled_event)
+    try:
+        with pytest.raises(APICallCancelledException):
+            get_unique_value_counts({'sheet_index': 0, 'column_id': 'A', 'search_string': '', 'sort': 'Descending Occurence'}, mito.mito_backend.steps_manager)
+    finally:
+        set_current_api_call_cancelled_event(None)
+
+
+def test_api_threads_respond_to_api_calls():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    responses = []
+    mito.mito_backend.mito_send = lambda response: responses.append(response)
+
+    api = API(mito.mito_backend.steps_manager, mito.mito_backend)
+    api.start_api_threads()
+    api.had_first_api_call = True
+
+    api.process_new_api_call(get_event('get_defined_df_names', id='1'))
+    api.process_new_api_call(get_event('get_column_describe', {'sheet_index': 0, 'column_id': 'A'}, id='2'))
+
+    for _ in range(100):
+        if len(responses) == 2 and len(api.get_api_call_metrics()) == 2:
+            break
+        time.sleep(.05)
+
+    assert {response['id'] for response in responses} == {'1', '2'}
+    assert all(response['data'] is not None for response in responses)
+    assert set(api.get_api_call_metrics().keys()) == {'get_defined_df_names', 'get_column_describe'}
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the get_csv_files_metadata API call.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from mitosheet.api.get_csv_files_metadata import get_csv_files_metadata
+from mitosheet.step_performers.import_steps.simple_import import sniff_csv_metadata
+
+TEST_FILE_PATHS = [
+    'test_file.csv',
+    'test_file1.csv'
+]
+
+
+@pytest.fixture
+def remove_test_files():
+    yield
+    for file_path in TEST_FILE_PATHS:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+@pytest.mark.parametrize("delimiter", [',', ';', '|', ':', '\t'])
+@pytest.mark.parametrize("encoding", ['utf-8', 'UTF-16', 'latin-1', 'big5'])
+def test_sniff_csv_metadata_reads_csv(remove_test_files, delimiter, encoding):
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': ['Ñ', 'b c', 'd'] if encoding == 'latin-1' else ['a', 'b c', 'd']})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=delimiter, encoding=encoding)
+
+    sniffed_delimiter, sniffed_encoding, sniffed_decimal, sniffed_skiprows = sniff_csv_metadata(TEST_FILE_PATHS[0])
+
+    assert (sniffed_delimiter, sniffed_decimal, sniffed_skiprows) == (delimiter, '.', 0)
+    assert pd.read_csv(TEST_FILE_PATHS[0], sep=sniffed_delimiter, encoding=sniffed_encoding).equals(df)
+
+
+def test_sniff_csv_metadata_comma_decimal(remove_test_files):
+    pd.DataFrame({'KG': ['267,88', '458,99', '1,55', '1']}).to_csv(TEST_FILE_PATHS[0], index=False)
+    assert sniff_csv_metadata(TEST_FILE_PATHS[0]) == (',', 'utf-8', ',', 0)
+
+    pd.DataFrame({'KG': ['1,000', '2,500']}).to_csv(TEST_FILE_PATHS[0], index=False)
+    assert sniff_csv_metadata(TEST_FILE_PATHS[0]) == (',', 'utf-8', '.', 0)
+
+
+def test_sniff_csv_metadata_skiprows(remove_test_files):
+    with open(TEST_FILE_PATHS[0], 'w') as f:
+        f.write('Sales Report\n\nA;B;C\n1;2;3\n4;5;6\n')
+
+    assert sniff_csv_metadata(TEST_FILE_PATHS[0]) == (';', 'utf-8', '.', 2)
+    assert pd.read_csv(TEST_FILE_PATHS[0], sep=';', skiprows=2).columns.tolist() == ['A', 'B', 'C']
+
+
+def test_sniff_csv_metadata_only_reads_sample(remove_test_files):
+    with open(TEST_FILE_PATHS[0], 'wb') as f:
+        f.write(b'A;B\n1,5;2\n' * 100)
+        # A character that is not utf-8 after the sample is not read
+        f.write(b'\xff;3\n')
+
+    assert sniff_csv_metadata(TEST_FILE_PATHS[0], sample_bytes=105) == (';', 'utf-8', ',', 0)
+
+
+def test_get_csv_files_metadata(remove_test_files):
+    pd.DataFrame({'A': [1, 2], 'B': [3, 4]}).to_csv(TEST_FILE_PATHS[0], index=False, sep='|')
+    pd.DataFrame({'A': ['Ñ']}).to_csv(TEST_FILE_PATHS[1], index=False, encoding='latin-1')
+
+    metadata = get_csv_files_metadata({'file_names': TEST_FILE_PATHS + ['never_exists.csv']}, None)
+
+    assert metadata == {
+        'delimeters': ['|', ',', ','],
+        'encodings': ['utf-8', 'latin-1', 'utf-8'],
+        'decimals': ['.', '.', '.'],
+        'skiprows': [0, 0, 0]
+    }
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the get_dataframe_viewport API call.
+"""
+
+import pandas as pd
+import pytest
+
+from mitosheet.api.get_dataframe_viewport import get_dataframe_viewport
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import MAX_ROWS
+
+GET_DATAFRAME_VIEWPORT_TESTS = [
+    (
+        pd.DataFrame({'A': [1, 2, 3, 4], 'B': ['a', 'b', 'c', 'd']}),
+        {'start_row': 0, 'num_rows': 2},
+        [[1, 2], ['a', 'b']],
+        [0, 1]
+    ),
+    (
+        pd.DataFrame({'A': [1, 2, 3, 4], 'B': ['a', 'b', 'c', 'd']}),
+        {'start_row': 2, 'num_rows': 10},
+        [[3, 4], ['c', 'd']],
+        [2, 3]
+    ),
+    (
+        pd.DataFrame({'A': [1, 2, 3, 4], 'B': ['a', 'b', 'c', 'd']}),
+        {'start_row': 1, 'num_rows': 2, 'start_column': 1, 'num_columns': 1},
+        [['b', 'c']],
+        [1, 2]
+    ),
+    (
+        pd.DataFrame({'A': [1, None, 3], 'B': pd.to_datetime(['2020-01-01', '2020-01-02', '2020-01-03'])}),
+        {'start_row': 1, 'num_rows': 2},
+        [['NaN', 3.0], ['2020-01-02 00:00:00', '2020-01-03 00:00:00']],
+        [1, 2]
+    ),
+    (
+        pd.DataFrame({'A': [1, 2, 3, 4]}),
+        {'start_row': 10, 'num_rows': 2},
+        [[]],
+        []
+    ),
+]
+@pytest.mark.parametrize("df, params, column_data, index", GET_DATAFRAME_VIEWPORT_TESTS)
+def test_get_dataframe_viewport(df, params, column_data, index):
+    mito = create_mito_wrapper(df)
+    viewport = get_dataframe_viewport({'sheet_index': 0, **params}, mito.mito_backend.steps_manager)
+
+    assert viewport['numRows'] == len(df)
+    assert viewport['numColumns'] == len(df.columns)
+    assert [column['columnData'] for column in viewport['data']] == column_data
+    assert viewport['index'] == index
+
+
+def test_get_dataframe_viewport_past_max_rows():
+    df = pd.DataFrame({'A': list(range(MAX_ROWS * 2))})
+    mito = create_mito_wrapper(df)
+    viewport = get_dataframe_viewport({'sheet_index': 0, 'start_row': MAX_ROWS + 10, 'num_rows': MAX_ROWS * 2}, mito.mito_backend.steps_manager)
+
+    assert viewport['startRow'] == MAX_ROWS + 10
+    assert viewport['data'][0]['columnData'] == list(range(MAX_ROWS + 10, MAX_ROWS * 2))
+
+
+def test_get_dataframe_viewport_cached_until_sheet_changes():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [4, 5, 6]}))
+    steps_manager = mito.mito_backend.steps_manager
+    params = {'sheet_index': 0, 'start_row': 0, 'num_rows': 2}
+
+    viewport = get_dataframe_viewport(params, steps_manager)
+    assert get_dataframe_viewport(params, steps_manager) is viewport
+
+    # Editing another sheet does not clear the cache
+    mito.add_column(1, 'C')
+    assert get_dataframe_viewport(params, steps_manager) is viewport
+
+    # But editing this sheet does
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    new_viewport = get_dataframe_viewport(params, steps_manager)
+    assert new_viewport is not viewport
+    assert [column['columnData'] for column in new_viewport['data']] == [[1, 2], [2, 3]]
+    assert [column['columnID'] for column in new_viewport['data']] == ['A', 'B']
+
+
+@pytest.mark.parametrize("series", [
+    pd.Series(['a', 'b', None], dtype='string'),
+    pd.Series([1, None, 3], dtype='Int64'),
+    pd.Series(['a', 'b', 'a'], dtype='category'),
+])
+def test_dataframe_fingerprint_of_extension_array_columns(series):
+    from mitosheet.dataframe_viewport import get_dataframe_fingerprint
+
+    df = pd.DataFrame({'A': series})
+    assert get_dataframe_fingerprint(df) == get_dataframe_fingerprint(df)
+    assert get_dataframe_fingerprint(df.copy(deep=False)) == get_dataframe_fingerprint(df)
+    assert get_dataframe_fingerprint(df.copy(deep=True)) != get_dataframe_fingerprint(df)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the get_excel_file_metadata API call.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from mitosheet.api.get_excel_file_metadata import get_excel_file_metadata
+from mitosheet.tests.decorators import pandas_post_1_only, python_post_3_6_only
+
+TEST_FILE = 'test_file.xlsx'
+
+
+@pytest.fixture
+def remove_test_file():
+    yield
+    if os.path.exists(TEST_FILE):
+        os.remove(TEST_FILE)
+
+
+@pandas_post_1_only
+@python_post_3_6_only
+def test_get_excel_file_metadata_reads_sheet_names_and_dimensions(remove_test_file):
+    with pd.ExcelWriter(TEST_FILE, engine='openpyxl') as writer:
+        pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4], 'C': [3, 4, 5]}).to_excel(writer, sheet_name='Zeta', index=False)
+        pd.DataFrame({'A': [1]}).to_excel(writer, sheet_name='Alpha', index=False)
+
+    metadata = get_excel_file_metadata({'file_path': TEST_FILE}, None)
+
+    assert metadata['sheet_names'] == pd.ExcelFile(TEST_FILE, engine='openpyxl').sheet_names == ['Zeta', 'Alpha']
+    assert metadata['sheet_dimensions'] == ['A1:C4', 'A1:A2']
+    assert metadata['size'] == os.path.getsize(TEST_FILE)
@@ -214,4 +214,36 @@ def test_get_number_matches_multiple_dataframes(dfs,sheet_index,search_value,exp
 
     for i, match in enumerate(matches['matches']):
         assert match['rowIndex'] == expected_matches[i][0]
-        assert match['colIndex'] == expected_matches[i][1]
\ No newline at end of file
+        assert match['colIndex'] == expected_matches[i][1]
+
+@pandas_post_1_only
+def test_get_search_matches_pages_through_rows():
+    test_wrapper = create_mito_wrapper(pd.DataFrame({'A': ['a', 'b', 'a', 'a', 'b'], 'B': ['b', 'a', 'b', 'b', 'a']}))
+    steps_manager = test_wrapper.mito_backend.steps_manager
+
+    matches = get_search_matches({'sheet_index': 0, 'search_value': 'A', 'num_rows': 2}, steps_manager)
+    assert matches['total_number_matches'] == 6
+    assert matches['matches'] == [{'rowIndex': -1, 'colIndex': 0}, {'rowIndex': 0, 'colIndex': 0}, {'rowIndex': 1, 'colIndex': 1}]
+    assert matches['next_start_row'] == 2
+
+    matches = get_search_matches({'sheet_index': 0, 'search_value': 'A', 'start_row': 4, 'num_rows': 2}, steps_manager)
+    assert matches['total_number_matches'] == 6
+    assert matches['matches'] == [{'rowIndex': -1, 'colIndex': 0}, {'rowIndex': 4, 'colIndex': 1}]
+    assert matches['next_start_row'] is None
+
+
+@pandas_post_1_only
+def test_get_search_matches_only_reindexes_modified_columns():
+    test_wrapper = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [4, 5, 6]}))
+    steps_manager = test_wrapper.mito_backend.steps_manager
+
+    get_search_matches({'sheet_index': 0, 'search_value': '1'}, steps_manager)
+    get_search_matches({'sheet_index': 1, 'search_value': '1'}, steps_manager)
+    search_index_0 = steps_manager.search_index_cache.get_search_index(0, steps_manager.dfs[0])
+
+    test_wrapper.set_formula('=B + 10', 1, 'C', add_column=True)
+
+    assert steps_manager.search_index_cache.get_search_index(0, steps_manager.dfs[0])[0] is search_index_0[0]
+    assert len(steps_manager.search_index_cache.get_search_index(1, steps_manager.dfs[1])) == 2
+    matches = get_search_matches({'sheet_index': 1, 'search_value': '1'}, steps_manager)
+    assert matches['total_number_matches'] == 3
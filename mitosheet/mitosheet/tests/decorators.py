@@ -14,7 +14,7 @@ import pandas as pd
 import sys
 from mitosheet.ai.ai_utils import is_open_ai_credentials_available
 
-from mitosheet.utils import is_flask_installed, is_prev_version, is_snowflake_connector_python_installed, is_snowflake_credentials_available, is_streamlit_installed, is_dash_installed
+from mitosheet.utils import is_copy_on_write_enabled, is_flask_installed, is_prev_version, is_snowflake_connector_python_installed, is_snowflake_credentials_available, is_streamlit_installed, is_dash_installed
 
 pandas_pre_1_only = pytest.mark.skipif(
     not pd.__version__.startswith('0.'), 
@@ -56,6 +56,11 @@ pandas_pre_1_2_only = pytest.mark.skipif(
     reason='This test only runs on later versions of Pandas. API inconsistencies make it fail on earlier versions'
 )
 
+copy_on_write_disabled_only = pytest.mark.skipif(
+    is_copy_on_write_enabled(),
+    reason='This test only runs when pandas copy on write is disabled, as it changes dataframes in place'
+)
+
 python_post_3_6_only = pytest.mark.skipif(
     sys.version_info.minor <= 6, 
     reason="requires 3.7 or greater"
@@ -8,6 +8,7 @@ Contains tests for the FILLNAN function.
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 
 from mitosheet.public.v3.sheet_functions.misc_functions import GETPREVIOUSVALUE
@@ -41,6 +42,19 @@ GETPREVIOUSVALUE_VALID_TESTS = [
         [pd.Series(pd.to_datetime(['1/2/23', '1/2/23', '1/2/23'], format='%m/%d/%y')), pd.Series([False, True, True])],  
         pd.Series(pd.to_datetime([pd.NaT, '1/2/23', '1/2/23'], format='%m/%d/%y'))
     ),
+    # NaN values are carried forward like any other value
+    (
+        [pd.Series([1.5, np.nan, 3.5]), pd.Series([True, True, False])],
+        pd.Series([1.5, np.nan, np.nan])
+    ),
+    (
+        [pd.Series([1, 2, 3], index=[5, 6, 7]), pd.Series([False, True, False], index=[5, 6, 7])],
+        pd.Series([-1, 2, 2], index=[5, 6, 7])
+    ),
+    (
+        [pd.Series([1, 2, 3]), True],
+        pd.Series([1, 2, 3])
+    ),
 ]
 @pytest.mark.parametrize("_argv, expected", GETPREVIOUSVALUE_VALID_TESTS)
 def test_bool_direct(_argv, expected):
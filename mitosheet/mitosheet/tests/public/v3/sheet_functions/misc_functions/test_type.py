@@ -23,6 +23,11 @@ TYPE_VALID_TESTS = [
     ([pd.Series([datetime.timedelta(days=1), datetime.datetime.now(), 1, 'test', 3.3, np.nan, True])], pd.Series(['timedelta', 'datetime', 'number', 'string', 'number', 'NaN', 'bool']),),
     ([pd.Series(['ABC', None])], pd.Series(['string', 'NaN'])),
     ([pd.Series([datetime.datetime.now(), None])], pd.Series(['datetime', 'NaN'])),
+    ([pd.Series([True, False])], pd.Series(['bool', 'bool'])),
+    ([pd.Series([1.5, np.nan])], pd.Series(['number', 'NaN'])),
+    ([pd.Series(pd.to_datetime(['2023-01-01', None]))], pd.Series(['datetime', 'NaN'])),
+    ([pd.Series(pd.to_timedelta(['1 day', None]))], pd.Series(['timedelta', 'NaN'])),
+    ([pd.Series([[1], {'a': 1}, np.nan, True, 1])], pd.Series(['object', 'object', 'NaN', 'bool', 'number'])),
 ]
 
 @pytest.mark.parametrize("_argv, expected", TYPE_VALID_TESTS)
@@ -70,6 +70,15 @@ VLOOKUP_VALID_TESTS = [
         ],
         pd.Series(['e', 'j', 'c'])
     ),
+    # Tests for when the index argument is a series with an index outside of the where range
+    (
+        [
+            pd.Series(['a', 'b', 'c']),
+            pd.DataFrame({0: ['c', 'a', 'b'], 1: ['d', 'e', 'f'], 2: ['h', 'i', 'j']}),
+            pd.Series([2, 5, 3])
+        ],
+        pd.Series(['e', None, 'h'])
+    ),
     # Date-time tests
     (
         [
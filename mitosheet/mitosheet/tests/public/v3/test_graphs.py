@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the functions that reduce large dataframes to the data
+that a graph shows.
+"""
+
+import numpy as np
+import pandas as pd
+from mitosheet.public.v3.graphs import (bin_scatter_graph_data,
+                                        downsample_line_graph_data,
+                                        get_box_graph_quantiles,
+                                        sum_bar_graph_data)
+
+
+def test_sum_bar_graph_data():
+    df = pd.DataFrame({'A': ['a', 'b', 'a', 'b', 'a'], 'B': [1, 2, 3, 4, 5], 'C': ['x', 'x', 'y', 'x', 'x']})
+    pd.testing.assert_frame_equal(
+        sum_bar_graph_data(df, 'A', ['B'], []),
+        pd.DataFrame({'A': ['a', 'b'], 'B': [9, 6]})
+    )
+    pd.testing.assert_frame_equal(
+        sum_bar_graph_data(df, 'A', ['B'], ['C']),
+        pd.DataFrame({'A': ['a', 'b', 'a'], 'C': ['x', 'x', 'y'], 'B': [6, 6, 3]})
+    )
+
+
+def test_bin_scatter_graph_data_keeps_one_row_per_cell_and_group():
+    df = pd.DataFrame({
+        'A': [0.0, 0.01, 10.0, 10.0, 5.0, np.nan, np.nan],
+        'B': [0.0, 0.01, 10.0, 10.0, 5.0, 1.0, 2.0],
+        'C': ['x', 'x', 'x', 'y', 'x', 'x', 'x'],
+    })
+    # Rows with a missing x or y value are not graphed, so they are dropped
+    assert bin_scatter_graph_data(df, 'A', 'B', [], 10).index.tolist() == [0, 2, 4]
+    assert bin_scatter_graph_data(df, 'A', 'B', ['C'], 10).index.tolist() == [0, 2, 3, 4]
+
+
+def test_bin_scatter_graph_data_dates():
+    df = pd.DataFrame({
+        'A': pd.to_datetime(['2020-01-01', '2020-01-01', '2021-01-01']),
+        'B': [1, 1, 1],
+    })
+    assert bin_scatter_graph_data(df, 'A', 'B', [], 10).index.tolist() == [0, 2]
+
+
+def test_get_box_graph_quantiles():
+    df = pd.DataFrame({'A': ['a', 'b'] * 50, 'B': list(range(100))})
+
+    quantiles = get_box_graph_quantiles(df, ['B'], [], 5)
+    assert quantiles['B'].tolist() == [0, 24.75, 49.5, 74.25, 99]
+
+    group_quantiles = get_box_graph_quantiles(df, ['B'], ['A'], 3)
+    assert group_quantiles['A'].tolist() == ['a', 'a', 'a', 'b', 'b', 'b']
+    assert group_quantiles['B'].tolist() == [0, 49, 98, 1, 50, 99]
+
+
+def test_downsample_line_graph_data_keeps_endpoints_and_peaks():
+    x = np.arange(10000)
+    y = np.zeros(10000)
+    y[1234] = 100
+    y[8765] = -100
+    df = pd.DataFrame({'A': x, 'B': y})
+
+    downsampled_df = downsample_line_graph_data(df, 'A', ['B'], [], 100)
+    assert len(downsampled_df) == 100
+    assert {0, 1234, 8765, 9999}.issubset(set(downsampled_df.index))
+    assert downsampled_df.index.is_monotonic_increasing
+
+
+def test_downsample_line_graph_data_groups_and_nans():
+    df = pd.DataFrame({
+        'A': list(range(1000)) * 2,
+        'B': [np.nan] + [float(i % 7) for i in range(1999)],
+        'C': ['x'] * 1000 + ['y'] * 1000,
+    })
+
+    downsampled_df = downsample_line_graph_data(df, 'A', ['B'], ['C'], 10)
+    assert len(downsampled_df) == 20
+    assert {1, 999, 1000, 1999}.issubset(set(downsampled_df.index))
+    assert downsampled_df['B'].notna().all()
+
+
+def test_downsample_line_graph_data_small_df_unchanged():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    pd.testing.assert_frame_equal(downsample_line_graph_data(df, 'A', ['B'], [], 10), df)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the RollingRange object, checking that the reductions
+computed for all windows at once match applying the reduction to each window.
+"""
+
+import numpy as np
+import pytest
+import pandas as pd
+from mitosheet.public.v3.rolling_range import RollingRange
+
+REDUCTIONS = [
+    ('sum', lambda df: df.sum().sum()),
+    ('count', lambda df: df.count().sum()),
+    ('min', lambda df: df.min().min()),
+    ('max', lambda df: df.max().max()),
+    ('std', lambda df: df.stack().std()),
+    ('var', lambda df: df.stack().var()),
+]
+
+DATAFRAMES = [
+    pd.DataFrame({'A': [1, 2, 3, 4, 5]}),
+    pd.DataFrame({'A': [1, -2, 3, -4, 5], 'B': [6, 7, 8, 9, 10]}),
+    pd.DataFrame({'A': [1.5, np.nan, 3.25, np.nan, np.nan, 5.0]}),
+    pd.DataFrame({'A': [1.5, np.nan, 3.25, 4.0], 'B': [np.nan, 2.0, 0.1, np.nan]}),
+    pd.DataFrame({'A': [np.nan, np.nan, np.nan]}),
+]
+
+WINDOWS_AND_OFFSETS = [
+    (1, 0),
+    (2, 0),
+    (2, -1),
+    (3, -1),
+    (3, 2),
+    (2, -4),
+    (4, 10),
+    (10, -10),
+]
+
+@pytest.mark.parametrize("reduction, func", REDUCTIONS)
+@pytest.mark.parametrize("df", DATAFRAMES)
+@pytest.mark.parametrize("window, offset", WINDOWS_AND_OFFSETS)
+def test_rolling_range_reductions_match_apply(reduction, func, df, window, offset):
+    rolling_range = RollingRange(df, window, offset)
+    expected = rolling_range.apply(func)
+    result = getattr(rolling_range, reduction)()
+
+    # Integer results must stay integers, but windows with no values are 0 either way
+    check_dtype = reduction in ['sum', 'count', 'min', 'max'] and all(dtype.kind == 'i' for dtype in df.dtypes)
+    pd.testing.assert_series_equal(result, expected, check_dtype=check_dtype)
+
+
+@pytest.mark.parametrize("reduction, func", REDUCTIONS)
+def test_rolling_range_reductions_fall_back_for_non_numeric_columns(reduction, func):
+    df = pd.DataFrame({'A': [True, False, True]})
+    rolling_range = RollingRange(df, 2, 0)
+    pd.testing.assert_series_equal(getattr(rolling_range, reduction)(), rolling_range.apply(func))
+
+
+def test_rolling_range_apply_with_window_before_start():
+    rolling_range = RollingRange(pd.DataFrame({'A': [1, 2, 3, 4]}), 2, -3)
+    pd.testing.assert_series_equal(rolling_range.apply(lambda df: df.sum().sum()), pd.Series([0, 0, 1, 3]))
+
+
+@pytest.mark.parametrize("reduction, func", [REDUCTION for REDUCTION in REDUCTIONS if REDUCTION[0] in ['min', 'max']])
+def test_rolling_range_min_max_of_nullable_integers(reduction, func):
+    df = pd.DataFrame({'A': pd.Series([1, None, 3, 4, None], dtype='Int64')})
+    rolling_range = RollingRange(df, 2, 0)
+    result = getattr(rolling_range, reduction)()
+    expected = rolling_range.apply(func)
+    pd.testing.assert_series_equal(result.astype('Float64'), expected.astype('Float64'))
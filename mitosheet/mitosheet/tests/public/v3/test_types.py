@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for casting series, checking that casting an entire series at
+once is the same as casting each element of the series.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.public.v3.errors import MitoError
+from mitosheet.public.v3.types.float import cast_string_to_float
+from mitosheet.public.v3.types.utils import ELEMENT_CONVERSION_FUNCTIONS, get_arg_cast_to_type
+
+SERIES = [
+    pd.Series([1, 2, -3], name='A'),
+    pd.Series([True, False]),
+    pd.Series([1.5, np.nan, -0.0, np.inf]),
+    pd.Series([1e19, 2.0]),
+    pd.Series(['1', '2'], index=[5, 7]),
+    pd.Series(['1.5', 'abc', 'abc']),
+    pd.Series(['abc', 'def']),
+    pd.Series(['true', 'no', '1.0', 'Yes']),
+    pd.Series(['nan', '1e400', '-inf']),
+    pd.Series(['$1,234', '2.5M', '(3)', '4%', '-$(1,234.5)', '1,234M', '1,23', '5Mil%', '1.5 B', '(1.5bil)', '$-5']),
+    pd.Series(['a', None]),
+    pd.Series(['a', np.nan]),
+    pd.Series([1, 'a', 2.5], dtype=object),
+    pd.Series(pd.to_timedelta([1, 2], unit='D')),
+    pd.Series([], dtype='int64'),
+    pd.Series([], dtype=object),
+]
+
+@pytest.mark.parametrize("series", SERIES)
+@pytest.mark.parametrize("target_primitive_type_name", ['str', 'int', 'float', 'number', 'bool', 'timedelta'])
+def test_cast_series_same_as_casting_elements(series, target_primitive_type_name):
+    element_conversion_function = ELEMENT_CONVERSION_FUNCTIONS[target_primitive_type_name]
+
+    try:
+        expected = series.apply(element_conversion_function)
+    except (MitoError, ValueError, OverflowError) as e:
+        with pytest.raises(type(e)):
+            get_arg_cast_to_type(target_primitive_type_name, series)
+        return
+
+    result = get_arg_cast_to_type(target_primitive_type_name, series)
+    pd.testing.assert_series_equal(result, expected)
+    # None and NaN are different results of casting
+    assert [value is None for value in result] == [value is None for value in expected]
+
+
+@pytest.mark.parametrize("string", [
+    '$1,234', '2.5M', '(3)', '4%', '-$(1,234.5)', '1,234M', '1,234.5B', '5Mil%', '(1.5bil)', '1,23', '12,3456', '1.234,5', '5)', ' 7 ', 'abc'
+])
+def test_cast_string_series_to_float_same_as_cast_string_to_float(string):
+    series = pd.Series([string, '1.5'])
+    result = get_arg_cast_to_type('float', series)
+    expected = cast_string_to_float(string)
+
+    if expected is None:
+        assert np.isnan(result[0])
+    else:
+        assert result[0] == expected
+    assert result[1] == 1.5
+
+
+def test_cast_series_ignores_primitive_types():
+    series = pd.Series([pd.Timestamp('2020-01-01'), '1', 2], dtype=object)
+    result = get_arg_cast_to_type('number', series, ['datetime'])
+    assert result.tolist() == [pd.Timestamp('2020-01-01'), 1.0, 2]
+
+    datetime_series = pd.Series(pd.to_datetime(['2020-01-01']))
+    assert get_arg_cast_to_type('number', datetime_series, ['datetime']) is datetime_series
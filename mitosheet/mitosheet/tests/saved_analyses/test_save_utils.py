@@ -9,11 +9,14 @@ Contains tests for save utils.
 import json
 import os
 import random
+import time
 
 import pandas as pd
 import pytest
 from mitosheet.saved_analyses import SAVED_ANALYSIS_FOLDER, write_save_analysis_file
-from mitosheet.saved_analyses.save_utils import read_and_upgrade_analysis
+from mitosheet.saved_analyses.save_utils import (SavedAnalysisWriter, get_saved_analysis_string, get_steps_obj_for_saved_analysis,
+                                                 read_analysis, read_and_upgrade_analysis)
+from mitosheet.utils import NpEncoder
 from mitosheet.types import FC_NUMBER_EXACTLY
 from mitosheet.tests.test_utils import (create_mito_wrapper_with_data,
                                         create_mito_wrapper)
@@ -369,4 +372,61 @@ def test_replay_failed_analysis_does_not_change_public_interface_version():
     new_mito.replay_analysis(random_name)
 
     assert new_mito.mito_backend.steps_manager.public_interface_version == starting_val
-    assert len(new_mito.optimized_code_chunks) == 0
\ No newline at end of file
+    assert len(new_mito.optimized_code_chunks) == 0
+
+
+def test_saved_analysis_string_only_serializes_new_steps():
+    mito = create_mito_wrapper_with_data([1, 2, 3])
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    steps_manager = mito.mito_backend.steps_manager
+    get_saved_analysis_string(steps_manager)
+    step_jsons = dict(steps_manager.saved_analysis_steps_serializer.step_jsons)
+
+    mito.set_formula('=A + 2', 0, 'C', add_column=True)
+    saved_analysis_string = get_saved_analysis_string(steps_manager)
+    for step_id, (step, step_json) in step_jsons.items():
+        assert steps_manager.saved_analysis_steps_serializer.step_jsons[step_id][1] is step_json
+
+    saved_analysis = json.loads(saved_analysis_string)
+    assert saved_analysis['steps_data'] == json.loads(json.dumps(get_steps_obj_for_saved_analysis(steps_manager.steps_including_skipped), cls=NpEncoder))
+    assert saved_analysis['code'] == steps_manager.code()
+
+
+def test_edits_write_saved_analysis_in_background():
+    mito = create_mito_wrapper_with_data([1, 2, 3])
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    mito.set_formula('=A + 2', 0, 'B')
+
+    # Reading the analysis writes the pending write first
+    analysis = read_analysis(mito.mito_backend.analysis_name)
+    assert analysis is not None
+    assert analysis['steps_data'][-1]['params']['new_formula'] == '=A + 2'
+
+
+def test_saved_analysis_writer_only_writes_latest_version(tmp_path):
+    saved_analysis_writer = SavedAnalysisWriter(delay=60)
+    analysis_path = str(tmp_path / 'analysis.json')
+    saved_analysis_writer.write(analysis_path, '{"version": 1}')
+    saved_analysis_writer.write(analysis_path, '{"version": 2}')
+    assert not os.path.exists(analysis_path)
+
+    saved_analysis_writer.flush()
+    with open(analysis_path) as f:
+        assert json.load(f) == {'version': 2}
+    # The temporary file is renamed to the analysis file
+    assert os.listdir(tmp_path) == ['analysis.json']
+
+
+def test_saved_analysis_writer_writes_after_delay(tmp_path):
+    saved_analysis_writer = SavedAnalysisWriter(delay=.01)
+    analysis_path = str(tmp_path / 'analysis.json')
+    saved_analysis_writer.write(analysis_path, '{"version": 1}')
+
+    for _ in range(100):
+        if os.path.exists(analysis_path):
+            break
+        time.sleep(.05)
+
+    with open(analysis_path) as f:
+        assert json.load(f) == {'version': 1}
+
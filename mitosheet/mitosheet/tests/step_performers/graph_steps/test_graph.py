@@ -221,4 +221,101 @@ def test_box_configuration():
     assert mito.get_graph_sheet_index(graph_id) == 0
     assert mito.get_graph_axis_column_ids(graph_id, 'x') == ['A']
     assert mito.get_graph_axis_column_ids(graph_id, 'y') == ['B', 'C']
-    assert not mito.get_is_graph_output_none(graph_id)
\ No newline at end of file
+    assert not mito.get_is_graph_output_none(graph_id)
+
+@pytest.fixture
+def empty_graph_artifacts():
+    from mitosheet.step_performers.graph_steps.graph_artifacts import graph_artifacts, referenced_graph_artifact_ids
+
+    # Graphs made by other tests may still be referenced by their steps managers, so we 
+    # start with an empty store, and put their artifacts back once the test is done
+    saved_graph_artifacts = dict(graph_artifacts)
+    saved_referenced_graph_artifact_ids = dict(referenced_graph_artifact_ids)
+    graph_artifacts.clear()
+    referenced_graph_artifact_ids.clear()
+    yield
+    graph_artifacts.clear()
+    graph_artifacts.update(saved_graph_artifacts)
+    referenced_graph_artifact_ids.clear()
+    referenced_graph_artifact_ids.update(saved_referenced_graph_artifact_ids)
+
+
+def test_graph_html_stored_as_artifact_and_deleted_once_unreferenced(empty_graph_artifacts):
+    from mitosheet.api.get_graph_artifact import get_graph_artifact
+    from mitosheet.step_performers.graph_steps.graph_artifacts import graph_artifacts, set_referenced_graph_artifact_ids
+
+    df = pd.DataFrame({'A': ['aaron', 'jake', 'nate'], 'B': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+    mito.generate_graph('123', BAR, 0, False, ['A'], ['B'], 400, 400)
+    mito.generate_graph('456', BAR, 0, False, ['A'], ['B'], 400, 400)
+
+    graph_output = mito.get_graph_data('123')['graph_output']
+    assert 'graphHTML' not in graph_output
+    # Identical graphs share an artifact
+    graph_artifact_id = graph_output['graphArtifactID']
+    assert mito.get_graph_data('456')['graph_output']['graphArtifactID'] == graph_artifact_id
+
+    graph_artifact = get_graph_artifact({'graph_artifact_id': graph_artifact_id}, mito.mito_backend.steps_manager)
+    assert graph_artifact is not None
+    assert 'plotly-graph-div' in graph_artifact['graphHTML']
+    # The graph is only rendered once, so the id of the div stays the same
+    assert get_graph_artifact({'graph_artifact_id': graph_artifact_id}, mito.mito_backend.steps_manager) == graph_artifact
+
+    # Artifacts are deleted once no steps refer to them
+    mito.generate_graph('123', SCATTER, 0, False, ['A'], ['B'], 400, 400)
+    assert graph_artifact_id in graph_artifacts
+    set_referenced_graph_artifact_ids(mito.mito_backend.steps_manager, [])
+    assert graph_artifact_id not in graph_artifacts
+
+@pytest.mark.parametrize("graph_type, x, y, aggregation_function, graph_filter_label", [
+    (BAR, ['A'], ['B'], 'sum_bar_graph_data', '(aggregated)'),
+    (BOX, ['A'], ['B'], 'get_box_graph_quantiles', '(aggregated)'),
+    (SCATTER, ['B'], ['C'], 'bin_scatter_graph_data', '(downsampled)'),
+    (LINE, ['B'], ['C'], 'downsample_line_graph_data', '(downsampled)'),
+    (HISTOGRAM, ['B'], [], None, '(first 1000 rows)'),
+])
+def test_safety_filter_aggregates_large_graphs(graph_type, x, y, aggregation_function, graph_filter_label):
+    df = pd.DataFrame({'A': ['aaron', 'jake', 'nate', 'nate'] * 1000, 'B': list(range(4000)), 'C': [i % 13 for i in range(4000)]})
+    mito = create_mito_wrapper(df)
+    mito.generate_graph('123', graph_type, 0, True, x, y, 400, 400)
+
+    graph_code = mito.get_graph_data('123')['graph_output']['graphGeneratedCode']
+    assert graph_filter_label in graph_code
+    if aggregation_function is None:
+        assert 'df1_filtered = df1.head(1000)' in graph_code
+        return
+
+    assert f'from mitosheet.public.v3 import {aggregation_function}' in graph_code
+    assert f'df1_aggregated = {aggregation_function}(df1, ' in graph_code
+    assert 'px.' in graph_code and '(df1_aggregated, ' in graph_code
+
+    # The generated code runs the same aggregation
+    exec_globals = {'df1': df}
+    exec(graph_code, exec_globals)
+    assert len(exec_globals['df1_aggregated'].index) < len(df.index)
+
+
+def test_graph_aggregation_cached_across_styling_edits():
+    from mitosheet.step_performers.graph_steps import graph_aggregation
+
+    df = pd.DataFrame({'A': ['aaron', 'jake'] * 1000, 'B': list(range(2000))})
+    mito = create_mito_wrapper(df)
+
+    calls = []
+    sum_bar_graph_data = graph_aggregation.GRAPH_AGGREGATION_FUNCTIONS['sum_bar_graph_data']
+    def counting_sum_bar_graph_data(*args, **kwargs):
+        calls.append(1)
+        return sum_bar_graph_data(*args, **kwargs)
+    graph_aggregation.GRAPH_AGGREGATION_FUNCTIONS['sum_bar_graph_data'] = counting_sum_bar_graph_data
+
+    try:
+        mito.generate_graph('123', BAR, 0, True, ['A'], ['B'], 400, 400)
+        mito.generate_graph('123', BAR, 0, True, ['A'], ['B'], 400, 400, title_title='New Title')
+        assert len(calls) == 1
+
+        # Editing the data recomputes the aggregation
+        mito.set_formula('=B + 1', 0, 'C', add_column=True)
+        mito.generate_graph('123', BAR, 0, True, ['A'], ['B'], 400, 400)
+        assert len(calls) == 2
+    finally:
+        graph_aggregation.GRAPH_AGGREGATION_FUNCTIONS['sum_bar_graph_data'] = sum_bar_graph_data
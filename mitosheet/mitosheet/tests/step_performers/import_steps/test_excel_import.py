@@ -264,4 +264,92 @@ def test_can_import_a_single_excel_single_quote():
     assert mito.df_names == ["Sheet_1"]
 
     # Remove the test file
-    os.remove(TEST_FILE)
\ No newline at end of file
+    os.remove(TEST_FILE)
+
+@pandas_post_1_only
+@python_post_3_6_only
+def test_excel_import_cached_until_file_changes(monkeypatch, tmp_path):
+    from mitosheet.state import State
+    from mitosheet.step_performers.import_steps import excel_import, import_cache
+
+    monkeypatch.setattr(import_cache, 'IMPORT_CACHE_FOLDER', str(tmp_path))
+    monkeypatch.setattr(import_cache, 'import_cache_max_bytes', 10_000_000)
+
+    num_reads = []
+    read_excel_sheets = excel_import.read_excel_sheets
+    def counting_read_excel_sheets(file_name, read_excel_params):
+        num_reads.append(file_name)
+        return read_excel_sheets(file_name, read_excel_params)
+    monkeypatch.setattr(excel_import, 'read_excel_sheets', counting_read_excel_sheets)
+
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_excel(TEST_FILE, index=False)
+
+    # We execute the step directly, as the test wrapper also runs the transpiled code, which reads the file
+    params = {'file_name': TEST_FILE, 'sheet_names': ['Sheet1'], 'has_headers': True, 'skiprows': 0, 'decimal': DEFAULT_DECIMAL}
+    prev_state = State([], public_interface_version=3)
+    excel_import.ExcelImportStepPerformer.execute(prev_state, params)
+    assert len(num_reads) == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+    # Replaying the import loads the saved df, rather than reading the file
+    post_state, execution_data = excel_import.ExcelImportStepPerformer.execute(prev_state, params)
+    assert len(num_reads) == 1
+    assert post_state.dfs[0].equals(df)
+    assert execution_data is not None and execution_data['new_df_names'] == ['Sheet1']
+
+    # Once the file changes, it is read again
+    new_df = pd.DataFrame(data={'A': [1, 2, 3, 4], 'B': [2, 3, 4, 5]})
+    new_df.to_excel(TEST_FILE, index=False)
+    post_state, _ = excel_import.ExcelImportStepPerformer.execute(prev_state, params)
+    assert len(num_reads) == 2
+    assert post_state.dfs[0].equals(new_df)
+
+    os.remove(TEST_FILE)
+
+
+@pandas_post_1_only
+@python_post_3_6_only
+def test_excel_import_parses_sheets_in_parallel(monkeypatch):
+    from mitosheet.step_performers.import_steps import excel_import
+    monkeypatch.setattr(excel_import, 'MIN_PARALLEL_EXCEL_IMPORT_BYTES', 0)
+
+    df1 = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df2 = pd.DataFrame(data={'C': ['a', 'b'], 'D': [1.5, 2.5]})
+    with pd.ExcelWriter(TEST_FILE) as writer:
+        df1.to_excel(writer, sheet_name='Sheet1', index=False)
+        df2.to_excel(writer, sheet_name='Sheet2', index=False)
+
+    mito = create_mito_wrapper()
+    mito.excel_import(TEST_FILE, ['Sheet2', 'Sheet1'], True, 0, DEFAULT_DECIMAL)
+
+    assert mito.df_names == ['Sheet2', 'Sheet1']
+    assert mito.dfs[0].equals(df2)
+    assert mito.dfs[1].equals(df1)
+
+    os.remove(TEST_FILE)
+
+
+@pandas_post_1_only
+@python_post_3_6_only
+def test_read_excel_sheets_parses_sheets_in_spawned_processes(monkeypatch):
+    from mitosheet.step_performers.import_steps import excel_import
+    monkeypatch.setattr(excel_import, 'MIN_PARALLEL_EXCEL_IMPORT_BYTES', 0)
+
+    df1 = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df2 = pd.DataFrame(data={'C': ['a', 'b'], 'D': [1.5, 2.5]})
+    with pd.ExcelWriter(TEST_FILE) as writer:
+        df1.to_excel(writer, sheet_name='Sheet1', index=False)
+        df2.to_excel(writer, sheet_name='Sheet2', index=False)
+
+    # Spawned processes import pandas themselves, so they don't see this
+    def failing_read_excel(*args, **kwargs):
+        raise Exception('Sheets should be parsed in other processes')
+    monkeypatch.setattr(pd, 'read_excel', failing_read_excel)
+
+    dfs = excel_import.read_excel_sheets(TEST_FILE, {'sheet_name': ['Sheet2', 'Sheet1', 'Sheet2']})
+    assert dfs[0].equals(df2)
+    assert dfs[1].equals(df1)
+    assert dfs[2].equals(df2)
+
+    os.remove(TEST_FILE)
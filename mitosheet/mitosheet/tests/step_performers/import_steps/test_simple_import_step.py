@@ -528,3 +528,107 @@ def test_can_import_with_invalid_name():
     # Remove the test file
     os.remove(file_path)
 
+
+
+def test_can_import_multiple_csvs_with_different_params():
+    df = pd.DataFrame(data={'A': [1.5, 2.5, 3.5], 'B': ['a', 'b', 'c']})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';', decimal=',')
+    df.to_csv(TEST_FILE_PATHS[1], index=False, encoding='latin-1')
+
+    mito = create_mito_wrapper()
+    mito.simple_import(TEST_FILE_PATHS, [';', ','], ['utf-8', 'latin-1'], [',', '.'], [0, 0], [True, True])
+
+    assert len(mito.dfs) == 2
+    assert mito.dfs[0].equals(df)
+    assert mito.dfs[1].equals(df)
+
+    os.remove(TEST_FILE_PATHS[0])
+    os.remove(TEST_FILE_PATHS[1])
+
+
+def test_guessed_delimiter_and_encoding_cached_until_file_changes(monkeypatch):
+    from mitosheet.step_performers.import_steps import simple_import
+
+    num_guesses = []
+    read_csv_get_delimiter_and_encoding = simple_import.read_csv_get_delimiter_and_encoding
+    def counting_read_csv_get_delimiter_and_encoding(file_name):
+        num_guesses.append(file_name)
+        return read_csv_get_delimiter_and_encoding(file_name)
+    monkeypatch.setattr(simple_import, 'read_csv_get_delimiter_and_encoding', counting_read_csv_get_delimiter_and_encoding)
+
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';')
+
+    mito = create_mito_wrapper()
+    mito.simple_import([TEST_FILE_PATHS[0]])
+    mito.simple_import([TEST_FILE_PATHS[0]])
+    assert len(num_guesses) == 1
+    assert mito.dfs[1].equals(df)
+
+    new_df = pd.DataFrame(data={'A': [1, 2, 3, 4], 'B': [2, 3, 4, 5]})
+    new_df.to_csv(TEST_FILE_PATHS[0], index=False, sep='|')
+    read_df, delimiter, encoding = simple_import.get_delimiter_and_encoding(TEST_FILE_PATHS[0])
+    assert len(num_guesses) == 2
+    assert (delimiter, encoding) == ('|', 'utf-8')
+    assert read_df is not None and read_df.equals(new_df)
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_import_cached_until_file_changes(monkeypatch, tmp_path):
+    from mitosheet.state import State
+    from mitosheet.step_performers.import_steps import import_cache, simple_import
+
+    monkeypatch.setattr(import_cache, 'IMPORT_CACHE_FOLDER', str(tmp_path))
+    monkeypatch.setattr(import_cache, 'import_cache_max_bytes', 10_000_000)
+
+    num_reads = []
+    read_csv_files = simple_import.read_csv_files
+    def counting_read_csv_files(file_names, read_csv_params, read_dfs):
+        num_reads.extend(read_df for read_df in read_dfs if read_df is None)
+        return read_csv_files(file_names, read_csv_params, read_dfs)
+    monkeypatch.setattr(simple_import, 'read_csv_files', counting_read_csv_files)
+
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False)
+
+    # We execute the step directly, as the test wrapper also runs the transpiled code, which reads the file
+    params = {
+        'file_names': [TEST_FILE_PATHS[0]], 
+        'delimeters': [','], 
+        'encodings': ['utf-8'], 
+        'decimals': ['.'], 
+        'skiprows': [0], 
+        'error_bad_lines': [True]
+    }
+    prev_state = State([], public_interface_version=3)
+    simple_import.SimpleImportStepPerformer.execute(prev_state, params)
+    post_state, _ = simple_import.SimpleImportStepPerformer.execute(prev_state, params)
+    assert len(num_reads) == 1
+    assert len(os.listdir(tmp_path)) == 1
+    assert post_state.dfs[0].equals(df)
+
+    # Once the file changes, it is read again
+    new_df = pd.DataFrame(data={'A': [1, 2, 3, 4], 'B': [2, 3, 4, 5]})
+    new_df.to_csv(TEST_FILE_PATHS[0], index=False)
+    post_state, _ = simple_import.SimpleImportStepPerformer.execute(prev_state, params)
+    assert len(num_reads) == 2
+    assert post_state.dfs[0].equals(new_df)
+
+    os.remove(TEST_FILE_PATHS[0])
+
+def test_import_cache_evicts_least_recently_used(monkeypatch, tmp_path):
+    from mitosheet.step_performers.import_steps import import_cache
+
+    monkeypatch.setattr(import_cache, 'IMPORT_CACHE_FOLDER', str(tmp_path))
+    monkeypatch.setattr(import_cache, 'import_cache_max_bytes', 10_000_000)
+
+    import_cache.cache_import('first', pd.DataFrame({'A': range(1000)}))
+    import_cache.cache_import('second', pd.DataFrame({'A': range(1000)}))
+    first_path = import_cache.get_import_cache_path('first')
+    os.utime(first_path, ns=(0, 0))
+    assert import_cache.get_cached_import('second') is not None
+
+    import_cache.evict_cached_imports(os.path.getsize(first_path))
+    assert import_cache.get_cached_import('first') is None
+    assert import_cache.get_cached_import('second') is not None
@@ -7,6 +7,7 @@
 Contains tests for filter edit events.
 """
 
+from collections import OrderedDict
 from itertools import combinations
 
 import numpy as np
@@ -42,6 +43,7 @@ from mitosheet.types import (
     FC_STRING_CONTAINS_CASE_INSENSITIVE,
 )
 from mitosheet.tests.test_utils import create_mito_wrapper_with_data, create_mito_wrapper
+from mitosheet.tests.decorators import pandas_post_1_5_only
 
 FILTER_TESTS = [
     (
@@ -601,7 +603,7 @@ def test_transpile_triple_filter():
     assert mito.transpiled_code == [
         'from mitosheet.public.v3 import *', 
         '',
-        "df1 = df1[(df1['name'].apply(lambda val: any(s in str(val) for s in ['e', 'a']))) | (df1['name'] == 'Nate')]",
+        "df1 = df1[(df1['name'].map(str).str.contains('e|a')) | (df1['name'] == 'Nate')]",
         '',
     ]
 
@@ -782,7 +784,7 @@ def test_wrap_lines_on_single_filters():
     assert mito.transpiled_code == [
         'from mitosheet.public.v3 import *', 
         '',
-        "df1 = df1[df1['name'].apply(lambda val: any(s in str(val) for s in ['A', 'A', 'A', 'A', 'A', 'A', 'A', 'A']))]",
+        "df1 = df1[df1['name'].map(str).str.contains('A|A|A|A|A|A|A|A')]",
         '',
     ]
 
@@ -879,7 +881,7 @@ def test_not_exactly_collapses_to_one_clause():
         'from mitosheet.public.v3 import *', 
         'import pandas as pd',
         '',
-        "df1 = df1[(~df1['A'].isin([1, 2])) & (df1['B'].apply(lambda val: all(val != s for s in ['C', 'D']))) & (~df1['C'].isin(pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[(~df1['A'].isin([1, 2])) & (~df1['B'].isin(['C', 'D'])) & (~df1['C'].isin(pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
         '',
     ]
 
@@ -958,7 +960,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: all(val > n for n in [1, 2]))]",
+        "df1 = df1[df1['A'] > max([1, 2])]",
     ),
     (
         pd.DataFrame({"A": [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
@@ -966,7 +968,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: any(val > n for n in [1, 2]))]",
+        "df1 = df1[df1['A'] > min([1, 2])]",
     ),
     (
         pd.DataFrame({"A": [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
@@ -974,7 +976,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: all(val >= n for n in [1, 2]))]",
+        "df1 = df1[df1['A'] >= max([1, 2])]",
     ),
     (
         pd.DataFrame({"A": [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
@@ -982,7 +984,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: any(val >= n for n in [1, 2]))]",
+        "df1 = df1[df1['A'] >= min([1, 2])]",
     ),
     (
         pd.DataFrame({"A": [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
@@ -990,7 +992,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: all(val == n for n in [1, 2]))]",
+        "df1 = df1[(df1['A'] == 1) & (df1['A'] == 2)]",
     ),
     (
         pd.DataFrame({"A": [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
@@ -1006,7 +1008,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: all(val < n for n in [1, 2]))]",
+        "df1 = df1[df1['A'] < min([1, 2])]",
     ),
     (
         pd.DataFrame({"A": [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
@@ -1014,7 +1016,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: any(val < n for n in [1, 2]))]",
+        "df1 = df1[df1['A'] < max([1, 2])]",
     ),
     (
         pd.DataFrame({"A": [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
@@ -1022,7 +1024,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: all(val <= n for n in [1, 2]))]",
+        "df1 = df1[df1['A'] <= min([1, 2])]",
     ),
     (
         pd.DataFrame({"A": [1, 2, 3, 4, 5, 6, 7, 8, 9]}),
@@ -1030,7 +1032,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         1,
         2,
-        "df1 = df1[df1['A'].apply(lambda val: any(val <= n for n in [1, 2]))]",
+        "df1 = df1[df1['A'] <= max([1, 2])]",
     ),
     (
         pd.DataFrame(data={"A": [1, 2, 3, 4, 5, 6]}),
@@ -1070,7 +1072,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         "1",
         "12",
-        "df1 = df1[df1['A'].apply(lambda val: all(str(val).startswith(s) for s in ['1', '12']))]",
+        "df1 = df1[(df1['A'].map(str).str.startswith('1')) & (df1['A'].map(str).str.startswith('12'))]",
     ),
     (
         pd.DataFrame({"A": ["123", "1334", "4567"]}),
@@ -1078,7 +1080,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         "1",
         "4",
-        "df1 = df1[df1['A'].apply(lambda val: any(str(val).startswith(s) for s in ['1', '4']))]",
+        "df1 = df1[df1['A'].map(str).str.startswith(('1', '4'))]",
     ),
     (
         pd.DataFrame({"A": ["123", "1334", "4567"]}),
@@ -1086,7 +1088,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         "1",
         "12",
-        "df1 = df1[df1['A'].apply(lambda val: all(str(val).endswith(s) for s in ['1', '12']))]",
+        "df1 = df1[(df1['A'].map(str).str.endswith('1')) & (df1['A'].map(str).str.endswith('12'))]",
     ),
     (
         pd.DataFrame({"A": ["123", "1334", "4567"]}),
@@ -1094,7 +1096,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         "1",
         "4",
-        "df1 = df1[df1['A'].apply(lambda val: any(str(val).endswith(s) for s in ['1', '4']))]",
+        "df1 = df1[df1['A'].map(str).str.endswith(('1', '4'))]",
     ),
     (
         pd.DataFrame({"A": ["aBcdef", "ABCdef", "def"]}),
@@ -1102,7 +1104,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         "ab",
         "bc",
-        "df1 = df1[df1['A'].apply(lambda val: any(s.upper() in str(val).upper() for s in ['ab', 'bc']))]",
+        "df1 = df1[df1['A'].map(str).str.upper().str.contains('AB|BC')]",
     ),
     (
         pd.DataFrame({"A": ["aBcdef", "ABCdEf", "def"]}),
@@ -1110,7 +1112,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         "abcd",
         "ef",
-        "df1 = df1[df1['A'].apply(lambda val: all(s.upper() in str(val).upper() for s in ['abcd', 'ef']))]",
+        "df1 = df1[(df1['A'].map(str).str.upper().str.contains('ABCD', regex=False)) & (df1['A'].map(str).str.upper().str.contains('EF', regex=False))]",
     ),
     (
         pd.DataFrame(
@@ -1134,7 +1136,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: all(val > d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[df1['A'] > max(pd.to_datetime(['11-13-2021', '11-14-2021']))]",
     ),
     (
         pd.DataFrame(
@@ -1158,7 +1160,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: any(val > d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[df1['A'] > min(pd.to_datetime(['11-13-2021', '11-14-2021']))]",
     ),
     (
         pd.DataFrame(
@@ -1182,7 +1184,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: all(val >= d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[df1['A'] >= max(pd.to_datetime(['11-13-2021', '11-14-2021']))]",
     ),
     (
         pd.DataFrame(
@@ -1206,7 +1208,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: any(val >= d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[df1['A'] >= min(pd.to_datetime(['11-13-2021', '11-14-2021']))]",
     ),
     (
         pd.DataFrame(
@@ -1230,7 +1232,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: all(val == d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[(df1['A'] == pd.to_datetime('11-13-2021')) & (df1['A'] == pd.to_datetime('11-14-2021'))]",
     ),
     (
         pd.DataFrame(
@@ -1278,7 +1280,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: all(val < d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[df1['A'] < min(pd.to_datetime(['11-13-2021', '11-14-2021']))]",
     ),
     (
         pd.DataFrame(
@@ -1302,7 +1304,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: any(val < d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[df1['A'] < max(pd.to_datetime(['11-13-2021', '11-14-2021']))]",
     ),
     (
         pd.DataFrame(
@@ -1326,7 +1328,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "And",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: all(val <= d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[df1['A'] <= min(pd.to_datetime(['11-13-2021', '11-14-2021']))]",
     ),
     (
         pd.DataFrame(
@@ -1350,7 +1352,7 @@ FILTER_TESTS_MULTIPLE_VALUES_PER_CONDITION = [
         "Or",
         "11-13-2021",
         "11-14-2021",
-        "df1 = df1[df1['A'].apply(lambda val: any(val <= d for d in pd.to_datetime(['11-13-2021', '11-14-2021'])))]",
+        "df1 = df1[df1['A'] <= max(pd.to_datetime(['11-13-2021', '11-14-2021']))]",
     ),
 ]
 
@@ -1385,6 +1387,55 @@ def test_filter_multiple_values_per_clause(
     ]
 
 
+NUMBER_DATA = [0.5, np.nan, 1, 2, 3, -1, None]
+STRING_DATA = ['nate', 'Nancy', None, np.nan, 'JAKE', 'aaron', 1, 'nan', 'a.b', '']
+DATETIME_DATA = pd.to_datetime(['11-12-2021', None, '11-13-2021', '11-14-2021', '11-15-2021'])
+
+# For each condition, the data, the values, and whether each value matches a cell,
+# which is how filters with multiple values were checked, one cell at a time
+FILTER_TESTS_MULTIPLE_VALUES_NAN_HANDLING = [
+    (FC_NUMBER_EXACTLY, NUMBER_DATA, [1, 1], lambda val, n: val == n),
+    (FC_NUMBER_EXACTLY, NUMBER_DATA, [1, 2], lambda val, n: val == n),
+    (FC_NUMBER_NOT_EXACTLY, NUMBER_DATA, [1, 2], lambda val, n: val != n),
+    (FC_NUMBER_NOT_EXACTLY, NUMBER_DATA, [1, 1], lambda val, n: val != n),
+    (FC_NUMBER_GREATER, NUMBER_DATA, [1, 2], lambda val, n: val > n),
+    (FC_NUMBER_GREATER_THAN_OR_EQUAL, NUMBER_DATA, [1, 2], lambda val, n: val >= n),
+    (FC_NUMBER_LESS, NUMBER_DATA, [1, 2.5], lambda val, n: val < n),
+    (FC_NUMBER_LESS_THAN_OR_EQUAL, NUMBER_DATA, [1, 2.5], lambda val, n: val <= n),
+    (FC_STRING_CONTAINS, STRING_DATA, ['na', 'a.'], lambda val, s: s in str(val)),
+    (FC_STRING_CONTAINS, STRING_DATA, ['a', ''], lambda val, s: s in str(val)),
+    (FC_STRING_DOES_NOT_CONTAIN, STRING_DATA, ['na', 'a'], lambda val, s: s not in str(val)),
+    (FC_STRING_EXACTLY, STRING_DATA, ['nate', 'nan'], lambda val, s: val == s),
+    (FC_STRING_NOT_EXACTLY, STRING_DATA, ['nate', 'nan'], lambda val, s: val != s),
+    (FC_STRING_STARTS_WITH, STRING_DATA, ['n', 'Na'], lambda val, s: str(val).startswith(s)),
+    (FC_STRING_ENDS_WITH, STRING_DATA, ['e', 'an'], lambda val, s: str(val).endswith(s)),
+    (FC_STRING_CONTAINS_CASE_INSENSITIVE, STRING_DATA, ['na', 'A.'], lambda val, s: s.upper() in str(val).upper()),
+    (FC_DATETIME_EXACTLY, DATETIME_DATA, ['11-13-2021', '11-14-2021'], lambda val, d: val == pd.to_datetime(d)),
+    (FC_DATETIME_NOT_EXACTLY, DATETIME_DATA, ['11-13-2021', '11-14-2021'], lambda val, d: val != pd.to_datetime(d)),
+    (FC_DATETIME_GREATER, DATETIME_DATA, ['11-13-2021', '11-14-2021'], lambda val, d: val > pd.to_datetime(d)),
+    (FC_DATETIME_GREATER_THAN_OR_EQUAL, DATETIME_DATA, ['11-13-2021', '11-14-2021'], lambda val, d: val >= pd.to_datetime(d)),
+    (FC_DATETIME_LESS, DATETIME_DATA, ['11-13-2021', '11-14-2021'], lambda val, d: val < pd.to_datetime(d)),
+    (FC_DATETIME_LESS_THAN_OR_EQUAL, DATETIME_DATA, ['11-13-2021', '11-14-2021'], lambda val, d: val <= pd.to_datetime(d)),
+]
+
+@pytest.mark.parametrize("operator", ["And", "Or"])
+@pytest.mark.parametrize("condition,data,values,matches", FILTER_TESTS_MULTIPLE_VALUES_NAN_HANDLING)
+def test_filter_multiple_values_matches_checking_each_cell(condition, data, values, matches, operator):
+    df = pd.DataFrame({"A": data})
+    mito = create_mito_wrapper(df)
+    mito.filters(
+        0,
+        "A",
+        operator,
+        [{"condition": condition, "value": value} for value in values],
+    )
+
+    reduce = all if operator == "And" else any
+    expected_df = df[df["A"].apply(lambda val: reduce(matches(val, value) for value in values))]
+    assert mito.dfs[0].equals(expected_df)
+    assert 'apply' not in mito.transpiled_code[-2]
+
+
 def test_filter_optimizes_out_after_delete():
     df = pd.DataFrame({"A": ["aaron", "jake", "jon", 1, 2, "nate"]})
     mito = create_mito_wrapper(df)
@@ -1430,3 +1481,80 @@ def test_filter_two_columns_combines_then_updates():
     mito.filters(0, "last", "And", [])
     mito.filters(0, "first", "And", [])
     assert mito.dfs[0].equals(pd.DataFrame({"first": ["Nate", "Jake", "ABC"], "last": ["Rush", "Jack", 'ABC']}))
+
+
+def test_filter_masks_cached_until_column_changes(monkeypatch):
+    from mitosheet.step_performers import filter as filter_step
+    
+    applied_filters = []
+    get_applied_filter = filter_step.get_applied_filter
+    def counting_get_applied_filter(df, column_header, filter_):
+        applied_filters.append(filter_)
+        return get_applied_filter(df, column_header, filter_)
+    monkeypatch.setattr(filter_step, 'get_applied_filter', counting_get_applied_filter)
+
+    df = pd.DataFrame({'A': [1, 1, 2, 4], 'B': ['a', 'b', 'c', 'd']})
+    filters = [{'condition': FC_NUMBER_GREATER, 'value': 2}, {'condition': FC_MOST_FREQUENT, 'value': 1}]
+
+    mask, _ = filter_step.get_full_applied_filter(df, 'A', 'Or', filters)
+    assert mask.tolist() == [True, True, False, True]
+    assert len(applied_filters) == 2
+
+    # Shallow copies, like the unmodified sheets of later steps, reuse the masks
+    shallow_df = df.copy(deep=False)
+    shallow_df['C'] = shallow_df['B']
+    cached_mask, _ = filter_step.get_full_applied_filter(shallow_df, 'A', 'Or', filters)
+    assert cached_mask.equals(mask)
+    assert len(applied_filters) == 2
+
+    # Changing the value, the type of the value, the rows, or the data recomputes the mask
+    filter_step.get_full_applied_filter(df, 'A', 'And', [{'condition': FC_NUMBER_GREATER, 'value': 3}])
+    filter_step.get_full_applied_filter(df, 'A', 'And', [{'condition': FC_NUMBER_GREATER, 'value': 2.0}])
+    filter_step.get_full_applied_filter(df.head(2), 'A', 'And', [{'condition': FC_NUMBER_GREATER, 'value': 2}])
+    mask, _ = filter_step.get_full_applied_filter(df.copy(deep=True), 'A', 'And', [{'condition': FC_NUMBER_GREATER, 'value': 2}])
+    assert mask.tolist() == [False, False, False, True]
+    assert len(applied_filters) == 6
+
+
+@pandas_post_1_5_only
+def test_filter_masks_cached_with_copy_on_write(monkeypatch):
+    from mitosheet.step_performers import filter as filter_step
+
+    applied_filters = []
+    get_applied_filter = filter_step.get_applied_filter
+    def counting_get_applied_filter(df, column_header, filter_):
+        applied_filters.append(filter_)
+        return get_applied_filter(df, column_header, filter_)
+    monkeypatch.setattr(filter_step, 'get_applied_filter', counting_get_applied_filter)
+
+    with pd.option_context('mode.copy_on_write', True):
+        df = pd.DataFrame({'A': [1, 1, 2, 4]})
+        filters = [{'condition': FC_NUMBER_GREATER, 'value': 2}]
+
+        # With copy on write, each access to the values of a column returns a new view
+        filter_step.get_full_applied_filter(df, 'A', 'And', filters)
+        mask, _ = filter_step.get_full_applied_filter(df.copy(deep=False), 'A', 'And', filters)
+        assert mask.tolist() == [False, False, False, True]
+        assert len(applied_filters) == 1
+
+        # Setting the column to new values recomputes the mask
+        df['A'] = [5, 1, 2, 4]
+        mask, _ = filter_step.get_full_applied_filter(df, 'A', 'And', filters)
+        assert mask.tolist() == [True, False, False, True]
+        assert len(applied_filters) == 2
+
+
+def test_filter_mask_cache_evicts_least_recently_used(monkeypatch):
+    from mitosheet.step_performers import filter as filter_step
+
+    monkeypatch.setattr(filter_step, 'filter_mask_cache', OrderedDict())
+    monkeypatch.setattr(filter_step, 'filter_mask_cache_bytes', 0)
+    monkeypatch.setattr(filter_step, 'MAX_FILTER_MASK_CACHE_BYTES', 250)
+
+    df = pd.DataFrame({'A': list(range(100))})
+    for value in range(5):
+        filter_step.get_cached_applied_filter(df, 'A', {'condition': FC_NUMBER_GREATER, 'value': value})
+
+    assert len(filter_step.filter_mask_cache) == 2
+    assert filter_step.filter_mask_cache_bytes == 200
+    assert [key[-1] for key in filter_step.filter_mask_cache.keys()] == ['3', '4']
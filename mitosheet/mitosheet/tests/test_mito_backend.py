@@ -15,6 +15,7 @@ from mitosheet.mito_backend import MitoBackend, get_mito_backend
 from mitosheet.tests.test_utils import create_mito_wrapper_with_data, create_mito_wrapper
 from mitosheet.transpiler.transpile import transpile
 from mitosheet.tests.decorators import pandas_post_1_only
+from mitosheet.types import FC_NUMBER_GREATER
 from mitosheet.utils import MAX_COLUMNS
 
 
@@ -201,4 +202,148 @@ def test_create_backend_default_apply_formula_to_column():
     mito_backend = MitoBackend()
     assert mito_backend.steps_manager.default_apply_formula_to_column == True
 
-    
\ No newline at end of file
+    
+
+def get_sheet_data_array_from_json_and_buffers(sheet_data_json, buffers):
+    """
+    Reads the sheet data the same way as getSheetDataArrayFromString on the frontend
+    """
+    sheet_data_array = json.loads(sheet_data_json)
+    for sheet_data in sheet_data_array:
+        buffer_offset = sheet_data.pop('bufferOffset')
+        for column_data in sheet_data['data']:
+            column_data_buffer = column_data.pop('columnDataBuffer', None)
+            if column_data_buffer is None:
+                continue
+
+            buffer = buffers[buffer_offset + column_data_buffer['index']]
+            if column_data_buffer['dtype'] == 'bool':
+                column_data['columnData'] = [value == 1 for value in np.frombuffer(buffer, dtype='<u1')]
+            else:
+                column_data['columnData'] = ['NaN' if np.isnan(value) else value for value in np.frombuffer(buffer, dtype='<f8').tolist()]
+    return sheet_data_array
+
+BINARY_SHEET_DATA_DATAFRAMES = [
+    pd.DataFrame(),
+    pd.DataFrame({'A': [1, 2, 3]}),
+    pd.DataFrame({'A': [1.5, np.nan, np.inf, -np.inf, -0.25]}),
+    pd.DataFrame({'A': [True, False, True], 'B': ['a', 'b', None]}),
+    pd.DataFrame({'A': [1, 2, 3], 'B': pd.to_datetime(['2020-01-01', '2020-01-02', None]), 'C': [1.0, 2.0, 3.0]}),
+    pd.DataFrame({'A': pd.Series([1, None, 3], dtype='Int64'), 'B': pd.to_timedelta([1, 2, 3], unit='d')}),
+    pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}, index=pd.to_datetime(['2020-01-01', '2020-01-02', '2020-01-03'])),
+    pd.DataFrame({i: pd.Series([i, 2, 3]) if i % 2 == 0 else pd.Series(['a', 'b', 'c']) for i in range(MAX_COLUMNS + 10)}),
+]
+
+@pytest.mark.parametrize("df", BINARY_SHEET_DATA_DATAFRAMES)
+def test_binary_sheet_data_matches_json_sheet_data(df):
+    mito = create_mito_wrapper(df, df.copy())
+    sheet_data_json, buffers = mito.mito_backend.steps_manager.get_sheet_data_json_and_buffers()
+    assert get_sheet_data_array_from_json_and_buffers(sheet_data_json, buffers) == json.loads(mito.sheet_data_json)
+
+def test_binary_sheet_data_updates_modified_sheets():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [4.0, 5.0, 6.0]}))
+    mito.mito_backend.steps_manager.get_sheet_data_json_and_buffers()
+
+    mito.set_formula('=A + 1', 0, 'C', add_column=True)
+    sheet_data_json, buffers = mito.mito_backend.steps_manager.get_sheet_data_json_and_buffers()
+    sheet_data_array = get_sheet_data_array_from_json_and_buffers(sheet_data_json, buffers)
+    assert len(buffers) == 3
+    assert sheet_data_array[0]['data'][1]['columnData'] == [2, 3, 4]
+    assert sheet_data_array == json.loads(mito.sheet_data_json)
+
+def test_binary_sheet_data_does_not_round_floats():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1/3]}))
+    sheet_data_json, buffers = mito.mito_backend.steps_manager.get_sheet_data_json_and_buffers()
+    assert get_sheet_data_array_from_json_and_buffers(sheet_data_json, buffers)[0]['data'][0]['columnData'] == [1/3]
+
+def test_sheet_data_resent_when_earlier_steps_are_re_executed():
+    mito = create_mito_wrapper_with_data([1, 2, 3], [1, 2, 3])
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.set_formula('=VLOOKUP(A, df1!A:A, 1)', 1, 'B', add_column=True)
+    mito.mito_backend.steps_manager.get_sheet_data_json_and_buffers()
+
+    # The new filter skips the first filter, so the formula in the second sheet is re-executed
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+    sheet_data_json, buffers = mito.mito_backend.steps_manager.get_sheet_data_json_and_buffers()
+    assert get_sheet_data_array_from_json_and_buffers(sheet_data_json, buffers)[1]['data'][1]['columnData'] == [1, 2, 3]
+
+def test_send_response_with_binary_sheet_data():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3], 'B': ['a', 'b', 'c']}))
+    sent_messages = []
+    mito.mito_backend.mito_send = lambda message, buffers=None: sent_messages.append((message, buffers))
+
+    mito.mito_backend.send_response_with_shared_state_variables('123')
+    message, buffers = sent_messages[-1]
+    assert buffers is None
+    assert 'columnDataBuffer' not in message['shared_variables']['sheet_data_json']
+
+    mito.mito_backend.use_binary_sheet_data = True
+    mito.mito_backend.send_response_with_shared_state_variables('123')
+    message, buffers = sent_messages[-1]
+    assert len(buffers) == 1
+    assert get_sheet_data_array_from_json_and_buffers(message['shared_variables']['sheet_data_json'], buffers) == json.loads(mito.sheet_data_json)
+
+def apply_sheet_data_delta(sheet_data_delta_json, buffers, previous_sheet_data_array):
+    """
+    Applies the sheet data delta the same way as getSheetDataArrayFromDeltaString on the frontend
+    """
+    sheet_data_delta = json.loads(sheet_data_delta_json)
+    changed_sheet_data_array = [sheet_data for sheet_data in sheet_data_delta['sheetDataArray'] if sheet_data is not None]
+    if buffers is not None:
+        changed_sheet_data_array = get_sheet_data_array_from_json_and_buffers(json.dumps(changed_sheet_data_array), buffers)
+    changed_sheet_data_array.reverse()
+    return [
+        changed_sheet_data_array.pop() if sheet_data is not None else previous_sheet_data_array[sheet_index]
+        for sheet_index, sheet_data in enumerate(sheet_data_delta['sheetDataArray'])
+    ]
+
+def test_sheet_data_json_only_serializes_modified_sheets():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [4, 5, 6]}))
+    steps_manager = mito.mito_backend.steps_manager
+    steps_manager.sheet_data_json
+    sheet_data_json_fragments = steps_manager.saved_sheet_data_json_fragments
+    sheet_data_versions = steps_manager.saved_sheet_data_versions
+
+    mito.add_column(0, 'C')
+    assert steps_manager.saved_sheet_data_json_fragments[1] is sheet_data_json_fragments[1]
+    assert steps_manager.saved_sheet_data_versions[1] == sheet_data_versions[1]
+    assert steps_manager.saved_sheet_data_versions[0] != sheet_data_versions[0]
+    assert steps_manager.sheet_data_json == json.dumps(steps_manager.saved_sheet_data)
+
+@pytest.mark.parametrize("use_binary_sheet_data", [True, False])
+def test_send_response_with_sheet_data_delta(use_binary_sheet_data):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [4.0, 5.0, 6.0]}))
+    sent_messages = []
+    mito.mito_backend.mito_send = lambda message, buffers=None: sent_messages.append((message, buffers))
+    mito.mito_backend.use_binary_sheet_data = use_binary_sheet_data
+    mito.mito_backend.use_sheet_data_delta = True
+
+    sheet_data_array = []
+    def apply_sent_messages():
+        nonlocal sheet_data_array
+        sheet_data_deltas = []
+        for message, buffers in sent_messages:
+            assert 'sheet_data_json' not in message['shared_variables']
+            sheet_data_delta_json = message['shared_variables']['sheet_data_delta_json']
+            sheet_data_array = apply_sheet_data_delta(sheet_data_delta_json, buffers, sheet_data_array)
+            sheet_data_deltas.append(json.loads(sheet_data_delta_json))
+        sent_messages.clear()
+        assert sheet_data_array == json.loads(mito.sheet_data_json)
+        return sheet_data_deltas
+
+    mito.mito_backend.send_response_with_shared_state_variables('1')
+    sheet_data_deltas = apply_sent_messages()
+    assert all(sheet_data is not None for sheet_data in sheet_data_deltas[0]['sheetDataArray'])
+
+    mito.add_column(1, 'C')
+    sheet_data_deltas = apply_sent_messages()
+    assert sheet_data_deltas[0]['sheetDataArray'][0] is None
+    assert sheet_data_deltas[0]['sheetDataArray'][1] is not None
+
+    # Resending without any changes sends no sheets
+    mito.mito_backend.send_response_with_shared_state_variables('2')
+    sheet_data_deltas = apply_sent_messages()
+    assert sheet_data_deltas[0]['sheetDataArray'] == [None, None]
+
+    mito.delete_dataframe(0)
+    apply_sent_messages()
@@ -34,6 +34,12 @@ from mitosheet.enterprise.mito_config import (
     MITO_CONFIG_FEATURE_DISPLAY_CODE_OPTIONS,
     MITO_CONFIG_FEATURE_TELEMETRY,
     MITO_CONFIG_PRO,
+    MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL,
+    MITO_CONFIG_STEP_STATES_KEEP_LAST,
+    MITO_CONFIG_STEP_STATES_MAX_BYTES,
+    MITO_CONFIG_IMPORT_CACHE_MAX_BYTES,
+    DEFAULT_MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL,
+    DEFAULT_MITO_CONFIG_STEP_STATES_KEEP_LAST,
     MitoConfig
 )
 from mitosheet.tests.test_utils import create_mito_wrapper
@@ -336,4 +342,37 @@ def test_mito_config_log_server_url():
 
     delete_all_mito_config_environment_variables()
 
+def test_mito_config_step_states():
+    delete_all_mito_config_environment_variables()
+
+    mito_config = MitoConfig()
+    assert mito_config.step_states_max_bytes is None
+    assert mito_config.step_states_checkpoint_interval == DEFAULT_MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL
+    assert mito_config.step_states_keep_last == DEFAULT_MITO_CONFIG_STEP_STATES_KEEP_LAST
+
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_STEP_STATES_MAX_BYTES] = "1000000"
+    os.environ[MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL] = "5"
+    os.environ[MITO_CONFIG_STEP_STATES_KEEP_LAST] = "2"
+
+    mito_config = MitoConfig()
+    assert mito_config.step_states_max_bytes == 1000000
+    assert mito_config.step_states_checkpoint_interval == 5
+    assert mito_config.step_states_keep_last == 2
+
+    delete_all_mito_config_environment_variables()
+
 
+def test_import_cache_max_bytes():
+    delete_all_mito_config_environment_variables()
+
+    mito_config = MitoConfig()
+    assert mito_config.import_cache_max_bytes is None
+
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_IMPORT_CACHE_MAX_BYTES] = "1000000"
+
+    mito_config = MitoConfig()
+    assert mito_config.import_cache_max_bytes == 1000000
+
+    delete_all_mito_config_environment_variables()
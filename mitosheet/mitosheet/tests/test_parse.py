@@ -10,7 +10,7 @@ import pytest
 import pandas as pd
 
 from mitosheet.errors import MitoError
-from mitosheet.parser import get_backend_formula_from_frontend_formula, parse_formula, safe_contains, get_frontend_formula
+from mitosheet.parser import clear_parse_formula_cache, get_backend_formula_from_frontend_formula, get_parse_formula_cache_info, parse_formula, safe_contains, get_frontend_formula
 from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE, FORMULA_SPECIFIC_INDEX_LABELS_TYPE
 from mitosheet.tests.decorators import pandas_post_1_2_only
 
@@ -1448,4 +1448,94 @@ def test_get_frontend_formula_reconstucts_properly(formula,column_header,formula
 @pytest.mark.parametrize("formula,column_header,formula_label,dfs,df_names,sheet_index,python_code,functions,columns", VLOOKUP_TESTS)
 def test_get_cross_sheet_frontend_formula_reconstucts_properly(formula,column_header,formula_label,dfs,df_names,sheet_index,python_code,functions,columns):
     frontend_formula = get_frontend_formula(formula, formula_label, dfs, df_names, sheet_index)
-    assert get_backend_formula_from_frontend_formula(frontend_formula, formula_label, dfs[sheet_index]) == formula
\ No newline at end of file
+    assert get_backend_formula_from_frontend_formula(frontend_formula, formula_label, dfs[sheet_index]) == formula
+
+def test_parse_formula_cache_hits_for_same_formula_and_schema():
+    clear_parse_formula_cache()
+    df = pd.DataFrame(get_number_data_for_df(['A', 'B'], 2))
+
+    result = parse_formula('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [df], ['df'], 0)
+    assert get_parse_formula_cache_info() == {'hits': 0, 'misses': 1, 'size': 1}
+
+    # A different dataframe with the same schema hits the cache
+    other_df = pd.DataFrame(get_number_data_for_df(['A', 'B'], 2))
+    assert parse_formula('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [other_df], ['df'], 0) == result
+    assert get_parse_formula_cache_info() == {'hits': 1, 'misses': 1, 'size': 1}
+
+
+def test_parse_formula_cache_returns_copies_of_dependencies():
+    clear_parse_formula_cache()
+    df = pd.DataFrame(get_number_data_for_df(['A', 'B'], 2))
+
+    _, functions, column_header_dependencies, _ = parse_formula('=SUM(A, B)', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [df], ['df'], 0)
+    functions.add('AVG')
+    column_header_dependencies.add('C')
+
+    _, functions, column_header_dependencies, _ = parse_formula('=SUM(A, B)', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [df], ['df'], 0)
+    assert functions == {'SUM'}
+    assert column_header_dependencies == {'A', 'B'}
+
+
+PARSE_FORMULA_CACHE_MISS_TESTS = [
+    # Different formula
+    ('=A + A', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4]})], ['df']),
+    # Different column header
+    ('=A + B', 'D', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4]})], ['df']),
+    # Different column headers in the sheet
+    ('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4], 'C': [5, 6]})], ['df']),
+    # Different dtypes in the sheet
+    ('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1.0, 2.0], 'B': [3, 4]})], ['df']),
+    # Different index
+    ('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4]}, index=['a', 'b'])], ['df']),
+    # Different df names
+    ('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4]})], ['df1']),
+    # Different index labels the formula is applied to
+    ('=A + B', 'C', 0, {'type': FORMULA_SPECIFIC_INDEX_LABELS_TYPE, 'index_labels': [0]}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4]})], ['df']),
+    # Different formula label with the same value
+    ('=A + B', 'C', True, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4]})], ['df']),
+    # Different other sheets
+    ('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4]}), pd.DataFrame({'D': [1]})], ['df', 'df2']),
+]
+@pytest.mark.parametrize("formula, column_header, formula_label, index_labels_formula_is_applied_to, dfs, df_names", PARSE_FORMULA_CACHE_MISS_TESTS)
+def test_parse_formula_cache_misses_when_inputs_change(formula, column_header, formula_label, index_labels_formula_is_applied_to, dfs, df_names):
+    clear_parse_formula_cache()
+    parse_formula('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [pd.DataFrame({'A': [1, 2], 'B': [3, 4]})], ['df'], 0)
+
+    result = parse_formula(formula, column_header, formula_label, index_labels_formula_is_applied_to, dfs, df_names, 0)
+    assert get_parse_formula_cache_info()['misses'] == 2
+    assert get_parse_formula_cache_info()['hits'] == 0
+    
+    clear_parse_formula_cache()
+    assert parse_formula(formula, column_header, formula_label, index_labels_formula_is_applied_to, dfs, df_names, 0) == result
+
+
+def test_parse_formula_does_not_cache_errors():
+    clear_parse_formula_cache()
+    df = pd.DataFrame(get_number_data_for_df(['A', 'B'], 2))
+
+    for _ in range(2):
+        with pytest.raises(MitoError):
+            parse_formula('=SUM(A', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [df], ['df'], 0)
+    
+    assert get_parse_formula_cache_info() == {'hits': 0, 'misses': 2, 'size': 0}
+
+
+def test_parse_formula_cache_hashes_each_index_once(monkeypatch):
+    hashed_objects = []
+    hash_pandas_object = pd.util.hash_pandas_object
+    def counting_hash_pandas_object(obj, *args, **kwargs):
+        hashed_objects.append(obj)
+        return hash_pandas_object(obj, *args, **kwargs)
+    monkeypatch.setattr(pd.util, 'hash_pandas_object', counting_hash_pandas_object)
+
+    clear_parse_formula_cache()
+    df = pd.DataFrame({'A': [1, 2], 'B': [3, 4]}, index=['a', 'b'])
+    parse_formula('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [df], ['df'], 0)
+    parse_formula('=A - B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [df], ['df'], 0)
+    assert len(hashed_objects) == 1
+    
+    # An index with the same labels stored elsewhere is hashed, and hits the cache
+    other_df = pd.DataFrame({'A': [1, 2], 'B': [3, 4]}, index=['a', 'b'])
+    parse_formula('=A + B', 'C', 0, {'type': FORMULA_ENTIRE_COLUMN_TYPE}, [other_df], ['df'], 0)
+    assert len(hashed_objects) == 2
+    assert get_parse_formula_cache_info()['hits'] == 1
@@ -8,6 +8,8 @@ Contains tests for the state class
 """
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, DATAFRAME_SOURCE_PASSED, State
 import pandas as pd
+from mitosheet.tests.decorators import pandas_post_1_5_only
+from mitosheet.utils import is_copy_on_write_enabled
 
 def test_state_can_add_df_to_end():
     df = pd.DataFrame({'A': [123]})
@@ -29,3 +31,71 @@ def test_state_can_add_df_to_middle():
     
     assert state.df_sources == [DATAFRAME_SOURCE_IMPORTED]
 
+
+def test_state_copy_deep_copies_metadata_by_default():
+    df1 = pd.DataFrame({'A': [123]})
+    df2 = pd.DataFrame({'B': [456]})
+    state = State([df1, df2], 3)
+    new_state = state.copy(deep_sheet_indexes=[0])
+
+    assert new_state.column_formulas[1] is not state.column_formulas[1]
+    assert new_state.column_filters[1] is not state.column_filters[1]
+    assert new_state.df_formats[1] is not state.df_formats[1]
+    assert new_state.column_ids.column_id_to_column_header[1] is not state.column_ids.column_id_to_column_header[1]
+
+def test_state_copy_shares_unmodified_metadata():
+    df1 = pd.DataFrame({'A': [123]})
+    df2 = pd.DataFrame({'B': [456]})
+    state = State([df1, df2], 3, graph_data_array=[{'graph_id': '1', 'graph_tab_name': 'graph'}])
+    new_state = state.copy(deep_sheet_indexes=[0], share_unmodified_metadata=True)
+
+    # The unmodified sheet is shared
+    assert new_state.column_formulas[1] is state.column_formulas[1]
+    assert new_state.column_filters[1] is state.column_filters[1]
+    assert new_state.df_formats[1] is state.df_formats[1]
+    assert new_state.column_ids.column_id_to_column_header[1] is state.column_ids.column_id_to_column_header[1]
+    assert new_state.graph_data_array[0] is state.graph_data_array[0]
+
+    # While the modified sheet is not
+    assert new_state.column_formulas[0] is not state.column_formulas[0]
+    assert new_state.column_filters[0] is not state.column_filters[0]
+    assert new_state.df_formats[0] is not state.df_formats[0]
+    assert new_state.column_ids.column_id_to_column_header[0] is not state.column_ids.column_id_to_column_header[0]
+
+    # And changing the modified sheet or the lists does not change the original state
+    new_state.column_ids.add_column_header(0, 'C')
+    new_state.column_formulas[0]['C'] = []
+    new_state.add_df_to_state(pd.DataFrame({'D': [789]}), DATAFRAME_SOURCE_IMPORTED)
+    new_state.df_names[0] = 'new_name'
+    assert state.column_ids.get_column_headers(0) == ['A']
+    assert state.column_formulas == [{'A': []}, {'B': []}]
+    assert len(state.dfs) == 2
+    assert state.df_names == ['df1', 'df2']
+
+def test_state_retained_bytes():
+    df1 = pd.DataFrame({'A': [1, 2, 3]})
+    df2 = pd.DataFrame({'B': [4.0, 5.0, 6.0]})
+    state = State([df1, df2], 3)
+
+    assert state.get_retained_bytes() == 48
+
+    # With copy on write, the modified sheets are only copied once they are changed
+    new_state = state.copy(deep_sheet_indexes=[1])
+    assert new_state.get_retained_bytes(state) == (0 if is_copy_on_write_enabled() else 24)
+
+    new_state = state.copy()
+    assert new_state.get_retained_bytes(state) == 0
+
+
+@pandas_post_1_5_only
+def test_state_retained_bytes_with_copy_on_write():
+    with pd.option_context('mode.copy_on_write', True):
+        state = State([pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [4.0, 5.0, 6.0]})], 3)
+
+        new_state = state.copy(deep_sheet_indexes=[1])
+        assert new_state.get_retained_bytes(state) == 0
+
+        # Changing the modified sheet copies the changed column
+        new_state.dfs[1].loc[0, 'B'] = 7.0
+        assert new_state.get_retained_bytes(state) == 24
+        assert state.dfs[1]['B'].tolist() == [4.0, 5.0, 6.0]
@@ -3,15 +3,23 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import os
+import numpy as np
 import pandas as pd
 import pytest
-from mitosheet.enterprise.mito_config import MitoConfig
-from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE
+from mitosheet.enterprise.mito_config import (
+    MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL, MITO_CONFIG_STEP_STATES_KEEP_LAST,
+    MITO_CONFIG_STEP_STATES_MAX_BYTES, MITO_CONFIG_VERSION, MitoConfig
+)
+from mitosheet.types import FC_NUMBER_GREATER, FORMULA_ENTIRE_COLUMN_TYPE
 
 from mitosheet.utils import get_new_id
 from mitosheet.errors import MitoError
 from mitosheet.steps_manager import StepsManager
-from mitosheet.tests.test_utils import create_mito_wrapper_with_data
+from mitosheet.tests.test_mito_config import delete_all_mito_config_environment_variables
+from mitosheet.mito_backend import get_mito_backend
+from mitosheet.tests.test_utils import create_mito_wrapper, create_mito_wrapper_with_data
+from mitosheet.tests.decorators import copy_on_write_disabled_only, pandas_post_1_5_only
 from mitosheet.column_headers import get_column_header_id
 
 
@@ -104,3 +112,170 @@ def test_failed_overwrite_rolls_back_to_previous_state():
     assert mito.dfs[0].equals(pd.DataFrame(data={'A': [1, 2, 3], 'B': [0, 0, 0]}))
 
 
+
+
+def test_steps_manager_retained_bytes_by_step():
+    mito = create_mito_wrapper_with_data([1, 2, 3], [4, 5, 6])
+    mito.add_column(0, 'B')
+    mito.rename_dataframe(1, 'new_name')
+
+    retained_bytes = mito.mito_backend.steps_manager.get_retained_bytes_by_step()
+    assert len(retained_bytes) == 3
+    assert retained_bytes[0] == 48
+    # Adding a column copies only the first sheet
+    assert 0 < retained_bytes[1] <= 48
+    # Renaming a dataframe does not copy any data
+    assert retained_bytes[2] == 0
+
+
+def do_step_state_release_test_steps(mito):
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    mito.set_formula('=B1', 0, 'C', add_column=True)
+    mito.set_formula('=C * 2', 0, 'D', add_column=True)
+    mito.rename_dataframe(0, 'new_name')
+
+
+def test_release_step_states_recomputes_released_states():
+    mito = create_mito_wrapper_with_data([1, 2, 3])
+    mito_without_release = create_mito_wrapper_with_data([1, 2, 3])
+
+    os.environ[MITO_CONFIG_VERSION] = '2'
+    os.environ[MITO_CONFIG_STEP_STATES_MAX_BYTES] = '0'
+    os.environ[MITO_CONFIG_STEP_STATES_CHECKPOINT_INTERVAL] = '4'
+    os.environ[MITO_CONFIG_STEP_STATES_KEEP_LAST] = '1'
+    mito.mito_backend.steps_manager.mito_config = MitoConfig()
+    delete_all_mito_config_environment_variables()
+
+    do_step_state_release_test_steps(mito)
+    do_step_state_release_test_steps(mito_without_release)
+
+    # Only the initialize step, the checkpoint and the last step keep their state
+    released = [step.post_state.dataframes_released for step in mito.steps_including_skipped]
+    assert released == [False, True, True, True, False, True, True, False]
+    assert mito.transpiled_code == mito_without_release.transpiled_code
+    assert [step_summary['step_description'] for step_summary in mito.mito_backend.steps_manager.step_summary_list] == \
+        [step_summary['step_description'] for step_summary in mito_without_release.mito_backend.steps_manager.step_summary_list]
+
+    mito.checkout_step_by_idx(6)
+    mito_without_release.checkout_step_by_idx(6)
+    assert mito.dfs[0].equals(mito_without_release.dfs[0])
+    assert not mito.steps_including_skipped[5].post_state.dataframes_released
+
+    mito.checkout_step_by_idx(-1)
+    mito.undo()
+    mito.undo()
+    mito_without_release.checkout_step_by_idx(-1)
+    mito_without_release.undo()
+    mito_without_release.undo()
+    assert mito.dfs[0].equals(mito_without_release.dfs[0])
+    assert mito.transpiled_code == mito_without_release.transpiled_code
+
+
+def test_release_step_states_does_nothing_by_default():
+    mito = create_mito_wrapper_with_data([1, 2, 3])
+    do_step_state_release_test_steps(mito)
+    assert not any(step.post_state.dataframes_released for step in mito.steps_including_skipped)
+
+
+def test_overwriting_step_reuses_steps_on_other_sheets():
+    mito = create_mito_wrapper_with_data([1, 2, 3], [4, 5, 6])
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.set_formula('=A + 1', 1, 'B', add_column=True)
+    mito.set_formula('=A * 2', 0, 'C', add_column=True)
+    mito.rename_column(1, 'B', 'D')
+
+    # Replaces the first filter, so the steps on the first sheet are re-executed
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+
+    assert mito.mito_backend.steps_manager.num_reused_steps == 3
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [3], 'C': [6]}, index=[2]))
+    assert mito.dfs[1].equals(pd.DataFrame({'A': [4, 5, 6], 'D': [5, 6, 7]}))
+    assert mito.transpiled_code == [
+        'from mitosheet.public.v3 import *',
+        '',
+        "df2['D'] = df2['A'] + 1",
+        '',
+        "df1['C'] = df1['A'] * 2",
+        '',
+        "df1 = df1[df1['A'] > 2]",
+        '',
+    ]
+
+
+def test_overwriting_step_re_executes_steps_that_read_changed_sheets():
+    mito = create_mito_wrapper_with_data([1, 2, 3], [1, 2, 3])
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.set_formula('=VLOOKUP(A, df1!A:A, 1)', 1, 'B', add_column=True)
+
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+
+    # Adding the column is reused, but the formula reads from the first sheet, which
+    # is no longer filtered when the formula is applied
+    assert mito.mito_backend.steps_manager.num_reused_steps == 1
+    assert mito.dfs[1]['B'].tolist() == [1, 2, 3]
+
+
+def test_undo_to_step_index_reuses_all_steps():
+    mito = create_mito_wrapper_with_data([1, 2, 3])
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    mito.set_formula('=B + 1', 0, 'C', add_column=True)
+    mito.add_column(0, 'D')
+
+    mito.undo_to_step_index(4)
+
+    assert mito.mito_backend.steps_manager.num_reused_steps == 4
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4], 'C': [3, 4, 5]}))
+
+
+def test_copy_dataframes_false_shares_input_dataframes():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
+    mito = create_mito_wrapper(mito_backend=get_mito_backend(df, copy_dataframes=False))
+    initial_df = mito.mito_backend.steps_manager.steps_including_skipped[0].dfs[0]
+    assert np.shares_memory(initial_df['A'].values, df['A'].values)
+
+    mito.set_formula('=A + 1', 0, 'A')
+
+    # Modifying the sheet copies it, rather than changing the passed dataframe
+    assert df.equals(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}))
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [2, 3, 4], 'B': [4, 5, 6]}))
+    assert not np.shares_memory(mito.dfs[0]['A'].values, df['A'].values)
+
+
+def test_copy_dataframes_by_default():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+    assert not np.shares_memory(mito.dfs[0]['A'].values, df['A'].values)
+    assert mito.mito_backend.steps_manager.input_dataframe_fingerprints == []
+
+
+@pandas_post_1_5_only
+def test_copy_dataframes_false_does_not_fingerprint_with_copy_on_write():
+    with pd.option_context('mode.copy_on_write', True):
+        df = pd.DataFrame({'A': [1, 2, 3]})
+        mito = create_mito_wrapper(mito_backend=get_mito_backend(df, copy_dataframes=False))
+        assert mito.mito_backend.steps_manager.input_dataframe_fingerprints == []
+
+        # Changes to the passed dataframe don't change the sheet
+        df.loc[1, 'A'] = 100
+        mito.add_column(0, 'B')
+        assert mito.dfs[0]['A'].tolist() == [1, 2, 3]
+
+
+@copy_on_write_disabled_only
+def test_copy_dataframes_false_errors_if_input_dataframe_changed():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(mito_backend=get_mito_backend(df, copy_dataframes=False))
+    mito.add_column(0, 'B')
+
+    df.loc[1, 'A'] = 100
+
+    with pytest.raises(MitoError) as e:
+        mito.mito_backend.steps_manager.handle_edit_event({
+            'event': 'edit_event',
+            'id': get_new_id(),
+            'type': 'add_column_edit',
+            'step_id': get_new_id(),
+            'params': {'sheet_index': 0, 'column_header': 'C', 'column_header_index': -1}
+        })
+    assert e.value.type_ == 'input_dataframe_changed_error'
+    assert len(mito.mito_backend.steps_manager.steps_including_skipped) == 2
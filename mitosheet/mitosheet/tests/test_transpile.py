@@ -5,11 +5,12 @@
 # Distributed under the terms of the GPL License.
 import os
 from mitosheet.step_performers.graph_steps.graph_utils import BAR
-from mitosheet.transpiler.transpile_utils import NEWLINE_TAB, TAB, NEWLINE
+from mitosheet.transpiler.transpile_utils import NEWLINE_TAB, TAB, NEWLINE, compiled_code_cache, get_compiled_code
 import pytest
 import pandas as pd
 
 from mitosheet.api.get_parameterizable_params import get_parameterizable_params
+from mitosheet.code_chunks.code_chunk_utils import CodeChunksCache, get_code_chunks
 from mitosheet.transpiler.transpile import transpile
 from mitosheet.tests.test_utils import create_mito_wrapper_with_data, create_mito_wrapper
 from mitosheet.tests.decorators import pandas_post_1_2_only, python_post_3_6_only
@@ -1306,4 +1307,63 @@ def test_does_not_reorder_around_empty_code_chunk():
     mito.delete_columns(0, ['A', 'B'])
     result = mito.generate_graph('test', BAR, 0, False, ['C'], [], '400', '400')
     assert result
-    assert mito.dfs[0].equals(pd.DataFrame({'C': [3], 'D': [0]}))
\ No newline at end of file
+    assert mito.dfs[0].equals(pd.DataFrame({'C': [3], 'D': [0]}))
+
+def test_get_compiled_code_reuses_code_objects():
+    code = "df = pd.DataFrame({'A': [1]})\ndf['B'] = df['A'] + 1"
+    assert get_compiled_code(code) is get_compiled_code(code)
+    assert get_compiled_code(code) is not get_compiled_code(code + '\n')
+
+
+def test_get_compiled_code_does_not_cache_syntax_errors():
+    with pytest.raises(SyntaxError):
+        get_compiled_code('df[')
+    assert 'df[' not in compiled_code_cache
+
+
+def test_formula_steps_reuse_compiled_code_on_replay():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    mito = create_mito_wrapper(df)
+    mito.set_formula('=A + 100', 0, 'B', add_column=True)
+    mito.set_formula('=B + 100', 0, 'C', add_column=True)
+
+    formula_code = [code for code in compiled_code_cache if "df1['C'] = df1['B'] + 100" in code]
+    compiled_formula_code = [compiled_code_cache[code] for code in formula_code]
+    assert len(formula_code) > 0
+
+    # Undoing a clear replays all the steps
+    mito.clear()
+    mito.undo()
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [101, 102, 103], 'C': [201, 202, 203]}))
+    assert [compiled_code_cache[code] for code in formula_code] == compiled_formula_code
+
+
+def test_code_chunks_cache_only_transpiles_new_steps():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    steps_manager = mito.mito_backend.steps_manager
+    code_chunks_cache = steps_manager.code_chunks_cache
+    step_code_chunks = {step_id: code_chunks for step_id, (_, code_chunks) in code_chunks_cache.step_code_chunks.items()}
+
+    mito.set_formula('=A + 2', 0, 'C', add_column=True)
+
+    for step_id, code_chunks in step_code_chunks.items():
+        assert code_chunks_cache.step_code_chunks[step_id][1] is code_chunks
+
+
+def test_code_chunks_cache_same_code_as_transpiling_all_steps():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B')
+    mito.rename_column(0, 'B', 'C')
+    mito.set_formula('=A + 2', 0, 'C')
+    mito.undo()
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.delete_columns(0, ['C'])
+
+    steps_manager = mito.mito_backend.steps_manager
+    for steps in [steps_manager.steps_including_skipped, steps_manager.steps_including_skipped[:3]]:
+        cached_code_chunks = get_code_chunks(steps, code_chunks_cache=steps_manager.code_chunks_cache)
+        code_chunks = get_code_chunks(steps, code_chunks_cache=CodeChunksCache())
+        assert [code_chunk.get_code() for code_chunk in cached_code_chunks] == [code_chunk.get_code() for code_chunk in code_chunks]
+
@@ -1376,7 +1376,6 @@ class MitoWidgetTestWrapper:
             },
             'graph_styling': {
                 'title': {
-                    'title': title_title,
                     'visible': title_visible,
                     'title_font_color': title_font_color
                 },
@@ -1418,6 +1417,9 @@ class MitoWidgetTestWrapper:
         # We add these params because when they the backend castst them to a number. The backend doesn't handle the None case because
         # none params are filtered out. 
         # Instead of handing the None case specifically for the tests, we keep our code simple by mocking the filtering out of None.
+        if title_title is not None:
+            params['graph_styling']['title']['title'] = title_title
+
         if facet_col_wrap is not None:
             params['graph_creation']['facet_col_wrap'] = facet_col_wrap
 
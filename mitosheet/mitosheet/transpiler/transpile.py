@@ -62,7 +62,7 @@ def transpile(
         imports_code.extend(preprocess_imports)
 
     # We only transpile up to the currently checked out step
-    all_code_chunks: List[CodeChunk] = get_code_chunks(steps_manager.steps_including_skipped[:steps_manager.curr_step_idx + 1], optimize=optimize)
+    all_code_chunks: List[CodeChunk] = get_code_chunks(steps_manager.steps_including_skipped[:steps_manager.curr_step_idx + 1], optimize=optimize, code_chunks_cache=steps_manager.code_chunks_cache)
 
     # We also make sure to include all the post_processing code chunks, which are those
     # code chunks that are always at the end of the dataframe
@@ -70,9 +70,8 @@ def transpile(
         all_code_chunks.append(postprocessing_code_chunk(steps_manager.curr_step.initial_defined_state, steps_manager.curr_step.final_defined_state))
 
     for code_chunk in all_code_chunks:
-        comment = '# ' + code_chunk.get_description_comment().strip().replace('\n', '\n# ')
-        (gotten_code, code_chunk_imports) = code_chunk.get_code()
-        (optional_code, optional_code_imports) = code_chunk.get_optional_code_that_successfully_executed()
+        description_comment, (gotten_code, code_chunk_imports), (optional_code, optional_code_imports) = steps_manager.code_chunks_cache.get_comment_code_and_optional_code(code_chunk)
+        comment = '# ' + description_comment.strip().replace('\n', '\n# ')
 
         # Make sure to not generate comments or code for steps with no code 
         if len(gotten_code) > 0:
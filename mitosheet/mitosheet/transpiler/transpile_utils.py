@@ -7,6 +7,8 @@
 from copy import copy
 import inspect
 import re
+from threading import Lock
+from types import CodeType
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from collections import OrderedDict
 
@@ -24,6 +26,13 @@ NEWLINE = '\n'
 OPEN_BRACKET = "{"
 CLOSE_BRACKET = "}"
 
+# The most recent compiled code objects we keep. Replaying an analysis executes the same
+# code as the last time it was replayed, so we only want to compile it once
+MAX_COMPILED_CODE_CACHE_SIZE = 1000
+
+compiled_code_cache: 'OrderedDict[str, CodeType]' = OrderedDict()
+compiled_code_cache_lock = Lock()
+
 
 def get_column_header_list_as_transpiled_code(column_headers: Union[List[ColumnHeader], Set[ColumnHeader], List[Tuple[str, Optional[str]]]]) -> str:
     """
@@ -419,3 +428,26 @@ def get_globals_for_exec(state: State, public_interface: int) -> Dict[str, Any]:
     }
 
     return local_vars
+
+
+def get_compiled_code(code: str) -> CodeType:
+    """
+    Returns the code compiled for exec, caching the compiled code by 
+    the code itself, so that executing the same code again does not 
+    need to parse it again.
+    """
+    with compiled_code_cache_lock:
+        compiled_code = compiled_code_cache.get(code)
+        if compiled_code is not None:
+            compiled_code_cache.move_to_end(code)
+            return compiled_code
+
+    # NOTE: we compile with the same filename that exec uses for strings, so errors are unchanged
+    compiled_code = compile(code, '<string>', 'exec')
+
+    with compiled_code_cache_lock:
+        compiled_code_cache[code] = compiled_code
+        if len(compiled_code_cache) > MAX_COMPILED_CODE_CACHE_SIZE:
+            compiled_code_cache.popitem(last=False)
+
+    return compiled_code
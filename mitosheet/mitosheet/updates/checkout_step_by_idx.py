@@ -26,6 +26,10 @@ def execute_checkout_step_by_idx_update(
     if step_idx == -1:
         step_idx = len(steps_manager.steps_including_skipped) - 1
 
+    # The state of the step we check out may have been released to save memory
+    from mitosheet.steps_manager import materialize_step_state
+    materialize_step_state(steps_manager.steps_including_skipped, step_idx)
+
     steps_manager.curr_step_idx = step_idx
 
 CHECKOUT_STEP_BY_IDX_UPDATE = {
@@ -6,13 +6,15 @@
 """
 Contains helpful utility functions
 """
+import hashlib
+import itertools
 import json
 import pprint
 from random import randint
 import random
 import re
 import uuid
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 import os
 import keyword
 
@@ -40,6 +42,12 @@ from mitosheet.public.v3.formatting import add_formatting_to_excel_sheet
 # must match this variable defined on the front-end
 MAX_ROWS = 1_500
 MAX_COLUMNS = 1_500
+# When the dataframes in a state are released to save memory, we keep the index
+# of each dataframe in its attrs under this key. See get_released_dataframe
+RELEASED_DATAFRAME_INDEX_ATTR = 'mito_released_index'
+# The most rows we hash when fingerprinting the contents of a dataframe
+MAX_FINGERPRINT_SAMPLED_ROWS = 10_000
+
 PLAIN_TEXT = 'plain text'
 CURRENCY = 'currency'
 ACCOUNTING = 'accounting'
@@ -141,12 +149,24 @@ def dfs_to_array_for_json(
         column_formulas_array: List[Dict[ColumnID, List[FrontendFormulaAndLocation]]],
         column_filters_array: List[Dict[ColumnID, Any]],
         column_ids: ColumnIDMap,
-        df_formats: List[DataframeFormat]
+        df_formats: List[DataframeFormat],
+        column_data_buffers_array: Optional[List[List[memoryview]]]=None
     ) -> List:
+    """
+    Returns the sheet data for each of the dfs, reusing the sheet data in the previous_array
+    for sheets that have not been modified.
+
+    If column_data_buffers_array is passed, then numeric columns are sent as binary buffers
+    rather than in the json. In this case, column_data_buffers_array must hold the buffers of 
+    each sheet in the previous_array, and is updated in place to hold the buffers of each 
+    sheet in the returned array.
+    """
 
     new_array = []
+    new_column_data_buffers_array: List[List[memoryview]] = []
     for sheet_index, df in enumerate(dfs):
         if sheet_index in modified_sheet_indexes:
+            column_data_buffers: Optional[List[memoryview]] = [] if column_data_buffers_array is not None else None
             new_array.append(
                 df_to_json_dumpsable(
                     state,
@@ -160,15 +180,68 @@ def dfs_to_array_for_json(
                     df_formats[sheet_index],
                     # We only send the first 1500 rows and 1500 columns
                     max_rows=MAX_ROWS,
-                    max_columns=MAX_COLUMNS
+                    max_columns=MAX_COLUMNS,
+                    column_data_buffers=column_data_buffers
                 ) 
             )
+            if column_data_buffers is not None:
+                new_column_data_buffers_array.append(column_data_buffers)
         else:
             new_array.append(previous_array[sheet_index])
+            if column_data_buffers_array is not None:
+                new_column_data_buffers_array.append(column_data_buffers_array[sheet_index])
+
+    if column_data_buffers_array is not None:
+        column_data_buffers_array[:] = new_column_data_buffers_array
 
     return new_array
 
 
+# Each time the sheet data of a sheet is serialized, it gets a new version, so
+# the frontend can tell which sheets changed
+sheet_data_version_counter = itertools.count(1)
+
+def get_sheet_data_json_fragments_and_versions(
+        sheet_data_array: List,
+        previous_sheet_data_array: List,
+        previous_sheet_data_json_fragments: List[str],
+        previous_sheet_data_versions: List[int]
+    ) -> Tuple[List[str], List[int]]:
+    """
+    Returns the json and the version of the sheet data of each sheet.
+
+    Sheets that were not modified have the same sheet data object as in the 
+    previous_sheet_data_array (see dfs_to_array_for_json), so we reuse their 
+    json and version rather than serializing them again.
+    """
+    sheet_data_json_fragments = []
+    sheet_data_versions = []
+    for sheet_index, sheet_data in enumerate(sheet_data_array):
+        if sheet_index < len(previous_sheet_data_array) and sheet_data is previous_sheet_data_array[sheet_index]:
+            sheet_data_json_fragments.append(previous_sheet_data_json_fragments[sheet_index])
+            sheet_data_versions.append(previous_sheet_data_versions[sheet_index])
+        else:
+            sheet_data_json_fragments.append(json.dumps(sheet_data, cls=NpEncoder))
+            sheet_data_versions.append(next(sheet_data_version_counter))
+
+    return sheet_data_json_fragments, sheet_data_versions
+
+
+def get_json_array_from_json_fragments(json_fragments: Sequence[Optional[str]]) -> str:
+    """
+    Returns the same json as json.dumps would for the list of objects the json 
+    fragments are the json of, with None fragments as null.
+    """
+    return '[' + ', '.join(json_fragment if json_fragment is not None else 'null' for json_fragment in json_fragments) + ']'
+
+
+def add_buffer_offset_to_sheet_data_json(sheet_data_json: str, buffer_offset: int) -> str:
+    """
+    Returns the same json as json.dumps({**sheet_data, 'bufferOffset': buffer_offset}).
+    """
+    return f'{sheet_data_json[:-1]}, "bufferOffset": {buffer_offset}}}'
+
+
 def get_conditional_formats_objects_to_export_to_excel(
     conditional_formats: Optional[List[Dict[str, Any]]],
     column_id_map: ColumnIDMap,
@@ -411,7 +484,8 @@ def df_to_json_dumpsable(
         column_headers_to_column_ids: Dict[ColumnHeader, ColumnID],
         df_format: DataframeFormat,
         max_rows: Optional[int]=MAX_ROWS, # How many items you want to display. None when using this function to get unique value counts
-        max_columns: int=MAX_COLUMNS # How many columns you want to display. Unlike max_rows, this is always defined
+        max_columns: int=MAX_COLUMNS, # How many columns you want to display. Unlike max_rows, this is always defined
+        column_data_buffers: Optional[List[memoryview]]=None # If passed, numeric columns are appended here as binary buffers rather than put in the json
     ) -> Dict[str, Any]:
     """
     Returns a dataframe and other metadata represented in a way that can be turned into a 
@@ -428,6 +502,7 @@ def df_to_json_dumpsable(
             columnHeader: (string | number);
             columnDtype: string;
             columnData: (string | number)[];
+            columnDataBuffer?: {index: number, dtype: 'float64' | 'bool'};
         }[];
         columnIDsMap: ColumnIDsMap;
         columnSpreadsheetCodeMap: Record<string, string>;
@@ -441,10 +516,25 @@ def df_to_json_dumpsable(
 
     (num_rows, num_columns) = original_df.shape 
 
-    json_obj = convert_df_to_parsed_json(original_df, max_rows=max_rows, max_columns=max_columns)
+    # If we can send columns as binary buffers, then we only need to turn the other columns into json, 
+    # which lets us skip the slow round trip through json for all numeric columns
+    column_data_buffer_dtypes: Dict[int, str] = {}
+    if column_data_buffers is not None:
+        for column_index in range(min(num_columns, max_columns)):
+            column_data_buffer_dtype = get_column_data_buffer_dtype(original_df.dtypes.iloc[column_index])
+            if column_data_buffer_dtype is not None:
+                column_data_buffer_dtypes[column_index] = column_data_buffer_dtype
+
+    if len(column_data_buffer_dtypes) > 0:
+        df_head = original_df.head(n=max_rows) if max_rows is not None else original_df
+        json_column_indexes = [column_index for column_index in range(min(num_columns, max_columns)) if column_index not in column_data_buffer_dtypes]
+        json_obj = convert_df_to_parsed_json(df_head.iloc[:, json_column_indexes], max_rows=max_rows, max_columns=max_columns)
+    else:
+        json_obj = convert_df_to_parsed_json(original_df, max_rows=max_rows, max_columns=max_columns)
 
     final_data = []
     column_dtype_map = {}
+    json_column_index = 0
     for column_index, column_header in enumerate(original_df.columns):
         column_id = _get_column_id_from_header_safe(column_header, column_headers_to_column_ids)
 
@@ -455,10 +545,20 @@ def df_to_json_dumpsable(
             'columnData': [],
         }
         column_dtype_map[column_id] = str(original_df[column_header].dtype)
-        for row in json_obj['data']:
-            # If we're beyond the max columns, we might not have data, and we leave column data empty
-            # in this case and don't append anything
-            column_final_data['columnData'].append(row[column_index] if column_index < MAX_COLUMNS else None)
+
+        if column_data_buffers is not None and column_index in column_data_buffer_dtypes:
+            column_data_buffer_dtype = column_data_buffer_dtypes[column_index]
+            column_final_data['columnDataBuffer'] = {
+                'index': len(column_data_buffers),
+                'dtype': column_data_buffer_dtype
+            }
+            column_data_buffers.append(get_column_data_buffer(df_head.iloc[:, column_index], column_data_buffer_dtype))
+        else:
+            for row in json_obj['data']:
+                # If we're beyond the max columns, we might not have data, and we leave column data empty
+                # in this case and don't append anything
+                column_final_data['columnData'].append(row[json_column_index] if column_index < MAX_COLUMNS else None)
+            json_column_index += 1
         
         final_data.append(column_final_data) 
 
@@ -493,6 +593,37 @@ def df_to_json_dumpsable(
     }
 
 
+def get_column_data_buffer_dtype(dtype: Any) -> Optional[str]:
+    """
+    Returns the dtype of the binary buffer that a column with this dtype
+    is sent to the frontend in, or None if the column must be sent as json.
+
+    NOTE: must match the decoding in getSheetDataArrayFromString on the front-end
+    """
+    # Extension dtypes (e.g. nullable integers) are sent as json
+    if not isinstance(dtype, np.dtype):
+        return None
+    if dtype.kind == 'b':
+        return 'bool'
+    if dtype.kind in 'iuf':
+        return 'float64'
+    return None
+
+
+def get_column_data_buffer(series: pd.Series, column_data_buffer_dtype: str) -> memoryview:
+    """
+    Returns the values of the series as a little-endian binary buffer of the given 
+    column_data_buffer_dtype, that the frontend reads into a typed array.
+    """
+    if column_data_buffer_dtype == 'bool':
+        return memoryview(series.to_numpy().astype('<u1'))
+
+    values = series.to_numpy().astype('<f8')
+    # Infinities are null in the json, and so are displayed as NaN
+    values[np.isinf(values)] = np.nan
+    return memoryview(values)
+
+
 def get_row_data_array(df: pd.DataFrame) -> List[Any]:
     """
     Returns just the data of a dataframe in the 2d array format of [row idx][col idx]
@@ -545,6 +676,132 @@ def convert_df_to_parsed_json(original_df: pd.DataFrame, max_rows: Optional[int]
     return json_obj
 
 
+def get_dataframe_buffers(df: pd.DataFrame) -> Dict[int, int]:
+    """
+    Returns a mapping from an id for each of the buffers that back the
+    columns and index of this dataframe to the number of bytes in that buffer.
+
+    Shallow copies of a dataframe share the same buffers, so this can be used
+    to figure out how much memory is actually shared between dataframes. Note
+    that for object columns, this only counts the pointers, not the objects.
+    """
+    buffers: Dict[int, int] = {}
+
+    def add_buffer(values: Any) -> None:
+        if isinstance(values, np.ndarray):
+            # Views of an array all share the memory of the base array
+            while isinstance(values.base, np.ndarray):
+                values = values.base
+            buffers[values.__array_interface__['data'][0]] = values.nbytes
+        elif hasattr(values, 'nbytes'):
+            buffers[id(values)] = values.nbytes
+
+    for column_header in df.columns:
+        column = df[column_header]
+        # Duplicate column headers return a dataframe here
+        if isinstance(column, pd.DataFrame):
+            for _, series in column.items():
+                add_buffer(series.values)
+        else:
+            add_buffer(column.values)
+
+    # A range index does not hold onto any data
+    if not isinstance(df.index, pd.RangeIndex):
+        add_buffer(df.index.values)
+
+    return buffers
+
+
+def get_released_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns an empty dataframe with the same columns and dtypes as the passed 
+    dataframe, that holds onto none of its data. 
+
+    Since the index labels are used to transpile formulas, the index of the passed
+    dataframe is stored in the attrs of the returned dataframe. Use get_dataframe_index
+    to read it.
+    """
+    released_df = df.iloc[:0].copy()
+    released_df.attrs[RELEASED_DATAFRAME_INDEX_ATTR] = get_dataframe_index(df)
+    return released_df
+
+
+def get_dataframe_index(df: pd.DataFrame) -> pd.Index:
+    """
+    Returns the index of the dataframe. If the dataframe was released, this
+    is the index of the dataframe before it was released.
+    """
+    attrs = getattr(df, 'attrs', {})
+    return attrs.get(RELEASED_DATAFRAME_INDEX_ATTR, df.index)
+
+
+def get_values_fingerprint(values: Any) -> Any:
+    """
+    Returns a fingerprint of the memory that the values of a column or index
+    are stored in. Values with the same fingerprint are stored in the same memory.
+
+    NOTE: memory can be reused once the values are deleted, so fingerprints 
+    can only be compared while a reference to the values is kept.
+    """
+    if isinstance(values, np.ndarray):
+        return (values.__array_interface__['data'][0], values.shape, values.strides, values.dtype.str)
+    if isinstance(values, pd.api.extensions.ExtensionArray):
+        # Most extension arrays (e.g. strings, nullable integers, categoricals) store their values in 
+        # numpy arrays. We include the dtype, as e.g. categoricals with different categories can share codes
+        ndarray = getattr(values, '_ndarray', None)
+        if isinstance(ndarray, np.ndarray):
+            return (values.dtype, get_values_fingerprint(ndarray))
+        data, mask = getattr(values, '_data', None), getattr(values, '_mask', None)
+        if isinstance(data, np.ndarray) and isinstance(mask, np.ndarray):
+            return (values.dtype, get_values_fingerprint(data), get_values_fingerprint(mask))
+        # Otherwise (e.g. arrow backed arrays), the same array is only stored in the same memory
+        return (values.dtype, id(values))
+    return object()
+
+
+def is_copy_on_write_enabled() -> bool:
+    """
+    Returns True if pandas copy on write is enabled, in which case shallow copies
+    of a dataframe are never changed by changes to the dataframe they are a copy of,
+    or vice versa. This is always the case from pandas 3.0.
+    """
+    try:
+        if int(pd.__version__.split('.')[0]) >= 3:
+            return True
+        return pd.options.mode.copy_on_write is True
+    except (ValueError, AttributeError, KeyError):
+        return False
+
+
+def get_dataframe_content_fingerprint(df: pd.DataFrame, max_sampled_rows: int=MAX_FINGERPRINT_SAMPLED_ROWS) -> Tuple[Any, ...]:
+    """
+    Returns a fingerprint of the contents of the dataframe, so we can check if a
+    dataframe was changed in place without keeping a copy of it around.
+
+    To keep this fast for large dataframes, we only hash up to max_sampled_rows
+    evenly spaced rows, along with the shape, column headers and dtypes. As such,
+    an in place change to a row that is not sampled is not caught.
+    """
+    num_rows = len(df)
+    if num_rows > max_sampled_rows:
+        sampled_df = df.iloc[np.linspace(0, num_rows - 1, max_sampled_rows, dtype=np.int64)]
+    else:
+        sampled_df = df
+
+    try:
+        values_hash = pd.util.hash_pandas_object(sampled_df, index=True).values.tobytes()
+    except TypeError:
+        # Unhashable values (e.g. lists) can't be hashed by pandas, so we fall back to their string
+        values_hash = sampled_df.to_string().encode('utf-8')
+
+    return (
+        df.shape,
+        tuple(str(column_header) for column_header in df.columns),
+        tuple(str(dtype) for dtype in df.dtypes),
+        hashlib.sha1(values_hash).hexdigest()
+    )
+
+
 def get_random_id() -> str:
     """
     Creates a new random ID for the user, which for any given user,
@@ -99,7 +99,7 @@ export default class MitoDashWrapper extends Component<Props, State> {
                     const sharedVariables = response.shared_variables;
                     
                     return resolve({
-                        sheetDataArray: sharedVariables ? getSheetDataArrayFromString(sharedVariables.sheet_data_json) : undefined,
+                        sheetDataArray: sharedVariables?.sheet_data_json !== undefined ? getSheetDataArrayFromString(sharedVariables.sheet_data_json) : undefined,
                         analysisData: sharedVariables ? getAnalysisDataFromString(sharedVariables.analysis_data_json) : undefined,
                         userProfile: sharedVariables ? getUserProfileFromString(sharedVariables.user_profile_json) : undefined,
                         result: response['data'] as ResultType
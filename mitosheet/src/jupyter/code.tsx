@@ -61,6 +61,10 @@ export const getArgsFromMitosheetCallCode = (codeText: string): string[] => {
         nameString = nameString.split('sheet_functions')[0].trim();
     }
 
+    if (nameString.includes('copy_dataframes')) {
+        nameString = nameString.split('copy_dataframes')[0].trim();
+    }
+
     // Get the args and trim them up
     let args = nameString.split(',').map(dfName => dfName.trim());
     
@@ -38,11 +38,11 @@
 
 import { 
     MitoResponse,
-    MAX_WAIT_FOR_SEND_CREATION, SendFunction, SendFunctionError, SendFunctionReturnType,
+    MAX_WAIT_FOR_SEND_CREATION, SendFunction, SendFunctionError, SendFunctionReturnType, SheetData,
     waitUntilConditionReturnsTrueOrTimeout,
 } from "../mito";
 import { isInJupyterLabOrNotebook } from "../mito/utils/location";
-import { getAnalysisDataFromString, getSheetDataArrayFromString, getUserProfileFromString } from "./jupyterUtils";
+import { getAnalysisDataFromString, getSheetDataArrayFromDeltaString, getSheetDataArrayFromString, getUserProfileFromString } from "./jupyterUtils";
 
 /**
  * Since Nobtebook 7 is based on Lab, we no longer need to handle the difference between the 
@@ -53,8 +53,8 @@ import { getAnalysisDataFromString, getSheetDataArrayFromString, getUserProfileF
  */
 export interface JupyterComm {
     send: (msg: Record<string, unknown>) => void,
-    onMsg: (msg: {content: {data: Record<string, unknown>}}) => void,
-    open: () => void;
+    onMsg: (msg: {content: {data: Record<string, unknown>}, buffers?: (ArrayBuffer | ArrayBufferView)[]}) => void,
+    open: (data?: Record<string, unknown>) => void;
 }
 
 
@@ -121,9 +121,10 @@ export const getJupyterComm = async (kernelID: string, commTargetID: string): Pr
     } else {
         /**
          * If we have successfully made a comm, we need to manually open this comm before we 
-         * use it.
+         * use it. We tell the backend we can read sheet data from binary buffers, so it can 
+         * send numeric columns this way, and that it can only send us the sheets that changed.
          */
-        (potentialComm as JupyterComm).open() // TODO: why do I have to do this cast? Seems like a complier issue
+        (potentialComm as JupyterComm).open({binary_sheet_data: true, sheet_data_delta: true}) // TODO: why do I have to do this cast? Seems like a complier issue
         
         if (!(await getJupyterCommConnectedToBackend(potentialComm))) {
             return 'no_backend_comm_registered_error'
@@ -164,8 +165,21 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
     // We save the unconsumed responses on the getCommSend function
     const unconsumedResponses = getCommSend.unconsumedResponses || (getCommSend.unconsumedResponses = []);
 
+    // The backend may only send the sheets that changed, so we keep the last sheet data we got
+    let sheetDataArray: SheetData[] = [];
+
     function receiveResponse(rawResponse: Record<string, unknown>): void {
-        unconsumedResponses.push((rawResponse as any).content.data as MitoResponse);
+        const response = (rawResponse as any).content.data as MitoResponse;
+        // Binary buffers are sent alongside the message data, so we keep them with the response
+        if (response.event === 'response' && (rawResponse as any).buffers !== undefined) {
+            response.buffers = (rawResponse as any).buffers;
+        }
+        // We apply sheet data deltas in the order the backend sent them, which is the order we receive them
+        if (response.event === 'response' && response.shared_variables?.sheet_data_delta_json !== undefined) {
+            sheetDataArray = getSheetDataArrayFromDeltaString(response.shared_variables.sheet_data_delta_json, sheetDataArray, response.buffers);
+            response.sheetDataArray = sheetDataArray;
+        }
+        unconsumedResponses.push(response);
     }
 
     function getResponseData<ResultType> (id: string, maxRetries = MAX_RETRIES): Promise<SendFunctionReturnType<ResultType>> {
@@ -210,7 +224,7 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
                     const sharedVariables = response.shared_variables;
                     
                     return resolve({
-                        sheetDataArray: sharedVariables ? getSheetDataArrayFromString(sharedVariables.sheet_data_json) : undefined,
+                        sheetDataArray: response.sheetDataArray !== undefined ? response.sheetDataArray : (sharedVariables?.sheet_data_json !== undefined ? getSheetDataArrayFromString(sharedVariables.sheet_data_json, response.buffers) : undefined),
                         analysisData: sharedVariables ? getAnalysisDataFromString(sharedVariables.analysis_data_json) : undefined,
                         userProfile: sharedVariables ? getUserProfileFromString(sharedVariables.user_profile_json) : undefined,
                         result: response['data'] as ResultType
@@ -108,11 +108,72 @@ export const getArgs = (analysisToReplayName: string | undefined, inputCellExecu
 
 
 
-export const getSheetDataArrayFromString = (sheet_data_json: string): SheetData[] => {
+/**
+ * Numeric columns may be sent from the backend as binary buffers, rather than in the sheet
+ * data json. In this case, each sheet has a bufferOffset, and each of these columns has a 
+ * columnDataBuffer that tells us which buffer holds its data and how to read it.
+ * 
+ * NOTE: must match get_column_data_buffer_dtype and get_column_data_buffer in utils.py
+ */
+const readColumnDataBuffers = (sheetDataArray: SheetData[], buffers: (ArrayBuffer | ArrayBufferView)[]): void => {
+    sheetDataArray.forEach(sheetData => {
+        const rawSheetData = sheetData as SheetData & {bufferOffset?: number};
+        const bufferOffset = rawSheetData.bufferOffset ?? 0;
+        delete rawSheetData.bufferOffset;
+
+        sheetData.data.forEach(columnData => {
+            const rawColumnData = columnData as typeof columnData & {columnDataBuffer?: {index: number, dtype: 'float64' | 'bool'}};
+            const columnDataBuffer = rawColumnData.columnDataBuffer;
+            if (columnDataBuffer === undefined) {
+                return;
+            }
+            delete rawColumnData.columnDataBuffer;
+
+            const buffer = buffers[bufferOffset + columnDataBuffer.index];
+            // Copy the bytes into their own ArrayBuffer, so the typed array is correctly aligned
+            const arrayBuffer = buffer instanceof ArrayBuffer ? buffer : buffer.buffer.slice(buffer.byteOffset, buffer.byteOffset + buffer.byteLength);
+
+            if (columnDataBuffer.dtype === 'bool') {
+                columnData.columnData = Array.from(new Uint8Array(arrayBuffer), value => value === 1);
+            } else {
+                // Null values are displayed as NaN, just like in the json
+                columnData.columnData = Array.from(new Float64Array(arrayBuffer), value => isNaN(value) ? 'NaN' : value);
+            }
+        })
+    })
+}
+
+export const getSheetDataArrayFromString = (sheet_data_json: string, buffers?: (ArrayBuffer | ArrayBufferView)[]): SheetData[] => {
     if (sheet_data_json.length === 0) {
         return []
     }
-    return JSON.parse(sheet_data_json);
+    const sheetDataArray: SheetData[] = JSON.parse(sheet_data_json);
+    if (buffers !== undefined) {
+        readColumnDataBuffers(sheetDataArray, buffers);
+    }
+    return sheetDataArray;
+}
+
+/**
+ * The backend may only send the sheets that changed, in which case it sends the version of
+ * each sheet, and the sheets that did not change are null. We reuse the sheet data we already 
+ * have for these sheets.
+ * 
+ * NOTE: must match get_sheet_data_delta_json_and_buffers in steps_manager.py
+ */
+export const getSheetDataArrayFromDeltaString = (
+    sheet_data_delta_json: string, 
+    previousSheetDataArray: SheetData[], 
+    buffers?: (ArrayBuffer | ArrayBufferView)[]
+): SheetData[] => {
+    const sheetDataDelta: {sheetDataVersions: number[], sheetDataArray: (SheetData | null)[]} = JSON.parse(sheet_data_delta_json);
+    const changedSheetDataArray = sheetDataDelta.sheetDataArray.filter((sheetData): sheetData is SheetData => sheetData !== null);
+    if (buffers !== undefined) {
+        readColumnDataBuffers(changedSheetDataArray, buffers);
+    }
+    return sheetDataDelta.sheetDataArray.map((sheetData, sheetIndex) => {
+        return sheetData !== null ? sheetData : previousSheetDataArray[sheetIndex];
+    });
 }
 
 export const getUserProfileFromString = (user_profile_json: string): UserProfile => {
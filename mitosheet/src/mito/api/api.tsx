@@ -16,7 +16,7 @@ import { convertFrontendtoBackendGraphParams } from "../components/taskpanes/Gra
 import { AvailableSnowflakeOptionsAndDefaults, SnowflakeCredentials, SnowflakeTableLocationAndWarehouse } from "../components/taskpanes/SnowflakeImport/SnowflakeImportTaskpane";
 import { SplitTextToColumnsParams } from "../components/taskpanes/SplitTextToColumns/SplitTextToColumnsTaskpane";
 import { StepImportData } from "../components/taskpanes/UpdateImports/UpdateImportsTaskpane";
-import { AnalysisData, MergeParams, BackendPivotParams, CodeOptions, CodeSnippetAPIResult, ColumnID, DataframeFormat, FeedbackID, FilterGroupType, FilterType, FormulaLocation, GraphID, ParameterizableParams, SheetData, UIState, UserProfile, GraphParamsBackend, GraphParamsFrontend, StepType } from "../types";
+import { AnalysisData, MergeParams, BackendPivotParams, CodeOptions, CodeSnippetAPIResult, ColumnID, DataframeFormat, FeedbackID, FilterGroupType, FilterType, FormulaLocation, GraphArtifact, GraphID, ParameterizableParams, SheetData, UIState, UserProfile, GraphParamsBackend, GraphParamsFrontend, StepType } from "../types";
 import { SendFunction, SendFunctionErrorReturnType, SendFunctionSuccessReturnType } from "./send";
 
 export type MitoAPIResult<ResultType> = {result: ResultType} | SendFunctionErrorReturnType 
@@ -37,9 +37,23 @@ export interface PathContents {
     elements: FileElement[];
 }
 
+/*
+    A window of rows and columns of a dataframe, in the same format
+    as the data and index of the SheetData
+*/
+export interface DataframeViewport {
+    startRow: number;
+    startColumn: number;
+    numRows: number;
+    numColumns: number;
+    data: SheetData['data'];
+    index: SheetData['index'];
+}
+
 interface SearchResults {
     total_number_matches: number | null;
     matches: {rowIndex: number, colIndex: number}[];
+    next_start_row: number | null;
 }
 
 // "stepIndex" -> fileNames list
@@ -69,11 +83,17 @@ interface MitoSuccessOrInplaceErrorResponse {
     'event': 'response',
     'id': string,
     'shared_variables'?: {
-        'sheet_data_json': string,
+        // Either all of the sheet data, or a delta with only the sheets that changed
+        'sheet_data_json'?: string,
+        'sheet_data_delta_json'?: string,
         'analysis_data_json': string,
         'user_profile_json': string
     }
     'data': unknown
+    // Binary buffers sent with the response, that hold the data of numeric columns in the sheet data
+    'buffers'?: (ArrayBuffer | ArrayBufferView)[]
+    // The sheet data after applying the sheet data delta, if there is one
+    'sheetDataArray'?: SheetData[]
 }
 interface MitoErrorModalResponse {
     event: 'error'
@@ -257,15 +277,50 @@ export class MitoAPI {
     }
 
     /*
-        Returns a string encoding of the CSV file to download
+        Returns the HTML and script of a graph, which are stored separately 
+        from the graph data array. Returns null if the graph no longer exists.
+    */
+    async getGraphArtifact(graphArtifactID: string): Promise<MitoAPIResult<GraphArtifact | null>> {
+        return await this.send<GraphArtifact | null>({
+            'event': 'api_call',
+            'type': 'get_graph_artifact',
+            'params': {
+                'graph_artifact_id': graphArtifactID
+            },
+        })
+    }
+
+    /*
+        Returns the number of matches to the search value in the sheet, and the
+        matching cells in the page of rows starting at startRow
     */
-    async getSearchMatches(sheetIndex: number, searchValue: string): Promise<MitoAPIResult<SearchResults>> {
+    async getSearchMatches(sheetIndex: number, searchValue: string, startRow?: number): Promise<MitoAPIResult<SearchResults>> {
         return await this.send<SearchResults>({
             'event': 'api_call',
             'type': 'get_search_matches',
             'params': {
                 'sheet_index': sheetIndex,
-                'search_value': searchValue
+                'search_value': searchValue,
+                'start_row': startRow ?? 0
+            },
+        })
+    }
+
+    /*
+        Returns the rows and columns of the dataframe in the given window, so that
+        we can display data beyond what is sent in the sheet data. If startColumn 
+        and numColumns are not passed, returns all columns.
+    */
+    async getDataframeViewport(sheetIndex: number, startRow: number, numRows: number, startColumn?: number, numColumns?: number): Promise<MitoAPIResult<DataframeViewport>> {
+        return await this.send<DataframeViewport>({
+            'event': 'api_call',
+            'type': 'get_dataframe_viewport',
+            'params': {
+                'sheet_index': sheetIndex,
+                'start_row': startRow,
+                'num_rows': numRows,
+                ...(startColumn !== undefined ? {'start_column': startColumn} : {}),
+                ...(numColumns !== undefined ? {'num_columns': numColumns} : {}),
             },
         })
     }
@@ -48,6 +48,7 @@ interface XLSXImportConfigScreenProps {
 
 export interface ExcelFileMetadata {
     sheet_names: string[]
+    sheet_dimensions: (string | null)[]
     size: number,
 }
 
@@ -97,7 +98,7 @@ function XLSXImportConfigScreen(props: XLSXImportConfigScreenProps): JSX.Element
 
     // Load the metadata about the Excel file from the API
     const [fileMetadata, loading] = useStateFromAPIAsync<ExcelFileMetadata, string>(
-        {sheet_names: [], size: 0},
+        {sheet_names: [], sheet_dimensions: [], size: 0},
         async (filePath: string) => {
             const response = await props.mitoAPI.getExcelFileMetadata(filePath);
             return 'error' in response ? undefined : response.result;
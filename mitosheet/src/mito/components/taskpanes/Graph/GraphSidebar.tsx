@@ -4,6 +4,7 @@ import '../../../../../css/taskpanes/Graph/GraphSidebar.css';
 import '../../../../../css/taskpanes/Graph/LoadingSpinner.css';
 import { MitoAPI } from '../../../api/api';
 import { useEffectOnResizeElement } from '../../../hooks/useEffectOnElementResize';
+import { useGraphOutput } from '../../../hooks/useGraphOutput';
 import useLiveUpdatingParams from '../../../hooks/useLiveUpdatingParams';
 import { AnalysisData, GraphDataArray, GraphOutput, GraphParamsBackend, GraphParamsFrontend, OpenGraphType, RecursivePartial, SheetData, StepType, UIState } from '../../../types';
 import { classNames } from '../../../utils/classNames';
@@ -200,7 +201,7 @@ const GraphSidebar = (props: {
     */
     const dataSourceSheetIndex = graphParams?.graphCreation.sheet_index
     const graphData = props.graphDataArray.find(graphData => graphData.graph_id === props.openGraph.graphID)
-    const graphOutput = graphData?.graph_output;
+    const graphOutput = useGraphOutput(props.mitoAPI, graphData?.graph_output);
 
     const currOpenTaskpane = props.uiState.currOpenTaskpane;
     if (currOpenTaskpane.type !== TaskpaneType.GRAPH) {
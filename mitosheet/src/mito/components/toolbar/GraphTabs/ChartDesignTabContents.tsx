@@ -5,6 +5,7 @@ import React from 'react';
 
 import { GraphParamsBackend, MitoAPI } from '../../..';
 import { useCopyToClipboard } from '../../../hooks/useCopyToClipboard';
+import { useGraphOutput } from '../../../hooks/useGraphOutput';
 import { ActionEnum, AnalysisData, ColumnID, RecursivePartial, SheetData, UIState } from '../../../types';
 import { Actions } from '../../../utils/actions';
 import { updateObjectWithPartialObject } from '../../../utils/objects';
@@ -59,6 +60,7 @@ export const ChartDesignTabContents = (
 
     const graphDataArray = props.analysisData.graphDataArray;
     const graphData = graphDataArray.find((graphData) => graphData.graph_id === openGraph.graphID);
+    const graphOutput = useGraphOutput(props.mitoAPI, graphData?.graph_output);
 
     // We append the correct export code for showing and for exporting to html
     const [_copyShowGraphCode] = useCopyToClipboard(
@@ -96,7 +98,7 @@ export const ChartDesignTabContents = (
             {...props}
             params={params}
             updateGraphParam={updateGraphParam}
-            graphOutput={graphData?.graph_output}
+            graphOutput={graphOutput}
         />
         {params === undefined ? <p> Loading... </p> : <GraphTypeConfigurations
             {...props}
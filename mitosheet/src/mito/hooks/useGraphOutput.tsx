@@ -0,0 +1,55 @@
+import { useEffect, useState } from "react";
+import { MitoAPI } from "../api/api";
+import { GraphArtifact, GraphOutput, GraphOutputReference } from "../types";
+
+// The graph artifacts we have already loaded, so that every component that
+// displays a graph does not have to load it again
+const loadedGraphArtifacts: Map<string, GraphArtifact> = new Map();
+
+/* 
+    The graph data array only has the ID of the artifact that contains the
+    HTML and script of each graph, so that they are not sent on every update. 
+    
+    This hook loads the artifact of the graph output from the API, and returns
+    the graph output with its HTML and script, or undefined until the first graph loads.
+*/
+export const useGraphOutput = (mitoAPI: MitoAPI, graphOutputReference: GraphOutputReference): GraphOutput => {
+    const graphArtifactID = graphOutputReference?.graphArtifactID;
+    const [graphArtifact, setGraphArtifact] = useState<GraphArtifact | undefined>(
+        graphArtifactID !== undefined ? loadedGraphArtifacts.get(graphArtifactID) : undefined
+    );
+
+    useEffect(() => {
+        if (graphArtifactID === undefined) {
+            setGraphArtifact(undefined);
+            return;
+        }
+
+        const loadedGraphArtifact = loadedGraphArtifacts.get(graphArtifactID);
+        if (loadedGraphArtifact !== undefined) {
+            setGraphArtifact(loadedGraphArtifact);
+            return;
+        }
+
+        let cancelled = false;
+        void mitoAPI.getGraphArtifact(graphArtifactID).then((response) => {
+            if (cancelled || 'error' in response || response.result === null) {
+                return;
+            }
+            loadedGraphArtifacts.set(graphArtifactID, response.result);
+            setGraphArtifact(response.result);
+        });
+        return () => {cancelled = true};
+    }, [graphArtifactID]);
+
+    // While a new graph is loading, we keep displaying the previous graph
+    if (graphOutputReference === undefined || graphArtifact === undefined) {
+        return undefined;
+    }
+
+    return {
+        graphGeneratedCode: graphOutputReference.graphGeneratedCode,
+        graphHTML: graphArtifact.graphHTML,
+        graphScript: graphArtifact.graphScript,
+    };
+}
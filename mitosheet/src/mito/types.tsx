@@ -406,11 +406,12 @@ export type GraphRenderingParams = {
 
 /**
  * Data about all of the graphs. For each graph, it contains 
- * the actual graph html & javascript, and the generated code.
+ * the generated code and the ID of the graph artifact, which
+ * we use to get the actual graph html & javascript.
  */
 export type GraphData = {
     graph_id: GraphID,
-    graph_output: GraphOutput, 
+    graph_output: GraphOutputReference, 
     graph_tab_name: string
 };
 /**
@@ -441,6 +442,16 @@ export type GraphOutput = {
     graphScript: string,
 } | undefined;
 
+export type GraphOutputReference = {
+    graphGeneratedCode: string,
+    graphArtifactID: string,
+} | undefined;
+
+export type GraphArtifact = {
+    graphHTML: string,
+    graphScript: string,
+};
+
 export type GraphID = string;
 
 export type GraphDataArray = GraphData[];